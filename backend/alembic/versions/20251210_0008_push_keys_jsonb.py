@@ -0,0 +1,50 @@
+"""Store push subscription keys as JSONB
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-12-10
+
+push_subscriptions.keys_json was a TEXT column holding serialized JSON that
+had to be json.loads()'d for every subscription on every broadcast. On
+PostgreSQL it becomes JSONB so the driver returns a dict directly. Other
+dialects keep their existing storage (SQLAlchemy's JSON type reads it as-is).
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists."""
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Convert keys_json from TEXT to JSONB."""
+    if op.get_bind().dialect.name != 'postgresql' or not table_exists('push_subscriptions'):
+        return
+
+    op.execute("""
+        ALTER TABLE push_subscriptions
+        ALTER COLUMN keys_json TYPE JSONB USING keys_json::jsonb
+    """)
+
+
+def downgrade() -> None:
+    """Convert keys_json back to TEXT."""
+    if op.get_bind().dialect.name != 'postgresql' or not table_exists('push_subscriptions'):
+        return
+
+    op.execute("""
+        ALTER TABLE push_subscriptions
+        ALTER COLUMN keys_json TYPE TEXT USING keys_json::text
+    """)
@@ -0,0 +1,28 @@
+"""Index user_roles.role_id
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-12-10
+
+user_roles has a composite (user_id, role_id) primary key, which does not
+help lookups by role_id (role filters, role counts, roles -> users).
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add index on user_roles.role_id."""
+    op.create_index('ix_user_roles_role_id', 'user_roles', ['role_id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop index on user_roles.role_id."""
+    op.drop_index('ix_user_roles_role_id', table_name='user_roles', if_exists=True)
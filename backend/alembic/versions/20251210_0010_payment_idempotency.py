@@ -0,0 +1,69 @@
+"""Add Stripe webhook event and idempotency key tables
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-12-10
+
+- stripe_webhook_events: one row per Stripe event ID, used to drop
+  duplicate webhook deliveries via the primary key
+- idempotency_keys: stored responses for retried payment operations
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Check if a table exists."""
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Create stripe_webhook_events and idempotency_keys."""
+    # Tables may already exist if init_db() ran create_all first
+    if table_exists('stripe_webhook_events') and table_exists('idempotency_keys'):
+        return
+    
+    op.create_table('stripe_webhook_events',
+        sa.Column('event_id', sa.String(255), primary_key=True),
+        sa.Column('event_type', sa.String(100), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_stripe_webhook_events_status_received', 'stripe_webhook_events',
+        ['status', 'received_at'],
+    )
+    
+    op.create_table('idempotency_keys',
+        sa.Column('key', sa.String(255), primary_key=True),
+        sa.Column('request_hash', sa.String(64), nullable=False),
+        sa.Column('response', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        'ix_idempotency_keys_expires_at', 'idempotency_keys',
+        ['expires_at'],
+    )
+
+
+def downgrade() -> None:
+    """Drop stripe_webhook_events and idempotency_keys."""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    op.drop_index('ix_stripe_webhook_events_status_received', table_name='stripe_webhook_events')
+    op.drop_table('stripe_webhook_events')
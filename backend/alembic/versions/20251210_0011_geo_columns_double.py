@@ -0,0 +1,52 @@
+"""Store driver and saved-location coordinates as double precision
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-12-10
+
+driver_profiles.current_lat/current_lng and saved_locations.latitude/longitude
+were NUMERIC(10,7). Coordinates are approximate anyway, and float8 arithmetic
+(distance / bounding-box filters when matching drivers) is much cheaper than
+arbitrary-precision numeric. SQLite stores both as REAL-affinity already.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GEO_COLUMNS = [
+    ('driver_profiles', 'current_lat'),
+    ('driver_profiles', 'current_lng'),
+    ('saved_locations', 'latitude'),
+    ('saved_locations', 'longitude'),
+]
+
+
+def upgrade() -> None:
+    """Convert coordinate columns to DOUBLE PRECISION."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table, column in GEO_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE DOUBLE PRECISION USING {column}::double precision
+        """)
+
+
+def downgrade() -> None:
+    """Convert coordinate columns back to NUMERIC(10,7)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table, column in GEO_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE NUMERIC(10, 7) USING {column}::numeric(10, 7)
+        """)
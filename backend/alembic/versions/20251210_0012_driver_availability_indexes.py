@@ -0,0 +1,42 @@
+"""Add partial indexes for available-driver lookups
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-12-10
+
+Driver matching filters on availability_status = 'available' plus location
+and location freshness. Partial indexes keep these limited to available
+drivers. Also indexes driver_profiles.status for admin filters.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+AVAILABLE = sa.text("availability_status = 'available'")
+
+
+def upgrade() -> None:
+    """Create driver availability indexes."""
+    op.create_index(
+        'ix_driver_available_loc', 'driver_profiles', ['current_lat', 'current_lng'],
+        postgresql_where=AVAILABLE, sqlite_where=AVAILABLE, if_not_exists=True,
+    )
+    op.create_index(
+        'ix_driver_available_loc_updated', 'driver_profiles', ['location_updated_at'],
+        postgresql_where=AVAILABLE, sqlite_where=AVAILABLE, if_not_exists=True,
+    )
+    op.create_index('ix_driver_profiles_status', 'driver_profiles', ['status'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Drop driver availability indexes."""
+    op.drop_index('ix_driver_profiles_status', table_name='driver_profiles', if_exists=True)
+    op.drop_index('ix_driver_available_loc_updated', table_name='driver_profiles', if_exists=True)
+    op.drop_index('ix_driver_available_loc', table_name='driver_profiles', if_exists=True)
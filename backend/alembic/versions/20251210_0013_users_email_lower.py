@@ -0,0 +1,49 @@
+"""Normalize user emails and enforce case-insensitive uniqueness
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-12-10
+
+- Lowercases existing users.email values (skipping any that would collide
+  with an existing lowercased address; those need manual resolution and
+  will make the unique index below fail loudly)
+- Widens users.email to 320 characters (RFC 5321 maximum)
+- Adds unique functional index ux_users_email_lower on lower(email)
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Lowercase emails and add the lower(email) unique index."""
+    op.execute("""
+        UPDATE users
+        SET email = lower(email)
+        WHERE email <> lower(email)
+          AND NOT EXISTS (
+              SELECT 1 FROM users AS other WHERE other.email = lower(users.email)
+          )
+    """)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('users', 'email', type_=sa.String(320), existing_nullable=False)
+    
+    op.create_index(
+        'ux_users_email_lower', 'users', [sa.text('lower(email)')],
+        unique=True, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop the lower(email) unique index."""
+    op.drop_index('ux_users_email_lower', table_name='users', if_exists=True)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('users', 'email', type_=sa.String(255), existing_nullable=False)
@@ -0,0 +1,55 @@
+"""Make client_profiles.default_payment_method_id a real foreign key
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-12-10
+
+default_payment_method_id was a bare integer. Dangling values are cleared,
+then it gets a FK to payment_methods (ON DELETE SET NULL) and an index for
+reverse lookups (which clients default to a given card).
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FK_NAME = 'fk_client_profiles_default_payment_method_id'
+
+
+def upgrade() -> None:
+    """Clear dangling references, add FK and index."""
+    op.execute("""
+        UPDATE client_profiles
+        SET default_payment_method_id = NULL
+        WHERE default_payment_method_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM payment_methods
+              WHERE payment_methods.id = client_profiles.default_payment_method_id
+          )
+    """)
+    
+    # SQLite cannot ALTER in a constraint; create_all already adds it there
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_foreign_key(
+            FK_NAME, 'client_profiles', 'payment_methods',
+            ['default_payment_method_id'], ['id'], ondelete='SET NULL',
+        )
+    
+    op.create_index(
+        'ix_client_profiles_default_payment_method_id', 'client_profiles',
+        ['default_payment_method_id'], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop FK and index."""
+    op.drop_index('ix_client_profiles_default_payment_method_id', table_name='client_profiles', if_exists=True)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint(FK_NAME, 'client_profiles', type_='foreignkey')
@@ -0,0 +1,51 @@
+"""Convert remaining JSON columns to JSONB and add GIN index on booking event metadata
+
+Revision ID: 015
+Revises: 014
+Create Date: 2025-12-10
+
+Postgres only: JSONB is stored pre-parsed, so containment/key lookups don't
+re-parse text on every row and can use a GIN index. SQLite keeps plain JSON.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = (
+    ('regions', 'geojson'),
+    ('booking_events', 'metadata'),
+    ('audit_logs', 'old_value'),
+    ('audit_logs', 'new_value'),
+    ('organizations', 'features'),
+)
+
+
+def upgrade() -> None:
+    """Switch JSON columns to JSONB and index booking_events.metadata."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE JSONB USING "{column}"::jsonb')
+    
+    op.create_index(
+        'ix_booking_events_metadata_gin', 'booking_events', ['metadata'],
+        postgresql_using='gin', if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop GIN index and revert columns to JSON."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    op.drop_index('ix_booking_events_metadata_gin', table_name='booking_events', if_exists=True)
+    
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE JSON USING "{column}"::json')
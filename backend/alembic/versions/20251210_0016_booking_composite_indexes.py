@@ -0,0 +1,62 @@
+"""Replace single-column booking indexes with composite and partial ones
+
+Revision ID: 016
+Revises: 015
+Create Date: 2025-12-10
+
+Booking listings filter on status/driver/client and sort by created_at.
+Composite indexes serve those directly; their leading columns make the old
+ix_bookings_client_id/driver_id/status redundant. On Postgres the indexes
+are built CONCURRENTLY so the bookings table stays writable.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OPEN = sa.text("status = 'requested' AND driver_id IS NULL")
+
+NEW_INDEXES = (
+    ('ix_bookings_status_created', ['status', sa.text('created_at DESC')], {}),
+    ('ix_bookings_driver_status', ['driver_id', 'status'], {}),
+    ('ix_bookings_client_created', ['client_id', sa.text('created_at DESC')], {}),
+    ('ix_bookings_open', [sa.text('created_at DESC')], {'postgresql_where': OPEN, 'sqlite_where': OPEN}),
+)
+
+OLD_INDEXES = (
+    ('ix_bookings_client_id', ['client_id']),
+    ('ix_bookings_driver_id', ['driver_id']),
+    ('ix_bookings_status', ['status']),
+)
+
+
+def upgrade() -> None:
+    """Create composite indexes, then drop the redundant single-column ones."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns, kwargs in NEW_INDEXES:
+            op.create_index(
+                name, 'bookings', columns, if_not_exists=True,
+                postgresql_concurrently=concurrently, **kwargs,
+            )
+        for name, _ in OLD_INDEXES:
+            op.drop_index(name, table_name='bookings', if_exists=True, postgresql_concurrently=concurrently)
+
+
+def downgrade() -> None:
+    """Restore single-column indexes and drop the composite ones."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    
+    with op.get_context().autocommit_block():
+        for name, columns in OLD_INDEXES:
+            op.create_index(name, 'bookings', columns, if_not_exists=True, postgresql_concurrently=concurrently)
+        for name, _, _ in NEW_INDEXES:
+            op.drop_index(name, table_name='bookings', if_exists=True, postgresql_concurrently=concurrently)
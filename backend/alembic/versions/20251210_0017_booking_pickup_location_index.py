@@ -0,0 +1,52 @@
+"""Store booking coordinates as double precision and index open pickups
+
+Revision ID: 017
+Revises: 016
+Create Date: 2025-12-10
+
+Same NUMERIC(10,7) -> DOUBLE PRECISION change as 011, applied to
+bookings. Adds a partial index on pickup coordinates for unassigned
+requested bookings so the driver job board's bounding-box filter is a
+range scan over open bookings only.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GEO_COLUMNS = ['pickup_lat', 'pickup_lng', 'dropoff_lat', 'dropoff_lng']
+
+OPEN = sa.text("status = 'requested' AND driver_id IS NULL")
+
+
+def upgrade() -> None:
+    """Convert booking coordinates to DOUBLE PRECISION and add pickup index."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in GEO_COLUMNS:
+            op.execute(f"""
+                ALTER TABLE bookings
+                ALTER COLUMN {column} TYPE DOUBLE PRECISION USING {column}::double precision
+            """)
+    
+    op.create_index(
+        'ix_bookings_open_pickup', 'bookings', ['pickup_lat', 'pickup_lng'],
+        postgresql_where=OPEN, sqlite_where=OPEN, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop pickup index and revert coordinates to NUMERIC(10,7)."""
+    op.drop_index('ix_bookings_open_pickup', table_name='bookings', if_exists=True)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in GEO_COLUMNS:
+            op.execute(f"""
+                ALTER TABLE bookings
+                ALTER COLUMN {column} TYPE NUMERIC(10, 7) USING {column}::numeric(10, 7)
+            """)
@@ -0,0 +1,78 @@
+"""Store surge/surcharge CSV fields as arrays
+
+Revision ID: 018
+Revises: 017
+Create Date: 2025-12-10
+
+surge_rules.days_of_week, surcharges.location_keywords and
+surcharges.applies_to_service_types were comma-separated strings. Postgres
+gets native text arrays (with GIN indexes for && / @> lookups on
+surcharges); SQLite stores JSON arrays, matching the JSON column type used
+there.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = '018'
+down_revision: Union[str, None] = '017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, Postgres array type, original type)
+CSV_COLUMNS = (
+    ('surge_rules', 'days_of_week', 'VARCHAR(10)[]', 'VARCHAR(50)'),
+    ('surcharges', 'location_keywords', 'TEXT[]', 'TEXT'),
+    ('surcharges', 'applies_to_service_types', 'VARCHAR(50)[]', 'VARCHAR(255)'),
+)
+
+GIN_INDEXES = (
+    ('ix_surcharges_keywords_gin', 'location_keywords'),
+    ('ix_surcharges_service_types_gin', 'applies_to_service_types'),
+)
+
+
+def upgrade() -> None:
+    """Convert CSV strings to arrays."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite: rewrite "a,b" as '["a","b"]' in place
+        for table, column, _, _ in CSV_COLUMNS:
+            op.execute(f"""
+                UPDATE {table}
+                SET {column} = '["' || replace(replace(replace(trim({column}), ', ', ','), ' ,', ','), ',', '","') || '"]'
+                WHERE {column} IS NOT NULL AND {column} NOT LIKE '[%'
+            """)
+        return
+    
+    for table, column, array_type, _ in CSV_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE {array_type}
+            USING regexp_split_to_array(trim({column}), '\\s*,\\s*')
+        """)
+    
+    for name, column in GIN_INDEXES:
+        op.create_index(name, 'surcharges', [column], postgresql_using='gin', if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Convert arrays back to comma-separated strings."""
+    if op.get_bind().dialect.name != 'postgresql':
+        for table, column, _, _ in CSV_COLUMNS:
+            op.execute(f"""
+                UPDATE {table}
+                SET {column} = replace(replace(replace({column}, '["', ''), '"]', ''), '","', ',')
+                WHERE {column} LIKE '[%'
+            """)
+        return
+    
+    for name, _ in GIN_INDEXES:
+        op.drop_index(name, table_name='surcharges', if_exists=True)
+    
+    for table, column, _, original_type in CSV_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE {original_type}
+            USING array_to_string({column}, ',')
+        """)
@@ -0,0 +1,62 @@
+"""Store money columns as BIGINT minor units (cents)
+
+Revision ID: 019
+Revises: 018
+Create Date: 2025-12-10
+
+Fares, pricing rates, payments, payouts, redemptions and surcharges were
+NUMERIC(10,2), which drivers return as Decimal. Two decimal places map
+losslessly onto integer cents. Surcharge percentages become basis points.
+SQLite only needs the values rewritten (NUMERIC affinity stores integers).
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = '019'
+down_revision: Union[str, None] = '018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONEY_COLUMNS = {
+    'pricing_rules': ['base_fare', 'per_km', 'per_minute', 'minimum_fare'],
+    'surcharges': ['amount'],
+    'bookings': [
+        'base_fare', 'distance_fare', 'time_fare', 'extras_total', 'tax_total',
+        'discount_total', 'final_fare', 'driver_earnings', 'platform_fee',
+    ],
+    'payments': ['amount'],
+    'driver_payouts': ['amount'],
+    'promotion_redemptions': ['discount_amount'],
+}
+
+
+def upgrade() -> None:
+    """Convert NUMERIC(10,2) amounts to BIGINT cents."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    
+    for table, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            if is_postgres:
+                op.execute(f"""
+                    ALTER TABLE {table}
+                    ALTER COLUMN {column} TYPE BIGINT USING round({column} * 100)::bigint
+                """)
+            else:
+                op.execute(f"UPDATE {table} SET {column} = CAST(round({column} * 100) AS INTEGER)")
+
+
+def downgrade() -> None:
+    """Convert BIGINT cents back to NUMERIC(10,2) amounts."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    
+    for table, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            if is_postgres:
+                op.execute(f"""
+                    ALTER TABLE {table}
+                    ALTER COLUMN {column} TYPE NUMERIC(10, 2) USING ({column} / 100.0)::numeric(10, 2)
+                """)
+            else:
+                op.execute(f"UPDATE {table} SET {column} = {column} / 100.0")
@@ -0,0 +1,69 @@
+"""Add region_id and pricing_rule_id to bookings
+
+Revision ID: 020
+Revises: 019
+Create Date: 2025-12-10
+
+Records which region and pricing rule priced a booking at creation, so
+historical bookings can be audited and grouped by region without
+re-resolving the rule. Existing rows stay NULL.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '020'
+down_revision: Union[str, None] = '019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SNAPSHOT_COLUMNS = (
+    ('region_id', 'regions', 'fk_bookings_region_id'),
+    ('pricing_rule_id', 'pricing_rules', 'fk_bookings_pricing_rule_id'),
+)
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table."""
+    from sqlalchemy import inspect
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    try:
+        columns = [c['name'] for c in inspector.get_columns(table_name)]
+        return column_name in columns
+    except Exception:
+        return False
+
+
+def upgrade() -> None:
+    """Add snapshot columns, FKs and regional index."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    
+    for column, target, fk_name in SNAPSHOT_COLUMNS:
+        if column_exists('bookings', column):
+            continue
+        op.add_column('bookings', sa.Column(column, sa.Integer(), nullable=True))
+        # SQLite cannot ALTER in a constraint; create_all already adds it there
+        if is_postgres:
+            op.create_foreign_key(fk_name, 'bookings', target, [column], ['id'], ondelete='SET NULL')
+    
+    op.create_index(
+        'ix_bookings_region_status_created', 'bookings',
+        ['region_id', 'status', 'created_at'], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop regional index and snapshot columns."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    
+    op.drop_index('ix_bookings_region_status_created', table_name='bookings', if_exists=True)
+    
+    for column, _, fk_name in SNAPSHOT_COLUMNS:
+        if not column_exists('bookings', column):
+            continue
+        if is_postgres:
+            op.drop_constraint(fk_name, 'bookings', type_='foreignkey')
+        op.drop_column('bookings', column)
@@ -0,0 +1,146 @@
+"""Partition append-only event tables by month (Postgres)
+
+Revision ID: 021
+Revises: 020
+Create Date: 2025-12-10
+
+booking_events, audit_logs and conversation_messages only grow. Each is
+rebuilt as a RANGE (created_at) partitioned table with monthly partitions
+plus a DEFAULT partition; app.core.maintenance keeps creating partitions
+ahead of time. The primary key becomes (id, created_at) because Postgres
+requires the partition key in it; nothing references these tables by FK.
+
+bookings is left alone: many tables reference bookings.id, and those FKs
+would all have to carry created_at too.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '021'
+down_revision: Union[str, None] = '020'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONED_TABLES = ('booking_events', 'audit_logs', 'conversation_messages')
+
+MONTHS_AHEAD = 3  # Matches settings.db_partition_months_ahead
+
+
+# Full definitions keep GIN/partial/expression/DESC indexes intact
+_INDEXDEF_QUERY = sa.text("""
+    SELECT c.relname, pg_get_indexdef(i.indexrelid)
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = to_regclass(:table)
+      AND NOT i.indisunique
+      AND NOT i.indisprimary
+""")
+
+
+def _capture_indexes(bind, table: str) -> list:
+    """Return (name, CREATE INDEX statement) for the table's secondary indexes.
+
+    Must run before the table is renamed so the statements name the table
+    that gets rebuilt.
+    """
+    return [tuple(row) for row in bind.execute(_INDEXDEF_QUERY, {'table': table})]
+
+
+def _recreate_fks_and_indexes(table: str, fks: list, indexes: list) -> None:
+    """Re-add FKs and replay secondary index definitions from the old table."""
+    for fk in fks:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns'],
+            ondelete=fk.get('options', {}).get('ondelete'),
+        )
+    for _, indexdef in indexes:
+        # Partitioned parents report "ON ONLY", which would skip the partitions
+        op.execute(indexdef.replace(' ON ONLY ', ' ON ', 1))
+
+
+def upgrade() -> None:
+    """Rebuild event tables as monthly range partitions."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    inspector = sa.inspect(bind)
+
+    for table in PARTITIONED_TABLES:
+        fks = inspector.get_foreign_keys(table)
+        indexes = _capture_indexes(bind, table)
+        old = f'{table}_unpartitioned'
+
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        for fk in fks:
+            op.execute(f'ALTER TABLE {old} DROP CONSTRAINT {fk["name"]}')
+        for name, _ in indexes:
+            op.execute(f'DROP INDEX {name}')
+
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """)
+        # Keep the id sequence alive when the old table is dropped
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+        # One partition per month from the oldest row through MONTHS_AHEAD
+        op.execute(f"""
+            DO $$
+            DECLARE
+                part_start date := date_trunc('month', COALESCE((SELECT min(created_at) FROM {old}), now()));
+                last_start date := date_trunc('month', now()) + interval '{MONTHS_AHEAD} months';
+            BEGIN
+                WHILE part_start <= last_start LOOP
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(part_start, 'YYYY_MM'), part_start, part_start + interval '1 month'
+                    );
+                    part_start := part_start + interval '1 month';
+                END LOOP;
+            END $$
+        """)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'DROP TABLE {old}')
+
+        _recreate_fks_and_indexes(table, fks, indexes)
+
+
+def downgrade() -> None:
+    """Collapse partitions back into plain tables."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    inspector = sa.inspect(bind)
+
+    for table in PARTITIONED_TABLES:
+        fks = inspector.get_foreign_keys(table)
+        indexes = _capture_indexes(bind, table)
+        old = f'{table}_partitioned'
+
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        for fk in fks:
+            op.execute(f'ALTER TABLE {old} DROP CONSTRAINT {fk["name"]}')
+        for name, _ in indexes:
+            op.execute(f'DROP INDEX {name}')
+
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+                PRIMARY KEY (id)
+            )
+        """)
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'DROP TABLE {old} CASCADE')
+
+        _recreate_fks_and_indexes(table, fks, indexes)
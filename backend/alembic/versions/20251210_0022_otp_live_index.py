@@ -0,0 +1,40 @@
+"""Partial index on unused OTP codes
+
+Revision ID: 022
+Revises: 021
+Create Date: 2025-12-10
+
+OTP verification only ever reads unused codes for an identifier. A partial
+index over those rows stays small because app.core.maintenance deletes
+codes a day after they expire.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '022'
+down_revision: Union[str, None] = '021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Purge long-expired codes and create ix_otp_live."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DELETE FROM otp_codes WHERE expires_at < now() - interval '1 day'")
+        live = sa.text('is_used = false')
+    else:
+        op.execute("DELETE FROM otp_codes WHERE expires_at < datetime('now', '-1 day')")
+        live = sa.text('is_used = 0')
+    
+    op.create_index(
+        'ix_otp_live', 'otp_codes', ['identifier', 'expires_at'], if_not_exists=True,
+        postgresql_where=live, sqlite_where=live,
+    )
+
+
+def downgrade() -> None:
+    """Drop ix_otp_live."""
+    op.drop_index('ix_otp_live', table_name='otp_codes', if_exists=True)
@@ -0,0 +1,95 @@
+"""Store closed-set status/type columns as native Postgres ENUMs
+
+Revision ID: 023
+Revises: 022
+Create Date: 2025-12-10
+
+bookings.status, booking_stops.stop_type, driver_payouts.payout_status and
+otp_codes.identifier_type only ever hold values from app.core.enums. As
+ENUMs they take 4 bytes per row instead of variable-length text, which also
+shrinks the status indexes, and Postgres rejects values outside the set.
+
+The partial indexes on open bookings are rebuilt because their predicates
+were parsed against the VARCHAR column; left as-is they would compare
+status::text and no longer match queries against the ENUM column.
+
+SQLite keeps VARCHAR columns.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '023'
+down_revision: Union[str, None] = '022'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BOOKING_STATUSES = (
+    'draft', 'requested', 'driver_assigned', 'driver_en_route_pickup',
+    'driver_arrived', 'in_progress', 'completed', 'canceled_by_client',
+    'canceled_by_driver', 'canceled_by_system', 'no_show_client',
+    'no_show_driver', 'disputed', 'refunded',
+)
+
+# (table, column, enum type, values, previous VARCHAR length)
+ENUM_COLUMNS = (
+    ('bookings', 'status', 'booking_status', BOOKING_STATUSES, 50),
+    ('booking_stops', 'stop_type', 'booking_stop_type', ('pickup', 'dropoff', 'stop'), 50),
+    ('driver_payouts', 'payout_status', 'payout_status', ('pending', 'processing', 'completed', 'failed'), 50),
+    ('otp_codes', 'identifier_type', 'otp_identifier_type', ('email', 'phone'), 20),
+)
+
+OPEN = sa.text("status = 'requested' AND driver_id IS NULL")
+
+OPEN_INDEXES = (
+    ('ix_bookings_open', [sa.text('created_at DESC')]),
+    ('ix_bookings_open_pickup', ['pickup_lat', 'pickup_lng']),
+)
+
+
+def _drop_open_indexes() -> None:
+    for name, _ in OPEN_INDEXES:
+        op.drop_index(name, table_name='bookings', if_exists=True)
+
+
+def _create_open_indexes() -> None:
+    for name, columns in OPEN_INDEXES:
+        op.create_index(name, 'bookings', columns, postgresql_where=OPEN, if_not_exists=True)
+
+
+def upgrade() -> None:
+    """Create ENUM types and convert the columns."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    _drop_open_indexes()
+
+    for table, column, type_name, values, _ in ENUM_COLUMNS:
+        sa.Enum(*values, name=type_name).create(bind, checkfirst=True)
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}
+        """)
+
+    _create_open_indexes()
+
+
+def downgrade() -> None:
+    """Convert the columns back to VARCHAR and drop the ENUM types."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    _drop_open_indexes()
+
+    for table, column, type_name, values, length in ENUM_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE VARCHAR({length}) USING {column}::text
+        """)
+        sa.Enum(*values, name=type_name).drop(bind, checkfirst=True)
+
+    _create_open_indexes()
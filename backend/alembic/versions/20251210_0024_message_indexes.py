@@ -0,0 +1,40 @@
+"""Index unread conversation messages and support ticket threads
+
+Revision ID: 024
+Revises: 023
+Create Date: 2025-12-10
+
+Neither message table had an index on its parent FK. Unread counts only
+touch unread conversation messages, so that index is partial; ticket
+threads are read in created_at order per ticket.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '024'
+down_revision: Union[str, None] = '023'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create message indexes."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    unread = sa.text('is_read = false' if is_postgres else 'is_read = 0')
+    
+    op.create_index(
+        'ix_conv_msg_unread', 'conversation_messages', ['conversation_id', 'sender_id'],
+        postgresql_where=unread, sqlite_where=unread, if_not_exists=True,
+    )
+    op.create_index(
+        'ix_support_messages_ticket_created', 'support_ticket_messages', ['ticket_id', 'created_at'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop message indexes."""
+    op.drop_index('ix_support_messages_ticket_created', table_name='support_ticket_messages', if_exists=True)
+    op.drop_index('ix_conv_msg_unread', table_name='conversation_messages', if_exists=True)
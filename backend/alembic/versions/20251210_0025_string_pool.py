@@ -0,0 +1,121 @@
+"""Intern addresses and user agents in string_pool
+
+Revision ID: 025
+Revises: 024
+Create Date: 2025-12-10
+
+bookings.pickup_address/dropoff_address, booking_stops.address and
+push_subscriptions.user_agent repeat the same few hundred bytes across many
+rows. Each distinct value is now stored once in string_pool (keyed by its
+SHA-256) and rows hold an 8-byte id. The models read the text back through
+a correlated subquery, so the API is unchanged.
+"""
+import hashlib
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '025'
+down_revision: Union[str, None] = '024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, text column, id column, NOT NULL, old VARCHAR length)
+INTERNED_COLUMNS = (
+    ('bookings', 'pickup_address', 'pickup_address_id', True, 500),
+    ('bookings', 'dropoff_address', 'dropoff_address_id', True, 500),
+    ('booking_stops', 'address', 'address_id', True, 500),
+    ('push_subscriptions', 'user_agent', 'user_agent_id', False, 500),
+)
+
+
+def _fk_name(table: str, id_column: str) -> str:
+    return f'fk_{table}_{id_column}_string_pool'
+
+
+def _backfill_postgres() -> None:
+    values = ' UNION '.join(
+        f'SELECT {column} FROM {table} WHERE {column} IS NOT NULL'
+        for table, column, _, _, _ in INTERNED_COLUMNS
+    )
+    op.execute(f"""
+        INSERT INTO string_pool (sha256, value)
+        SELECT sha256(convert_to(v, 'UTF8')), v FROM ({values}) AS s(v)
+        ON CONFLICT (sha256) DO NOTHING
+    """)
+    for table, column, id_column, _, _ in INTERNED_COLUMNS:
+        op.execute(f"""
+            UPDATE {table} t SET {id_column} = p.id
+            FROM string_pool p
+            WHERE t.{column} IS NOT NULL AND p.sha256 = sha256(convert_to(t.{column}, 'UTF8'))
+        """)
+
+
+def _backfill_generic(bind) -> None:
+    """Hash in Python for databases without sha256() (SQLite)."""
+    string_pool = sa.table('string_pool', sa.column('id'), sa.column('sha256'), sa.column('value'))
+    ids = {}
+    for table, column, id_column, _, _ in INTERNED_COLUMNS:
+        rows = bind.execute(sa.text(f'SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL'))
+        values = [value for (value,) in rows]
+        for value in values:
+            if value not in ids:
+                digest = hashlib.sha256(value.encode('utf-8')).digest()
+                ids[value] = bind.execute(
+                    sa.insert(string_pool).values(sha256=digest, value=value).returning(string_pool.c.id)
+                ).scalar_one()
+            bind.execute(
+                sa.text(f'UPDATE {table} SET {id_column} = :id WHERE {column} = :value'),
+                {'id': ids[value], 'value': value},
+            )
+
+
+def upgrade() -> None:
+    """Create string_pool, move interned columns to ids, drop the text columns."""
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    op.create_table(
+        'string_pool',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('sha256', sa.LargeBinary(32), nullable=False, unique=True),
+        sa.Column('value', sa.Text(), nullable=False),
+    )
+
+    for table, _, id_column, _, _ in INTERNED_COLUMNS:
+        op.add_column(table, sa.Column(id_column, sa.BigInteger(), nullable=True))
+
+    if is_postgres:
+        _backfill_postgres()
+    else:
+        _backfill_generic(bind)
+
+    for table, column, id_column, not_null, _ in INTERNED_COLUMNS:
+        # SQLite can't add constraints to existing columns; create_all has them
+        if is_postgres:
+            op.create_foreign_key(_fk_name(table, id_column), table, 'string_pool', [id_column], ['id'])
+            if not_null:
+                op.alter_column(table, id_column, nullable=False)
+        op.drop_column(table, column)
+
+
+def downgrade() -> None:
+    """Restore the text columns from string_pool and drop it."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    for table, column, id_column, not_null, length in INTERNED_COLUMNS:
+        op.add_column(table, sa.Column(column, sa.String(length), nullable=True))
+        op.execute(f"""
+            UPDATE {table} SET {column} = (
+                SELECT value FROM string_pool WHERE string_pool.id = {table}.{id_column}
+            )
+        """)
+        if is_postgres:
+            if not_null:
+                op.alter_column(table, column, nullable=False)
+            op.drop_constraint(_fk_name(table, id_column), table, type_='foreignkey')
+        op.drop_column(table, id_column)
+
+    op.drop_table('string_pool')
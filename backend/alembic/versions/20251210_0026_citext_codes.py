@@ -0,0 +1,45 @@
+"""Make promotion, region and service type codes case-insensitive
+
+Revision ID: 026
+Revises: 025
+Create Date: 2025-12-10
+
+promotions.code, regions.code and service_types.code are typed by people in
+whatever case. As CITEXT, plain equality ignores case and their existing
+unique indexes serve those lookups (and reject codes differing only by case)
+without a lower() expression index.
+
+Fails if a table already holds two codes differing only by case; resolve
+those first. SQLite gets COLLATE NOCASE from create_all instead.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '026'
+down_revision: Union[str, None] = '025'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CODE_TABLES = ('promotions', 'regions', 'service_types')
+
+
+def upgrade() -> None:
+    """Enable citext and convert the code columns."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS citext')
+    for table in CODE_TABLES:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN code TYPE citext')
+
+
+def downgrade() -> None:
+    """Convert the code columns back to VARCHAR(50)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in CODE_TABLES:
+        op.alter_column(table, 'code', type_=sa.String(50), postgresql_using='code::varchar(50)')
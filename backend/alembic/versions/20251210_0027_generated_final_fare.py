@@ -0,0 +1,62 @@
+"""Generate bookings.final_fare from the fare components
+
+Revision ID: 027
+Revises: 026
+Create Date: 2025-12-10
+
+final_fare was computed in the API and written alongside base_fare,
+distance_fare, time_fare, extras_total, tax_total and discount_total. It is
+now a stored generated column over those, so it can't drift from them and
+nothing has to recompute and re-write it.
+
+Existing rows don't always satisfy the formula (bookings stored base_fare
+already net of the discount), so base_fare is first adjusted to make each
+stored final_fare come out unchanged.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '027'
+down_revision: Union[str, None] = '026'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FINAL_FARE_SQL = (
+    "COALESCE(base_fare, 0) + COALESCE(distance_fare, 0) + COALESCE(time_fare, 0)"
+    " + COALESCE(extras_total, 0) + COALESCE(tax_total, 0) - COALESCE(discount_total, 0)"
+)
+
+
+def _batch_op():
+    """Operations on bookings; SQLite needs the table recreated to change final_fare."""
+    if op.get_bind().dialect.name == 'postgresql':
+        return op.batch_alter_table('bookings', recreate='never')
+    return op.batch_alter_table('bookings', recreate='always')
+
+
+def upgrade() -> None:
+    """Rebase base_fare on the stored final_fare, then make final_fare generated."""
+    op.execute("""
+        UPDATE bookings SET base_fare = final_fare
+            - COALESCE(distance_fare, 0) - COALESCE(time_fare, 0)
+            - COALESCE(extras_total, 0) - COALESCE(tax_total, 0)
+            + COALESCE(discount_total, 0)
+        WHERE final_fare IS NOT NULL
+    """)
+    with _batch_op() as batch_op:
+        batch_op.drop_column('final_fare')
+        batch_op.add_column(
+            sa.Column('final_fare', sa.BigInteger(), sa.Computed(FINAL_FARE_SQL, persisted=True))
+        )
+
+
+def downgrade() -> None:
+    """Turn final_fare back into a plain column holding its current values."""
+    op.add_column('bookings', sa.Column('final_fare_stored', sa.BigInteger(), nullable=True))
+    op.execute('UPDATE bookings SET final_fare_stored = final_fare')
+    with _batch_op() as batch_op:
+        batch_op.drop_column('final_fare')
+        batch_op.alter_column('final_fare_stored', new_column_name='final_fare')
@@ -8,12 +8,16 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy import select, func, and_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 
 from app.core.database import get_db
+from app.core.event_writer import record_audit_log
+from app.core.pricing_cache import parse_hhmm
+from app.core.push_service import invalidate_user_subscriptions, reset_subscription_cache
 from app.core.dependencies import get_current_user, require_roles
 from app.core.security import hash_password, create_access_token
 from app.core.enums import Role as RoleEnum, BookingStatus
+from app.core.money import from_cents
 from app.models import (
     User, Role, UserRole, DriverProfile, Booking, Payment, DriverPayout,
     SurgeRule, PricingRule, Region, ServiceType, Promotion, AuditLog, Vehicle
@@ -31,7 +35,9 @@ from app.schemas import (
     AuditLogListResponse,
     UserResponse,
     SuccessResponse,
+    NormalizedEmail,
 )
+from app.api.response_builders import json_response
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -50,7 +56,7 @@ def map_role_from_db(role: str) -> str:
 # Request/Response schemas for user provisioning
 class AdminCreateUserRequest(BaseModel):
     """Request to create a new user by admin."""
-    email: EmailStr
+    email: NormalizedEmail
     full_name: str
     role: str
     phone: Optional[str] = None
@@ -65,7 +71,7 @@ class AdminUpdateUserRoleRequest(BaseModel):
 
 class AdminInviteUserRequest(BaseModel):
     """Request to invite a new user via email."""
-    email: EmailStr
+    email: NormalizedEmail
     full_name: str
     role: str
     message: Optional[str] = None  # Optional personalized message
@@ -146,7 +152,7 @@ async def get_dashboard_stats(
     revenue_result = await db.execute(
         select(func.sum(Booking.final_fare)).where(Booking.status == BookingStatus.COMPLETED.value)
     )
-    total_revenue = float(revenue_result.scalar() or 0)
+    total_revenue = from_cents(revenue_result.scalar() or 0)
     
     return DashboardStats(
         total_users=total_users,
@@ -186,13 +192,14 @@ async def get_revenue_report(
     )
     bookings = result.scalars().all()
     
-    total_revenue = sum(float(b.final_fare) if b.final_fare else 0 for b in bookings)
+    # Totals are summed in integer cents; only the result is converted
+    total_revenue = from_cents(sum(b.final_fare or 0 for b in bookings))
     total_trips = len(bookings)
     average_fare = total_revenue / total_trips if total_trips > 0 else 0
     
-    # Platform fees (assume 20%)
-    platform_fees = total_revenue * 0.20
-    driver_payouts = total_revenue * 0.80
+    # Split recorded on each booking at completion
+    platform_fees = from_cents(sum(b.platform_fee or 0 for b in bookings))
+    driver_payouts = from_cents(sum(b.driver_earnings or 0 for b in bookings))
     
     # Revenue by service type
     by_service_type = {}
@@ -201,7 +208,9 @@ async def get_revenue_report(
         if st_id not in by_service_type:
             by_service_type[st_id] = {"count": 0, "revenue": 0}
         by_service_type[st_id]["count"] += 1
-        by_service_type[st_id]["revenue"] += float(booking.final_fare) if booking.final_fare else 0
+        by_service_type[st_id]["revenue"] += booking.final_fare or 0
+    for entry in by_service_type.values():
+        entry["revenue"] = from_cents(entry["revenue"])
     
     return RevenueReport(
         period_start=period_start,
@@ -230,8 +239,8 @@ async def list_surge_rules(
         region_id=r.region_id,
         name=r.name,
         multiplier=float(r.multiplier),
-        time_start=r.time_start.isoformat() if r.time_start else None,
-        time_end=r.time_end.isoformat() if r.time_end else None,
+        time_start=r.time_start,
+        time_end=r.time_end,
         days_of_week=r.days_of_week,
         is_active=r.is_active
     ) for r in rules]
@@ -252,31 +261,25 @@ async def create_surge_rule(
         is_active=True
     )
     
-    # Parse time strings if provided
-    if request.time_start:
-        try:
-            hours, minutes = map(int, request.time_start.split(":"))
-            rule.time_start = datetime.now().replace(hour=hours, minute=minutes).time()
-        except:
-            pass
+    # Store windows as normalized "HH:MM"; invalid values are ignored
+    start = parse_hhmm(request.time_start)
+    if start is not None:
+        rule.time_start = f"{start // 60:02d}:{start % 60:02d}"
     
-    if request.time_end:
-        try:
-            hours, minutes = map(int, request.time_end.split(":"))
-            rule.time_end = datetime.now().replace(hour=hours, minute=minutes).time()
-        except:
-            pass
+    end = parse_hhmm(request.time_end)
+    if end is not None:
+        rule.time_end = f"{end // 60:02d}:{end % 60:02d}"
     
     db.add(rule)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="surge_rule.created",
         entity_type="surge_rule",
         new_value={"name": request.name, "multiplier": request.multiplier}
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(rule)
@@ -286,8 +289,8 @@ async def create_surge_rule(
         region_id=rule.region_id,
         name=rule.name,
         multiplier=float(rule.multiplier),
-        time_start=rule.time_start.isoformat() if rule.time_start else None,
-        time_end=rule.time_end.isoformat() if rule.time_end else None,
+        time_start=rule.time_start,
+        time_end=rule.time_end,
         days_of_week=rule.days_of_week,
         is_active=rule.is_active
     )
@@ -320,7 +323,8 @@ async def update_surge_rule(
     rule.days_of_week = request.days_of_week
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="surge_rule.updated",
         entity_type="surge_rule",
@@ -328,7 +332,6 @@ async def update_surge_rule(
         old_value=old_values,
         new_value={"name": request.name, "multiplier": request.multiplier}
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(rule)
@@ -338,8 +341,8 @@ async def update_surge_rule(
         region_id=rule.region_id,
         name=rule.name,
         multiplier=float(rule.multiplier),
-        time_start=rule.time_start.isoformat() if rule.time_start else None,
-        time_end=rule.time_end.isoformat() if rule.time_end else None,
+        time_start=rule.time_start,
+        time_end=rule.time_end,
         days_of_week=rule.days_of_week,
         is_active=rule.is_active
     )
@@ -366,13 +369,13 @@ async def delete_surge_rule(
     await db.delete(rule)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="surge_rule.deleted",
         entity_type="surge_rule",
         entity_id=rule_id
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -436,13 +439,13 @@ async def create_promotion(
     db.add(promo)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="promotion.created",
         entity_type="promotion",
         new_value={"code": promo.code, "discount_value": float(promo.discount_value)}
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(promo)
@@ -535,44 +538,19 @@ async def list_audit_logs(
     for log in logs:
         actor = None
         if log.actor_id:
-            actor_result = await db.execute(
-                select(User).where(User.id == log.actor_id)
-            )
-            actor_user = actor_result.scalar_one_or_none()
+            actor_user = await db.get(User, log.actor_id)
             if actor_user:
-                actor = UserResponse(
-                    id=actor_user.id,
-                    email=actor_user.email,
-                    full_name=actor_user.full_name,
-                    phone=actor_user.phone,
-                    avatar_url=actor_user.avatar_url,
-                    is_active=actor_user.is_active,
-                    created_at=actor_user.created_at,
-                    roles=[]
-                )
+                actor = UserResponse.from_orm_trusted(actor_user, roles=[])
         
-        log_responses.append(AuditLogResponse(
-            id=log.id,
-            actor_id=log.actor_id,
-            action=log.action,
-            entity_type=log.entity_type,
-            entity_id=log.entity_id,
-            old_value=log.old_value,
-            new_value=log.new_value,
-            ip_address=log.ip_address,
-            created_at=log.created_at,
-            actor=actor
-        ))
+        # Columns map straight onto AuditLogResponse; skip re-validating them
+        log_responses.append(AuditLogResponse.from_orm_trusted(log, actor=actor))
     
-    total_pages = (total + page_size - 1) // page_size
-    
-    return AuditLogListResponse(
+    return json_response(AuditLogListResponse(
         items=log_responses,
         total=total,
         page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+        page_size=page_size
+    ))
 
 
 @router.get("/drivers/pending", response_model=List[UserResponse])
@@ -621,13 +599,13 @@ async def approve_driver(
     profile.status = "active"
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="driver.approved",
         entity_type="driver_profile",
         entity_id=driver_id
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -658,13 +636,13 @@ async def reject_driver(
     profile.status = "rejected"
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="driver.rejected",
         entity_type="driver_profile",
         entity_id=driver_id
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -968,14 +946,14 @@ async def load_demo_data(
             db.add(ServiceType(code=code, name=name, description=desc, base_capacity=capacity, is_active=True))
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.demo_data_loaded",
         entity_type="system",
         entity_id=0,
         new_value={"users_created": len(created_users)}
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -1031,16 +1009,17 @@ async def clear_demo_data(
     )
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.demo_data_cleared",
         entity_type="system",
         entity_id=0,
         new_value={"users_deleted": len(demo_user_ids)}
     )
-    db.add(audit_log)
     
     await db.commit()
+    await invalidate_user_subscriptions(demo_user_ids)
     
     return SuccessResponse(
         success=True,
@@ -1202,16 +1181,17 @@ async def wipe_all_demo_data(
         )
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.demo_data_wiped_all",
         entity_type="system",
         entity_id=0,
         new_value=deleted_counts
     )
-    db.add(audit_log)
     
     await db.commit()
+    await invalidate_user_subscriptions(non_admin_user_ids)
     
     return SuccessResponse(
         success=True,
@@ -1352,6 +1332,7 @@ async def factory_reset(
         await db.execute(delete(Role))
         
         await db.commit()
+        await reset_subscription_cache()
         
         return {
             "success": True,
@@ -1451,7 +1432,8 @@ async def admin_create_user(
         db.add(driver_profile)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.user_created",
         entity_type="user",
@@ -1462,7 +1444,6 @@ async def admin_create_user(
             "created_by_admin": True,
         }
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -1524,10 +1505,7 @@ async def admin_update_user_role(
     Update a user's role. Can change any role including promoting to admin.
     """
     # Get the user
-    user_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -1594,7 +1572,8 @@ async def admin_update_user_role(
             db.add(driver_profile)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.user_role_changed",
         entity_type="user",
@@ -1602,7 +1581,6 @@ async def admin_update_user_role(
         old_value={"roles": old_roles},
         new_value={"roles": [request.new_role]},
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -1753,7 +1731,8 @@ async def admin_invite_user(
         )
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.user_invited",
         entity_type="user",
@@ -1764,7 +1743,6 @@ async def admin_invite_user(
             "invited_by": current_user.email,
         }
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -1793,10 +1771,7 @@ async def admin_delete_user(
         )
     
     # Get the user
-    user_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -1820,16 +1795,17 @@ async def admin_delete_user(
     await db.delete(user)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.user_deleted",
         entity_type="user",
         entity_id=user_id,
         old_value={"email": user_email},
     )
-    db.add(audit_log)
     
     await db.commit()
+    await invalidate_user_subscriptions([user_id])
     
     return SuccessResponse(
         success=True,
@@ -1847,10 +1823,7 @@ async def admin_reset_user_password(
     Reset a user's password and send them a new temporary password via email.
     """
     # Get the user
-    user_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -1886,14 +1859,14 @@ async def admin_reset_user_password(
         print(f"[Admin] Failed to send password reset email: {e}")
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.user_password_reset",
         entity_type="user",
         entity_id=user_id,
         new_value={"password_reset_by": current_user.email},
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -1996,7 +1969,8 @@ async def update_platform_config(
         db.add(config)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.platform_config_updated",
         entity_type="platform_config",
@@ -2004,7 +1978,6 @@ async def update_platform_config(
         old_value={"key": request.key, "old_value": old_value} if old_value else None,
         new_value={"key": request.key, "value": "[SET]" if request.is_secret else request.value}
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -2034,14 +2007,14 @@ async def delete_platform_config(
         )
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="admin.platform_config_deleted",
         entity_type="platform_config",
         entity_id=0,
         old_value={"key": key, "category": config.category}
     )
-    db.add(audit_log)
     
     await db.delete(config)
     await db.commit()
@@ -307,10 +307,7 @@ async def refresh_token(
         )
     
     user_id = int(payload.get("sub"))
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -482,10 +479,7 @@ async def confirm_password_reset(
     elif token_type == "password_reset":
         # Old link-based flow (for backwards compatibility)
         user_id = int(payload.get("sub"))
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await db.get(User, user_id)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
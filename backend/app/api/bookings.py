@@ -2,21 +2,26 @@
 Seryvo Platform - Bookings API Router
 Handles booking creation, management, and client operations
 """
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timezone
+from typing import Literal, Optional, List, Union
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.event_writer import record_booking_event
+from app.core.string_pool import assign_interned, intern_strings
 from app.core.dependencies import get_current_user, require_roles
 from app.core.enums import BookingStatus
 from app.core.rate_limiter import limiter, RateLimits
 from app.core.config import settings
+from app.core.geo import haversine_km
+from app.core.money import to_cents, from_cents
+from app.core.pricing_cache import get_pricing_rule, get_active_surge_rules, get_active_service_types
 from app.models import (
-    User, Booking, BookingStop, BookingEvent, ServiceType,
-    PricingRule, SurgeRule, Region, Promotion, PromotionRedemption,
+    User, Booking, BookingStop,
+    Region, Promotion, PromotionRedemption,
     AuditLog, Conversation, ConversationParticipant, DriverProfile,
     PaymentMethod
 )
@@ -25,6 +30,8 @@ from app.schemas import (
     BookingUpdate,
     BookingResponse,
     BookingListResponse,
+    BookingListItem,
+    BookingSummaryListResponse,
     BookingStopResponse,
     BookingCancelRequest,
     BookingRatingRequest,
@@ -39,6 +46,7 @@ from app.api.response_builders import (
     build_booking_stop_response,
     build_booking_response,
     build_service_type_response,
+    json_response,
 )
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
@@ -59,35 +67,14 @@ async def calculate_price(
     scheduled_at: Optional[datetime] = None
 ) -> PriceEstimateResponse:
     """Calculate price estimate for a ride."""
-    # Simplified distance calculation (Haversine would be better)
-    import math
-    
-    def haversine(lat1, lon1, lat2, lon2):
-        R = 6371  # Earth's radius in km
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        return R * c
-    
-    distance_km = haversine(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
+    # Straight-line distance between pickup and dropoff
+    distance_km = haversine_km(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
     
     # Estimate duration using configurable average city speed
     duration_minutes = (distance_km / settings.pricing_avg_city_speed_kmh) * 60
     
-    # Get pricing rule
-    query = select(PricingRule).where(PricingRule.is_active == True)
-    if service_type_id:
-        query = query.where(
-            or_(
-                PricingRule.service_type_id == service_type_id,
-                PricingRule.service_type_id.is_(None)
-            )
-        )
-    query = query.limit(1)
-    
-    result = await db.execute(query)
-    pricing_rule = result.scalar_one_or_none()
+    # Get pricing rule (cached; changes only via admin)
+    pricing_rule = await get_pricing_rule(db, service_type_id)
     
     # Use configurable default pricing if no rule found
     base_fare = settings.pricing_default_base_fare
@@ -97,10 +84,10 @@ async def calculate_price(
     currency = settings.pricing_default_currency
     
     if pricing_rule:
-        base_fare = float(pricing_rule.base_fare)
-        per_km = float(pricing_rule.per_km)
-        per_minute = float(pricing_rule.per_minute)
-        minimum_fare = float(pricing_rule.minimum_fare)
+        base_fare = pricing_rule.base_fare
+        per_km = pricing_rule.per_km
+        per_minute = pricing_rule.per_minute
+        minimum_fare = pricing_rule.minimum_fare
         currency = pricing_rule.currency
     
     # Calculate base fare
@@ -108,15 +95,13 @@ async def calculate_price(
     
     # Check surge pricing
     surge_multiplier = 1.0
-    surge_result = await db.execute(
-        select(SurgeRule).where(SurgeRule.is_active == True)
-    )
-    surge_rules = surge_result.scalars().all()
+    surge_rules = await get_active_surge_rules(db)
+    now = datetime.now(timezone.utc)
     
     for rule in surge_rules:
-        # Apply surge if active (simplified - would check time/location)
-        if rule.multiplier > surge_multiplier:
-            surge_multiplier = float(rule.multiplier)
+        # Highest multiplier among rules whose window covers now (location not checked yet)
+        if rule.multiplier > surge_multiplier and rule.is_active_at(now):
+            surge_multiplier = rule.multiplier
     
     fare = fare * surge_multiplier
     
@@ -161,10 +146,7 @@ async def list_service_types(
     db: AsyncSession = Depends(get_db)
 ):
     """List available service types."""
-    result = await db.execute(
-        select(ServiceType).where(ServiceType.is_active == True)
-    )
-    service_types = result.scalars().all()
+    service_types = await get_active_service_types(db)
     
     return [ServiceTypeResponse(
         id=st.id,
@@ -236,24 +218,32 @@ async def create_booking(
         
         if promo:
             if promo.discount_type == "percentage":
-                discount = estimate.estimated_fare * (promo.discount_value / 100)
+                discount = estimate.estimated_fare * (float(promo.discount_value) / 100)
             else:
-                discount = promo.discount_value
+                discount = float(promo.discount_value)
+    
+    # Same (cached) rule calculate_price used; stored so history needn't re-resolve it
+    pricing_rule = await get_pricing_rule(db, request_body.service_type_id)
     
     # Create booking with aligned field names
     pickup_stop = request_body.stops[0] if request_body.stops else None
     dropoff_stop = request_body.stops[-1] if len(request_body.stops) > 1 else request_body.stops[0] if request_body.stops else None
+    pickup_address = pickup_stop.address if pickup_stop else "Unknown"
+    dropoff_address = dropoff_stop.address if dropoff_stop else "Unknown"
+    addresses = await intern_strings(
+        db, [pickup_address, dropoff_address, *(stop.address for stop in request_body.stops)]
+    )
     
     booking = Booking(
         client_id=client_id,
         service_type_id=request_body.service_type_id,
+        region_id=pricing_rule.region_id if pricing_rule else None,
+        pricing_rule_id=pricing_rule.id if pricing_rule else None,
         status=BookingStatus.REQUESTED.value,  # Canonical status
         is_asap=request_body.requested_pickup_at is None,
         requested_pickup_at=request_body.requested_pickup_at,
-        pickup_address=pickup_stop.address if pickup_stop else "Unknown",
         pickup_lat=pickup_stop.lat if pickup_stop else None,
         pickup_lng=pickup_stop.lng if pickup_stop else None,
-        dropoff_address=dropoff_stop.address if dropoff_stop else "Unknown",
         dropoff_lat=dropoff_stop.lat if dropoff_stop else None,
         dropoff_lng=dropoff_stop.lng if dropoff_stop else None,
         passenger_count=request_body.passenger_count,
@@ -261,10 +251,10 @@ async def create_booking(
         special_notes=request_body.special_notes,
         estimated_distance_km=estimate.estimated_distance_km,
         estimated_duration_min=int(estimate.estimated_duration_minutes),
-        base_fare=estimate.estimated_fare - discount,
-        discount_total=discount if discount > 0 else None,
-        final_fare=estimate.estimated_fare - discount,
+        base_fare=to_cents(estimate.estimated_fare),
+        discount_total=to_cents(discount) if discount > 0 else None,
     )
+    assign_interned(booking, addresses, pickup_address=pickup_address, dropoff_address=dropoff_address)
     db.add(booking)
     await db.flush()
     
@@ -273,21 +263,21 @@ async def create_booking(
         stop = BookingStop(
             booking_id=booking.id,
             sequence=idx,
-            address=stop_data.address,
             lat=stop_data.lat,
             lng=stop_data.lng,
             stop_type=stop_data.stop_type,
         )
+        assign_interned(stop, addresses, address=stop_data.address)
         db.add(stop)
     
     # Create booking event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=client_id,
         event_type="booking.created",
         description=f"Booking created with estimated fare: {estimate.estimated_fare}"
     )
-    db.add(event)
     
     # Record promotion redemption
     if request_body.promotion_code and discount > 0 and promo:
@@ -295,7 +285,7 @@ async def create_booking(
             promotion_id=promo.id,
             user_id=client_id,
             booking_id=booking.id,
-            discount_amount=discount
+            discount_amount=to_cents(discount)
         )
         db.add(redemption)
     
@@ -338,7 +328,7 @@ async def create_booking(
                 "dropoff_address": booking.dropoff_address,
                 "dropoff_lat": float(booking.dropoff_lat) if booking.dropoff_lat else None,
                 "dropoff_lng": float(booking.dropoff_lng) if booking.dropoff_lng else None,
-                "estimated_fare": float(booking.final_fare) if booking.final_fare else None,
+                "estimated_fare": from_cents(booking.final_fare),
                 "estimated_distance_km": float(booking.estimated_distance_km) if booking.estimated_distance_km else None,
                 "estimated_duration_min": booking.estimated_duration_min,
                 "passenger_count": booking.passenger_count,
@@ -362,7 +352,7 @@ async def create_booking(
                         driver_id=int(driver_id),
                         booking_id=booking.id,
                         pickup_address=booking.pickup_address,
-                        estimated_fare=float(booking.final_fare or 0)
+                        estimated_fare=from_cents(booking.final_fare or 0)
                     )
                 except Exception as push_err:
                     print(f"Push notification failed for driver {driver_id}: {push_err}")
@@ -379,7 +369,7 @@ async def create_booking(
             pickup_address=booking.pickup_address,
             dropoff_address=booking.dropoff_address,
             scheduled_time=booking.requested_pickup_at,
-            estimated_fare=float(booking.final_fare or 0),
+            estimated_fare=from_cents(booking.final_fare or 0),
             service_type="Standard"
         )
     except Exception as email_err:
@@ -388,11 +378,12 @@ async def create_booking(
     return build_booking_response(booking, stops)
 
 
-@router.get("", response_model=BookingListResponse)
+@router.get("", response_model=Union[BookingListResponse, BookingSummaryListResponse])
 async def list_bookings(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
+    status: Optional[BookingStatus] = None,
+    view: Literal["full", "summary"] = Query("full", description="'summary' returns BookingListItem rows"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -418,7 +409,7 @@ async def list_bookings(
     
     # Apply status filter
     if status:
-        query = query.where(Booking.status == status)
+        query = query.where(Booking.status == status.value)
     
     # Count total
     count_query = select(func.count()).select_from(query.subquery())
@@ -429,28 +420,35 @@ async def list_bookings(
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size).order_by(Booking.created_at.desc())
     
-    result = await db.execute(query)
+    if view == "summary":
+        # Only the summary columns; no stops, no full rows
+        rows = await db.execute(query.with_only_columns(
+            Booking.id, Booking.status, Booking.driver_id,
+            Booking.pickup_address, Booking.dropoff_address,
+            Booking.requested_pickup_at, Booking.final_fare, Booking.created_at,
+        ))
+        return json_response(BookingSummaryListResponse(
+            items=[
+                BookingListItem.from_orm_trusted(row, final_fare=from_cents(row.final_fare))
+                for row in rows
+            ],
+            total=total,
+            page=page,
+            page_size=page_size
+        ))
+    
+    # Stops for the whole page in one extra query
+    result = await db.execute(query.options(selectinload(Booking.stops)))
     bookings = result.scalars().all()
     
-    booking_responses = []
-    for booking in bookings:
-        # Get stops
-        stops_result = await db.execute(
-            select(BookingStop).where(BookingStop.booking_id == booking.id).order_by(BookingStop.sequence)
-        )
-        stops = stops_result.scalars().all()
-        
-        booking_responses.append(build_booking_response(booking, stops))
-    
-    total_pages = (total + page_size - 1) // page_size
+    booking_responses = [build_booking_response(booking, booking.stops) for booking in bookings]
     
-    return BookingListResponse(
+    return json_response(BookingListResponse(
         items=booking_responses,
         total=total,
         page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+        page_size=page_size
+    ))
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
@@ -492,10 +490,7 @@ async def get_booking(
     client = None
     driver = None
     
-    client_result = await db.execute(
-        select(User).where(User.id == booking.client_id)
-    )
-    client_user = client_result.scalar_one_or_none()
+    client_user = await db.get(User, booking.client_id)
     if client_user:
         client = UserResponse(
             id=client_user.id,
@@ -509,10 +504,7 @@ async def get_booking(
         )
     
     if booking.driver_id:
-        driver_result = await db.execute(
-            select(User).where(User.id == booking.driver_id)
-        )
-        driver_user = driver_result.scalar_one_or_none()
+        driver_user = await db.get(User, booking.driver_id)
         if driver_user:
             driver = UserResponse(
                 id=driver_user.id,
@@ -525,7 +517,7 @@ async def get_booking(
                 roles=[]
             )
     
-    return build_booking_response(booking, stops, client=client, driver=driver)
+    return json_response(build_booking_response(booking, stops, client=client, driver=driver))
 
 
 @router.patch("/{booking_id}", response_model=BookingResponse)
@@ -691,13 +683,13 @@ async def update_booking_status(
     booking.status = new_status
     
     # Create event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type=f"booking.{new_status}",
         event_metadata={"previous_status": booking.status}
     )
-    db.add(event)
     
     await db.commit()
     await db.refresh(booking)
@@ -789,13 +781,13 @@ async def cancel_booking(
     # Note: cancel_reason is stored in the event metadata, not on the booking model
     
     # Create event with reason
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type="booking.cancelled",
         event_metadata={"reason": request.reason}
     )
-    db.add(event)
     
     await db.commit()
     
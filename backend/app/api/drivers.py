@@ -5,18 +5,23 @@ Handles driver operations, job management, and status updates
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import os
 import uuid
 import aiofiles
 
+from app.core.config import settings
+from app.core.geo import bounding_box, distance_from
+from app.core.money import from_cents
 from app.core.database import get_db
+from app.core.event_writer import record_audit_log, record_booking_event
 from app.core.dependencies import get_current_user, require_roles
 from app.core.enums import BookingStatus, DriverAvailabilityStatus, DriverPlatformStatus, DocumentStatus
 from app.models import (
     User, Role, UserRole, DriverProfile, Vehicle, DriverDocument,
-    Booking, BookingStop, BookingEvent, AuditLog, PaymentMethod, Payment
+    Booking, BookingStop, PaymentMethod, Payment
 )
 from app.schemas import (
     DriverProfileResponse,
@@ -35,6 +40,7 @@ from app.schemas import (
 from app.api.response_builders import (
     build_booking_stop_response,
     build_driver_job_response,
+    json_list_response,
 )
 
 router = APIRouter(prefix="/drivers", tags=["Drivers"])
@@ -274,37 +280,53 @@ async def get_available_jobs(
         return []
     
     # Get pending bookings without a driver (using canonical status)
+    is_open = (
+        Booking.status.in_(BookingStatus.awaiting_driver_statuses()),
+        Booking.driver_id.is_(None)
+    )
+    query = select(Booking).where(*is_open)
+    
+    # Optional radius: bounding box on pickup coordinates (ix_bookings_open_pickup),
+    # then the exact distance drops the box's corners before the limit applies
+    radius_km = settings.driver_job_radius_km
+    if radius_km > 0 and profile.current_lat is not None and profile.current_lng is not None:
+        min_lat, max_lat, min_lng, max_lng = bounding_box(profile.current_lat, profile.current_lng, radius_km)
+        candidates = await db.execute(
+            select(Booking.id, Booking.pickup_lat, Booking.pickup_lng)
+            .where(
+                *is_open,
+                Booking.pickup_lat.between(min_lat, max_lat),
+                Booking.pickup_lng.between(min_lng, max_lng),
+            )
+            .order_by(Booking.created_at.desc())
+        )
+        distance_to = distance_from(profile.current_lat, profile.current_lng)
+        nearby_ids = [
+            booking_id for booking_id, lat, lng in candidates
+            if distance_to(lat, lng) <= radius_km
+        ][:10]
+        if not nearby_ids:
+            return []
+        query = query.where(Booking.id.in_(nearby_ids))
+    
     result = await db.execute(
-        select(Booking).where(
-            Booking.status.in_(BookingStatus.awaiting_driver_statuses()),
-            Booking.driver_id.is_(None)
-        ).order_by(Booking.created_at.desc()).limit(10)
+        query.options(selectinload(Booking.stops), selectinload(Booking.client))
+        .order_by(Booking.created_at.desc()).limit(10)
     )
     bookings = result.scalars().all()
     
     jobs = []
     for booking in bookings:
-        # Get stops
-        stops_result = await db.execute(
-            select(BookingStop).where(BookingStop.booking_id == booking.id).order_by(BookingStop.sequence)
-        )
-        stops = stops_result.scalars().all()
-        
-        # Get client info
-        client_result = await db.execute(
-            select(User).where(User.id == booking.client_id)
-        )
-        client = client_result.scalar_one_or_none()
-        
+        client = booking.client
         jobs.append(build_driver_job_response(
             booking,
-            stops,
+            booking.stops,
             client_name=client.full_name if client else None,
             client_phone=None,  # Hidden until accepted
             client_rating_avg=None
         ))
     
-    return jobs
+    return json_list_response(jobs, DriverJobResponse)
 
 
 @router.get("/jobs/current", response_model=Optional[DriverJobResponse])
@@ -333,10 +355,7 @@ async def get_current_job(
     stops = stops_result.scalars().all()
     
     # Get client info
-    client_result = await db.execute(
-        select(User).where(User.id == booking.client_id)
-    )
-    client = client_result.scalar_one_or_none()
+    client = await db.get(User, booking.client_id)
     
     return build_driver_job_response(
         booking,
@@ -368,16 +387,28 @@ async def accept_job(
             detail="Driver account is not approved"
         )
     
-    # Get booking
+    # Lock the booking for this claim. SKIP LOCKED makes a concurrent claim
+    # of the same job fail fast instead of queueing behind the winner and
+    # then overwriting its driver_id. Relies on READ COMMITTED (the Postgres
+    # default); SQLite ignores the lock clause and serializes writers anyway.
     result = await db.execute(
-        select(Booking).where(Booking.id == booking_id)
+        select(Booking)
+        .where(Booking.id == booking_id)
+        .with_for_update(skip_locked=True)
     )
     booking = result.scalar_one_or_none()
     
     if not booking:
+        exists = await db.scalar(select(Booking.id).where(Booking.id == booking_id))
+        if exists is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Booking not found"
+            )
+        # Row is locked by another driver's claim in flight; client may refresh and retry
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Booking not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking is being accepted by another driver"
         )
     
     if booking.driver_id is not None:
@@ -400,22 +431,19 @@ async def accept_job(
     profile.availability_status = "busy"
     
     # Create event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type="booking.accepted"
     )
-    db.add(event)
     
     await db.commit()
     
     # Send notifications to client
     try:
         # Get client info
-        client_result = await db.execute(
-            select(User).where(User.id == booking.client_id)
-        )
-        client = client_result.scalar_one_or_none()
+        client = await db.get(User, booking.client_id)
         
         # Get vehicle info
         vehicle_result = await db.execute(
@@ -506,12 +534,12 @@ async def arrive_at_pickup(
     booking.status = BookingStatus.DRIVER_ARRIVED.value
     
     # Create event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type="driver.arrived"
     )
-    db.add(event)
     
     await db.commit()
     
@@ -566,12 +594,12 @@ async def start_trip(
     booking.started_at = datetime.utcnow()
     
     # Create event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type="trip.started"
     )
-    db.add(event)
     
     await db.commit()
     
@@ -613,15 +641,12 @@ async def complete_trip(
     booking.status = BookingStatus.COMPLETED.value
     booking.completed_at = datetime.utcnow()
     
-    # final_fare should already be set from booking creation; if not, use base_fare
-    if not booking.final_fare:
-        booking.final_fare = booking.base_fare
-    
     # Calculate driver earnings (80%) and platform fee (20%)
     DRIVER_SHARE = 0.80
-    final_amount = float(booking.final_fare or 0)
-    booking.driver_earnings = round(final_amount * DRIVER_SHARE, 2)
-    booking.platform_fee = round(final_amount * (1 - DRIVER_SHARE), 2)
+    final_cents = booking.final_fare or 0
+    booking.driver_earnings = round(final_cents * DRIVER_SHARE)
+    booking.platform_fee = final_cents - booking.driver_earnings
+    final_amount = from_cents(final_cents)
     
     # Process payment via Stripe
     payment_status = "pending"
@@ -642,7 +667,7 @@ async def complete_trip(
             # Process payment via Stripe
             from app.core.stripe_service import stripe_service
             
-            amount_cents = int(final_amount * 100)  # Convert to cents
+            amount_cents = final_cents
             
             stripe_result = await stripe_service.create_payment_intent(
                 amount=amount_cents,
@@ -653,7 +678,9 @@ async def complete_trip(
                     "booking_id": str(booking.id),
                     "client_id": str(booking.client_id),
                     "driver_id": str(booking.driver_id),
-                }
+                },
+                # A retried completion must not charge the client twice
+                idempotency_key=f"booking-{booking.id}-charge-{amount_cents}",
             )
             
             if stripe_result.get("success"):
@@ -677,7 +704,7 @@ async def complete_trip(
     # Create Payment record
     payment = Payment(
         booking_id=booking.id,
-        amount=final_amount,
+        amount=final_cents,
         currency="USD",
         payment_method="card",
         payment_status=payment_status,
@@ -696,28 +723,25 @@ async def complete_trip(
         profile.availability_status = "available"
     
     # Create event
-    event = BookingEvent(
+    record_booking_event(
+        db,
         booking_id=booking.id,
         actor_id=user_id,
         event_type="trip.completed",
         event_metadata={
             "final_fare": final_amount,
-            "driver_earnings": float(booking.driver_earnings or 0),
-            "platform_fee": float(booking.platform_fee or 0),
+            "driver_earnings": from_cents(booking.driver_earnings),
+            "platform_fee": from_cents(booking.platform_fee),
             "payment_status": payment_status,
         }
     )
-    db.add(event)
     
     await db.commit()
     
     # Send ride receipt and notifications
     try:
         # Get client info
-        client_result = await db.execute(
-            select(User).where(User.id == booking.client_id)
-        )
-        client = client_result.scalar_one_or_none()
+        client = await db.get(User, booking.client_id)
         
         if client:
             # Send email receipt
@@ -730,8 +754,8 @@ async def complete_trip(
                 driver_name=current_user.full_name,
                 distance=float(booking.estimated_distance_km or 0),
                 duration_minutes=int(booking.estimated_duration_min or 0),
-                base_fare=float(booking.base_fare or 0),
-                total_fare=float(booking.final_fare or 0),
+                base_fare=from_cents(booking.base_fare or 0),
+                total_fare=from_cents(booking.final_fare or 0),
                 payment_method="Card",
                 completed_at=booking.completed_at
             )
@@ -742,14 +766,14 @@ async def complete_trip(
                 db=db,
                 client_id=client.id,
                 booking_id=booking.id,
-                total_fare=float(booking.final_fare or 0)
+                total_fare=from_cents(booking.final_fare or 0)
             )
             
             # Push notification to driver about earnings
             await push_service.notify_driver_payment_received(
                 db=db,
                 driver_id=user_id,
-                amount=float(booking.driver_earnings or 0),
+                amount=from_cents(booking.driver_earnings or 0),
                 booking_id=booking.id
             )
     except Exception as notify_err:
@@ -791,10 +815,7 @@ async def get_driver_earnings(
     bookings = result.scalars().all()
     
     total_trips = len(bookings)
-    total_earnings = sum(
-        float(b.final_fare) if b.final_fare else 0 
-        for b in bookings
-    )
+    total_earnings = from_cents(sum(b.final_fare or 0 for b in bookings))
     average_per_trip = total_earnings / total_trips if total_trips > 0 else 0
     
     return DriverEarnings(
@@ -821,21 +842,16 @@ async def get_driver_history(
     result = await db.execute(
         select(Booking).where(
             Booking.driver_id == user_id,
-            or_(
-                Booking.status == BookingStatus.COMPLETED.value,
-                Booking.status.like("canceled%")  # Match all cancellation statuses
-            )
-        ).order_by(Booking.created_at.desc()).offset(offset).limit(page_size)
+            # status is an ENUM on Postgres, so list the values (no LIKE)
+            Booking.status.in_([BookingStatus.COMPLETED.value, *BookingStatus.cancelled_statuses()])
+        ).options(selectinload(Booking.stops))
+        .order_by(Booking.created_at.desc()).offset(offset).limit(page_size)
     )
     bookings = result.scalars().all()
     
     responses = []
     for booking in bookings:
-        # Get stops
-        stops_result = await db.execute(
-            select(BookingStop).where(BookingStop.booking_id == booking.id).order_by(BookingStop.sequence)
-        )
-        stops = stops_result.scalars().all()
+        stops = booking.stops
         
         responses.append(BookingResponse(
             id=booking.id,
@@ -860,16 +876,16 @@ async def get_driver_history(
             special_notes=booking.special_notes,
             estimated_distance_km=float(booking.estimated_distance_km) if booking.estimated_distance_km else None,
             estimated_duration_min=booking.estimated_duration_min,
-            base_fare=float(booking.base_fare) if booking.base_fare else None,
-            distance_fare=float(booking.distance_fare) if booking.distance_fare else None,
-            time_fare=float(booking.time_fare) if booking.time_fare else None,
+            base_fare=from_cents(booking.base_fare),
+            distance_fare=from_cents(booking.distance_fare),
+            time_fare=from_cents(booking.time_fare),
             surge_multiplier=float(booking.surge_multiplier) if booking.surge_multiplier else None,
-            extras_total=float(booking.extras_total) if booking.extras_total else None,
-            tax_total=float(booking.tax_total) if booking.tax_total else None,
-            discount_total=float(booking.discount_total) if booking.discount_total else None,
-            final_fare=float(booking.final_fare) if booking.final_fare else None,
-            driver_earnings=float(booking.driver_earnings) if booking.driver_earnings else None,
-            platform_fee=float(booking.platform_fee) if booking.platform_fee else None,
+            extras_total=from_cents(booking.extras_total),
+            tax_total=from_cents(booking.tax_total),
+            discount_total=from_cents(booking.discount_total),
+            final_fare=from_cents(booking.final_fare),
+            driver_earnings=from_cents(booking.driver_earnings),
+            platform_fee=from_cents(booking.platform_fee),
             driver_rating=booking.driver_rating,
             client_rating=booking.client_rating,
             driver_feedback=booking.driver_feedback,
@@ -887,7 +903,7 @@ async def get_driver_history(
             ) for s in stops]
         ))
     
-    return responses
+    return json_list_response(responses, BookingResponse)
 
 
 # ===========================================
@@ -1147,7 +1163,8 @@ async def review_driver_document(
     await db.refresh(document)
     
     # Log the review action
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         user_id=current_user.id,
         action="document_review",
         entity_type="driver_document",
@@ -1157,7 +1174,6 @@ async def review_driver_document(
             "rejection_reason": request.rejection_reason
         }
     )
-    db.add(audit_log)
     await db.commit()
     
     return DriverDocumentResponse(
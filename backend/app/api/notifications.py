@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, require_roles
 from app.core.email_service import email_service
+from app.core.push_service import cache_subscription, uncache_subscriptions
 from app.models import User
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
@@ -122,7 +123,6 @@ async def subscribe_to_push(
     }
     """
     from app.models import PushSubscription
-    import json
     
     # Check if subscription already exists
     result = await db.execute(
@@ -135,18 +135,21 @@ async def subscribe_to_push(
     
     if existing:
         # Update existing subscription
-        existing.keys_json = json.dumps(subscription.get("keys", {}))
+        existing.keys_json = subscription.get("keys", {})
         existing.updated_at = datetime.utcnow()
+        push_sub = existing
     else:
         # Create new subscription
         push_sub = PushSubscription(
             user_id=current_user.id,
             endpoint=subscription.get("endpoint"),
-            keys_json=json.dumps(subscription.get("keys", {})),
+            keys_json=subscription.get("keys", {}),
         )
         db.add(push_sub)
     
     await db.commit()
+    if push_sub.is_active:
+        await cache_subscription(current_user.id, push_sub.id, push_sub.endpoint, push_sub.keys_json)
     
     return {
         "success": True,
@@ -174,6 +177,7 @@ async def unsubscribe_from_push(
     if subscription:
         await db.delete(subscription)
         await db.commit()
+        await uncache_subscriptions([(current_user.id, subscription.id)])
     
     return {
         "success": True,
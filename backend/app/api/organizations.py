@@ -25,6 +25,7 @@ from app.schemas import (
     OrganizationListResponse,
     SuccessResponse,
 )
+from app.api.response_builders import json_response
 
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
@@ -112,13 +113,12 @@ async def list_organizations(
         }
         items.append(OrganizationResponse(**org_dict))
     
-    return OrganizationListResponse(
+    return json_response(OrganizationListResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size,
-    )
+    ))
 
 
 @router.post("", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
@@ -456,10 +456,7 @@ async def add_organization_member(
         )
     
     # Check user exists
-    user_result = await db.execute(
-        select(User).where(User.id == data.user_id)
-    )
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, data.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, require_roles
 from app.core.enums import BookingStatus, PaymentStatus
+from app.core.money import from_cents
 from app.models import (
     User, PaymentMethod, Payment, Booking, DriverPayout
 )
@@ -224,7 +225,7 @@ async def get_payment_history(
     return [PaymentResponse(
         id=p.id,
         booking_id=p.booking_id,
-        amount=float(p.amount),
+        amount=from_cents(p.amount),
         currency=p.currency,
         payment_method=p.payment_method,
         payment_status=p.payment_status,
@@ -262,7 +263,7 @@ async def get_payment(
     return PaymentResponse(
         id=payment.id,
         booking_id=payment.booking_id,
-        amount=float(payment.amount),
+        amount=from_cents(payment.amount),
         currency=payment.currency,
         payment_method=payment.payment_method,
         payment_status=payment.payment_status,
@@ -298,7 +299,7 @@ async def get_driver_payouts(
     return [DriverPayoutResponse(
         id=p.id,
         driver_id=p.driver_id,
-        amount=float(p.amount),
+        amount=from_cents(p.amount),
         currency=p.currency,
         payout_status=p.payout_status,
         stripe_transfer_id=p.stripe_transfer_id,
@@ -378,11 +379,11 @@ async def get_earnings_summary(
     pending_payout = pending_result.scalar() or 0
     
     return {
-        "today": float(today_earnings),
-        "this_week": float(week_earnings),
-        "this_month": float(month_earnings),
-        "total": float(total_earnings),
-        "pending_payout": float(pending_payout),
+        "today": from_cents(today_earnings),
+        "this_week": from_cents(week_earnings),
+        "this_month": from_cents(month_earnings),
+        "total": from_cents(total_earnings),
+        "pending_payout": from_cents(pending_payout),
         "currency": "USD",
     }
 
@@ -417,15 +418,16 @@ async def process_refund(
             detail="Cannot refund this payment"
         )
     
-    refund_amount = amount or float(payment.amount)
-    if refund_amount > float(payment.amount):
+    payment_amount = from_cents(payment.amount)
+    refund_amount = amount or payment_amount
+    if refund_amount > payment_amount:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Refund amount exceeds payment amount"
         )
     
     payment.refund_amount = refund_amount
-    payment.status = PaymentStatus.REFUNDED.value if refund_amount == float(payment.amount) else PaymentStatus.PARTIALLY_REFUNDED.value
+    payment.status = PaymentStatus.REFUNDED.value if refund_amount == payment_amount else PaymentStatus.PARTIALLY_REFUNDED.value
     
     await db.commit()
     await db.refresh(payment)
@@ -434,7 +436,7 @@ async def process_refund(
         id=payment.id,
         booking_id=payment.booking_id,
         payment_method_id=payment.payment_method_id,
-        amount=float(payment.amount),
+        amount=from_cents(payment.amount),
         currency=payment.currency,
         status=payment.status,
         stripe_payment_intent_id=payment.stripe_payment_intent_id,
@@ -484,7 +486,7 @@ async def create_stripe_payment_intent(
         )
     
     # Calculate amount in cents
-    amount_cents = int(float(booking.final_fare or booking.base_fare or 0) * 100)
+    amount_cents = booking.final_fare or booking.base_fare or 0
     
     if amount_cents <= 0:
         raise HTTPException(
@@ -501,7 +503,9 @@ async def create_stripe_payment_intent(
             "booking_id": str(booking.id),
             "user_id": str(current_user.id),
             "service_type": booking.service_type_id or "standard",
-        }
+        },
+        # Re-requests for the same booking/amount return the same intent
+        idempotency_key=f"booking-{booking.id}-intent-{amount_cents}",
     )
     
     if not result.get("success"):
@@ -521,7 +525,7 @@ async def create_stripe_payment_intent(
     else:
         payment = Payment(
             booking_id=booking_id,
-            amount=float(booking.final_fare or booking.base_fare),
+            amount=amount_cents,
             currency="USD",
             payment_status="pending",
             stripe_payment_intent_id=result["payment_intent_id"],
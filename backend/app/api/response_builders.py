@@ -2,9 +2,14 @@
 Seryvo Platform - Shared Response Builders
 Centralized response building logic to eliminate DRY violations across API modules.
 """
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Sequence
 from decimal import Decimal
 
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.money import from_cents
 from app.models import (
     Booking,
     BookingStop,
@@ -21,6 +26,26 @@ from app.schemas import (
 )
 
 
+def json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+    Returning the model lets FastAPI dump it, re-validate the dict against
+    response_model and serialize it again; larger responses return this
+    instead (response_model still documents the route).
+    """
+    return Response(content=model.__pydantic_serializer__.to_json(model), media_type="application/json")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(item_type: type) -> TypeAdapter:
+    return TypeAdapter(List[item_type])
+
+
+def json_list_response(items: Sequence[BaseModel], item_type: type) -> Response:
+    """json_response() for routes whose response_model is List[item_type]."""
+    return Response(content=_list_adapter(item_type).dump_json(list(items)), media_type="application/json")
+
+
 def build_booking_stop_response(stop: BookingStop) -> BookingStopResponse:
     """
     Build a BookingStopResponse from a BookingStop model.
@@ -110,16 +135,16 @@ def build_booking_response(
         # Pricing
         estimated_distance_km=safe_float(booking.estimated_distance_km),
         estimated_duration_min=booking.estimated_duration_min,
-        base_fare=safe_float(booking.base_fare),
-        distance_fare=safe_float(booking.distance_fare),
-        time_fare=safe_float(booking.time_fare),
+        base_fare=from_cents(booking.base_fare),
+        distance_fare=from_cents(booking.distance_fare),
+        time_fare=from_cents(booking.time_fare),
         surge_multiplier=safe_float(booking.surge_multiplier),
-        extras_total=safe_float(booking.extras_total),
-        tax_total=safe_float(booking.tax_total),
-        discount_total=safe_float(booking.discount_total),
-        final_fare=safe_float(booking.final_fare),
-        driver_earnings=safe_float(booking.driver_earnings),
-        platform_fee=safe_float(booking.platform_fee),
+        extras_total=from_cents(booking.extras_total),
+        tax_total=from_cents(booking.tax_total),
+        discount_total=from_cents(booking.discount_total),
+        final_fare=from_cents(booking.final_fare),
+        driver_earnings=from_cents(booking.driver_earnings),
+        platform_fee=from_cents(booking.platform_fee),
         # Ratings
         client_rating=booking.client_rating,
         driver_rating=booking.driver_rating,
@@ -160,8 +185,8 @@ def build_driver_job_response(
         dropoff_lng=safe_float(booking.dropoff_lng),
         estimated_distance_km=safe_float(booking.estimated_distance_km),
         estimated_duration_min=booking.estimated_duration_min,
-        driver_earnings=safe_float(booking.driver_earnings),
-        final_fare=safe_float(booking.final_fare),
+        driver_earnings=from_cents(booking.driver_earnings),
+        final_fare=from_cents(booking.final_fare),
         passenger_count=booking.passenger_count,
         luggage_count=booking.luggage_count,
         special_notes=booking.special_notes,
@@ -7,12 +7,14 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.event_writer import record_audit_log
 from app.core.dependencies import get_current_user, require_roles
 from app.core.enums import TicketStatus
 from app.models import (
-    User, SupportTicket, TicketMessage, Booking, AuditLog
+    User, SupportTicket, TicketMessage, Booking
 )
 from app.schemas import (
     TicketCreate,
@@ -24,6 +26,7 @@ from app.schemas import (
     UserResponse,
     SuccessResponse,
 )
+from app.api.response_builders import json_response
 
 router = APIRouter(prefix="/support/tickets", tags=["Support"])
 
@@ -86,10 +89,7 @@ async def create_ticket(
     await db.refresh(ticket)
     
     # Get creator info
-    creator_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    creator = creator_result.scalar_one_or_none()
+    creator = await db.get(User, user_id)
     
     creator_response = None
     if creator:
@@ -169,16 +169,15 @@ async def list_tickets(
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size).order_by(SupportTicket.created_at.desc())
     
-    result = await db.execute(query)
+    # Creators/assignees for the whole page in one extra query each
+    result = await db.execute(
+        query.options(selectinload(SupportTicket.creator), selectinload(SupportTicket.assignee))
+    )
     tickets = result.scalars().all()
     
     ticket_responses = []
     for ticket in tickets:
-        # Get creator
-        creator_result = await db.execute(
-            select(User).where(User.id == ticket.user_id)
-        )
-        creator = creator_result.scalar_one_or_none()
+        creator = ticket.creator
         creator_response = None
         if creator:
             creator_response = UserResponse(
@@ -194,22 +193,18 @@ async def list_tickets(
         
         # Get assignee
         assignee_response = None
-        if ticket.assigned_to:
-            assignee_result = await db.execute(
-                select(User).where(User.id == ticket.assigned_to)
+        assignee = ticket.assignee
+        if assignee:
+            assignee_response = UserResponse(
+                id=assignee.id,
+                email=assignee.email,
+                full_name=assignee.full_name,
+                phone=assignee.phone,
+                avatar_url=assignee.avatar_url,
+                is_active=assignee.is_active,
+                created_at=assignee.created_at,
+                roles=[]
             )
-            assignee = assignee_result.scalar_one_or_none()
-            if assignee:
-                assignee_response = UserResponse(
-                    id=assignee.id,
-                    email=assignee.email,
-                    full_name=assignee.full_name,
-                    phone=assignee.phone,
-                    avatar_url=assignee.avatar_url,
-                    is_active=assignee.is_active,
-                    created_at=assignee.created_at,
-                    roles=[]
-                )
         
         ticket_responses.append(TicketResponse(
             id=ticket.id,
@@ -228,15 +223,12 @@ async def list_tickets(
             messages=[]
         ))
     
-    total_pages = (total + page_size - 1) // page_size
-    
-    return TicketListResponse(
+    return json_response(TicketListResponse(
         items=ticket_responses,
         total=total,
         page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+        page_size=page_size
+    ))
 
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
@@ -282,10 +274,7 @@ async def get_ticket(
         if msg.is_internal and not is_staff:
             continue
         
-        sender_result = await db.execute(
-            select(User).where(User.id == msg.sender_id)
-        )
-        sender = sender_result.scalar_one_or_none()
+        sender = await db.get(User, msg.sender_id)
         sender_response = None
         if sender:
             sender_response = UserResponse(
@@ -309,10 +298,7 @@ async def get_ticket(
         ))
     
     # Get creator
-    creator_result = await db.execute(
-        select(User).where(User.id == ticket.user_id)
-    )
-    creator = creator_result.scalar_one_or_none()
+    creator = await db.get(User, ticket.user_id)
     creator_response = None
     if creator:
         creator_response = UserResponse(
@@ -329,10 +315,7 @@ async def get_ticket(
     # Get assignee
     assignee_response = None
     if ticket.assigned_to:
-        assignee_result = await db.execute(
-            select(User).where(User.id == ticket.assigned_to)
-        )
-        assignee = assignee_result.scalar_one_or_none()
+        assignee = await db.get(User, ticket.assigned_to)
         if assignee:
             assignee_response = UserResponse(
                 id=assignee.id,
@@ -405,7 +388,8 @@ async def update_ticket(
     }
     
     if old_values != new_values:
-        audit_log = AuditLog(
+        record_audit_log(
+            db,
             actor_id=user_id,
             action="ticket.updated",
             entity_type="support_ticket",
@@ -413,16 +397,12 @@ async def update_ticket(
             old_value=old_values,
             new_value=new_values
         )
-        db.add(audit_log)
     
     await db.commit()
     await db.refresh(ticket)
     
     # Get creator
-    creator_result = await db.execute(
-        select(User).where(User.id == ticket.user_id)
-    )
-    creator = creator_result.scalar_one_or_none()
+    creator = await db.get(User, ticket.user_id)
     creator_response = None
     if creator:
         creator_response = UserResponse(
@@ -503,10 +483,7 @@ async def add_ticket_message(
     await db.refresh(message)
     
     # Get sender info
-    sender_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    sender = sender_result.scalar_one_or_none()
+    sender = await db.get(User, user_id)
     sender_response = None
     if sender:
         sender_response = UserResponse(
@@ -6,11 +6,13 @@ from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.event_writer import record_audit_log
 from app.core.security import hash_password
 from app.core.dependencies import get_current_user, require_roles
-from app.models import User, Role, UserRole, ClientProfile, AuditLog
+from app.models import User, Role, UserRole, ClientProfile
 from app.schemas import (
     UserCreate,
     UserUpdate,
@@ -19,6 +21,7 @@ from app.schemas import (
     RoleResponse,
     SuccessResponse,
 )
+from app.api.response_builders import json_response
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -69,39 +72,23 @@ async def list_users(
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size).order_by(User.created_at.desc())
     
-    result = await db.execute(query)
+    # Roles for the whole page come from one batched selectin query
+    result = await db.execute(query.options(selectinload(User.roles)))
     users = result.scalars().all()
     
-    # Get roles for each user
     user_responses = []
     for user in users:
-        roles_result = await db.execute(
-            select(Role.name)
-            .join(UserRole, UserRole.role_id == Role.id)
-            .where(UserRole.user_id == user.id)
-        )
-        roles = [r[0] for r in roles_result.fetchall()]
+        roles = [ur.role.name for ur in user.roles]
         
-        user_responses.append(UserResponse(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            phone=user.phone,
-            avatar_url=user.avatar_url,
-            is_active=user.is_active,
-            created_at=user.created_at,
-            roles=roles
-        ))
-    
-    total_pages = (total + page_size - 1) // page_size
-    
-    return UserListResponse(
+        # Columns map straight onto UserResponse; skip re-validating them
+        user_responses.append(UserResponse.from_orm_trusted(user, roles=roles))
+    
+    return json_response(UserListResponse(
         items=user_responses,
         total=total,
         page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+        page_size=page_size
+    ))
 
 
 @router.get("/stats", response_model=dict)
@@ -173,10 +160,7 @@ async def get_user(
             detail="Cannot view other users' profiles"
         )
     
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -242,14 +226,14 @@ async def create_user(
             db.add(user_role)
     
     # Create audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="user.created",
         entity_type="user",
         entity_id=user.id,
         new_value={"email": user.email, "roles": request.roles}
     )
-    db.add(audit_log)
     
     await db.commit()
     await db.refresh(user)
@@ -285,10 +269,7 @@ async def update_user(
             detail="Cannot update other users' profiles"
         )
     
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -321,7 +302,8 @@ async def update_user(
     }
     
     if old_values != new_values:
-        audit_log = AuditLog(
+        record_audit_log(
+            db,
             actor_id=current_user_id,
             action="user.updated",
             entity_type="user",
@@ -329,7 +311,6 @@ async def update_user(
             old_value=old_values,
             new_value=new_values
         )
-        db.add(audit_log)
     
     await db.commit()
     await db.refresh(user)
@@ -361,10 +342,7 @@ async def delete_user(
     current_user: User = Depends(require_admin)
 ):
     """Soft delete a user (deactivate)."""
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -376,13 +354,13 @@ async def delete_user(
     user.is_active = False
     
     # Create audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="user.deleted",
         entity_type="user",
         entity_id=user.id
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -401,10 +379,7 @@ async def assign_role(
 ):
     """Assign a role to a user."""
     # Get user
-    user_result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = user_result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -442,14 +417,14 @@ async def assign_role(
     db.add(user_role)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="user.role_assigned",
         entity_type="user",
         entity_id=user_id,
         new_value={"role": role_name}
     )
-    db.add(audit_log)
     
     await db.commit()
     
@@ -497,14 +472,14 @@ async def remove_role(
     await db.delete(user_role)
     
     # Audit log
-    audit_log = AuditLog(
+    record_audit_log(
+        db,
         actor_id=current_user.id,
         action="user.role_removed",
         entity_type="user",
         entity_id=user_id,
         old_value={"role": role_name}
     )
-    db.add(audit_log)
     
     await db.commit()
     
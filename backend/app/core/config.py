@@ -21,6 +21,13 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./seryvo.db"
+    db_query_cache_size: int = 1200  # SQLAlchemy compiled-statement cache entries
+    db_statement_cache_size: int = 500  # asyncpg prepared statements per connection
+    db_external_pooler: bool = False  # PgBouncer (transaction mode) in front: no app pool, no prepared statements
+    db_pool_recycle_seconds: int = 1800  # Replace app pool connections older than this
+    db_jit: bool = False  # Postgres JIT; its compile cost outweighs any gain on short OLTP queries
+    db_maintenance_interval_seconds: int = 600  # Background housekeeping tick (partitions, expired rows)
+    db_partition_months_ahead: int = 3  # Monthly partitions kept created ahead of time
     
     # JWT Authentication
     secret_key: str = "change-me-in-production"
@@ -31,6 +38,11 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
     
+    # Security headers
+    # Set when the reverse proxy (Traefik) adds CSP/Permissions-Policy/etc.
+    # so the app skips SecurityHeadersMiddleware entirely.
+    security_headers_at_proxy: bool = False
+    
     # Demo Mode
     demo_mode: bool = True
     
@@ -42,6 +54,8 @@ class Settings(BaseSettings):
     stripe_publishable_key: str = ""  # pk_test_...
     stripe_secret_key: str = ""  # sk_test_...
     stripe_webhook_secret: str = ""  # whsec_...
+    stripe_max_concurrency: int = 20  # Max in-flight Stripe calls per process
+    stripe_max_rps: int = 20  # Outbound Stripe requests/sec per process (limits: ~25 test, ~100 live)
     
     # ===========================================
     # RESEND - Email Notifications (FREE TIER)
@@ -92,6 +106,7 @@ class Settings(BaseSettings):
     # ===========================================
     driver_location_stale_minutes: int = 15  # Minutes before driver location is considered stale
     driver_offer_timeout_seconds: int = 60  # Seconds driver has to accept a booking offer
+    driver_job_radius_km: float = 0.0  # Only list jobs with pickup within this radius of the driver (0 = no limit)
     
     # ===========================================
     # BOOKING SETTINGS
@@ -113,6 +128,10 @@ class Settings(BaseSettings):
     def is_production(self) -> bool:
         return self.app_env == "production"
     
+    @property
+    def is_test(self) -> bool:
+        return self.app_env == "test"
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,17 +1,54 @@
 """
 Seryvo Platform - Database Connection
 """
+from uuid import uuid4
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
 
+def _connect_args() -> dict:
+    """asyncpg-only options; SQLite's driver rejects unknown kwargs."""
+    if "+asyncpg" not in settings.database_url:
+        return {}
+    if settings.db_external_pooler:
+        # Transaction pooling hands each transaction to any server
+        # connection. With the caches off statements aren't reused, but the
+        # dialect still prepares each one; asyncpg's default names
+        # (__asyncpg_stmt_N__, restarting per connection) would collide on
+        # a shared server connection, so make every name unique.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        # asyncpg's own prepared-statement cache (server-side statements)
+        "statement_cache_size": settings.db_statement_cache_size,
+        # SQLAlchemy's asyncpg dialect cache of prepared statement handles
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        # Session settings sent at connect; PgBouncer rejects unknown startup
+        # parameters, so only on direct connections
+        "server_settings": {"jit": "on" if settings.db_jit else "off"},
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    query_cache_size=settings.db_query_cache_size,
+    pool_pre_ping=True,
+    connect_args=_connect_args(),
+    # Pooling is PgBouncer's job when it sits in front
+    **(
+        {"poolclass": NullPool} if settings.db_external_pooler
+        else {"pool_recycle": settings.db_pool_recycle_seconds}
+    ),
 )
 
 # Create async session factory
@@ -87,6 +87,15 @@ class BookingStatus(str, Enum):
             cls.DRIVER_EN_ROUTE_PICKUP.value,
         ]
     
+    @classmethod
+    def cancelled_statuses(cls) -> list[str]:
+        """Return list of statuses for a canceled booking, whoever canceled it."""
+        return [
+            cls.CANCELED_BY_CLIENT.value,
+            cls.CANCELED_BY_DRIVER.value,
+            cls.CANCELED_BY_SYSTEM.value,
+        ]
+    
     @classmethod
     def awaiting_driver_statuses(cls) -> list[str]:
         """Return list of statuses where we're looking for a driver."""
@@ -124,6 +133,19 @@ def migrate_legacy_status(legacy_status: str) -> str:
     return LEGACY_STATUS_MAP.get(legacy_status, legacy_status)
 
 
+class StopType(str, Enum):
+    """Booking stop type."""
+    PICKUP = "pickup"
+    DROPOFF = "dropoff"
+    STOP = "stop"
+
+
+class IdentifierType(str, Enum):
+    """Channel an OTP code is sent to."""
+    EMAIL = "email"
+    PHONE = "phone"
+
+
 class DriverPlatformStatus(str, Enum):
     """Driver platform/onboarding status.
     
@@ -0,0 +1,145 @@
+"""
+Seryvo Platform - Background Event Writer
+BookingEvent and AuditLog rows are append-only and never read back by the
+request that creates them, so they are written off the request path:
+
+- record_booking_event()/record_audit_log() stage a row on the session.
+- When the session commits, staged rows move to an in-process queue
+  (rolled-back sessions discard them, so no orphan events).
+- A background task drains the queue, inserting up to EVENT_BATCH_SIZE rows
+  per statement, at least every EVENT_FLUSH_INTERVAL seconds.
+
+Rows still queued when the process dies are lost; shutdown drains the queue.
+When the writer isn't running (scripts, tests) rows are added to the
+session and committed with the caller's transaction, as before.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import async_session_maker
+from app.core.logging_config import get_logger
+from app.models import AuditLog, BookingEvent
+
+
+logger = get_logger(__name__)
+
+EVENT_QUEUE_SIZE = 10_000
+EVENT_BATCH_SIZE = 500
+EVENT_FLUSH_INTERVAL = 0.1
+
+_PENDING_KEY = "pending_event_rows"
+
+_queue: Optional["asyncio.Queue[Optional[Tuple[Type[Any], Dict[str, Any]]]]"] = None
+_task: Optional[asyncio.Task] = None
+
+
+def _record(db: AsyncSession, model: Type[Any], fields: Dict[str, Any]) -> None:
+    fields.setdefault("created_at", datetime.now(timezone.utc))
+    if _queue is None:
+        db.add(model(**fields))
+        return
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append((model, fields))
+
+
+def record_booking_event(db: AsyncSession, **fields: Any) -> None:
+    """Record a BookingEvent once db commits."""
+    _record(db, BookingEvent, fields)
+
+
+def record_audit_log(db: AsyncSession, **fields: Any) -> None:
+    """Record an AuditLog entry once db commits."""
+    _record(db, AuditLog, fields)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if not rows or _queue is None:
+        return
+    for row in rows:
+        try:
+            _queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Event queue full, dropping %s row", row[0].__tablename__)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def _insert(rows: List[Tuple[Type[Any], Dict[str, Any]]]) -> None:
+    """Insert rows with one executemany per model, row by row if that fails."""
+    by_model: Dict[Type[Any], List[Dict[str, Any]]] = defaultdict(list)
+    for model, fields in rows:
+        by_model[model].append(fields)
+
+    try:
+        async with async_session_maker() as session:
+            for model, values in by_model.items():
+                await session.execute(insert(model), values)
+            await session.commit()
+        return
+    except Exception:
+        logger.exception("Batch insert of %d event rows failed, retrying individually", len(rows))
+
+    # One bad row (e.g. a booking deleted in the meantime) shouldn't lose the batch
+    for model, fields in rows:
+        try:
+            async with async_session_maker() as session:
+                await session.execute(insert(model), [fields])
+                await session.commit()
+        except Exception:
+            logger.exception("Dropping %s row", model.__tablename__)
+
+
+async def _writer_loop() -> None:
+    assert _queue is not None
+    stopping = False
+    while not stopping:
+        row = await _queue.get()
+        if row is None:
+            break
+        batch = [row]
+        deadline = time.monotonic() + EVENT_FLUSH_INTERVAL
+        while len(batch) < EVENT_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is None:
+                stopping = True
+                break
+            batch.append(row)
+        await _insert(batch)
+
+
+def start_event_writer() -> None:
+    """Start the background writer; rows are queued from now on."""
+    global _queue, _task
+    if _task is None:
+        _queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        _task = asyncio.create_task(_writer_loop())
+
+
+async def stop_event_writer() -> None:
+    """Flush everything queued so far and stop the writer."""
+    global _queue, _task
+    if _task is None:
+        return
+    queue, task = _queue, _task
+    # New rows go straight into their sessions again
+    _queue = None
+    _task = None
+    await queue.put(None)
+    await task
@@ -0,0 +1,43 @@
+"""
+Seryvo Platform - Geo Helpers
+Great-circle distances for pricing and job matching. Candidates are
+narrowed in SQL with bounding_box() first, so only a handful of points
+per request reach the exact distance check.
+"""
+import math
+from typing import Callable, Tuple
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.0
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km between two points."""
+    return distance_from(lat1, lng1)(lat2, lng2)
+
+
+def distance_from(lat: float, lng: float) -> Callable[[float, float], float]:
+    """
+    Distance-in-km function from a fixed origin. The origin's radians and
+    cosine are computed once, so checking many points against it only pays
+    for the per-point terms.
+    """
+    origin_lat = math.radians(lat)
+    origin_lng = math.radians(lng)
+    origin_cos = math.cos(origin_lat)
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+
+    def distance(point_lat: float, point_lng: float) -> float:
+        lat2 = radians(point_lat)
+        a = sin((lat2 - origin_lat) / 2) ** 2 + origin_cos * cos(lat2) * sin((radians(point_lng) - origin_lng) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+    return distance
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle around a point."""
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    return lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta
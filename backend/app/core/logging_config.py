@@ -3,7 +3,9 @@ Seryvo Platform - Production Logging Configuration
 Provides structured logging without exposing sensitive data.
 """
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
 from functools import lru_cache
 
@@ -64,6 +66,53 @@ class SeryvoFormatter(logging.Formatter):
 # Logger Setup
 # ===========================================
 
+# Loggers only enqueue records; a background QueueListener thread owns the
+# stdout handler, so formatting/writing never blocks the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_listener: Optional[QueueListener] = None
+
+
+def _create_console_handler() -> logging.Handler:
+    """Create the stdout handler used by the queue listener."""
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    
+    # Format based on environment
+    if settings.is_production:
+        # Structured format for production (easier to parse in log aggregators)
+        fmt = '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s"}'
+    else:
+        # Human-readable for development
+        fmt = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
+    
+    formatter = SeryvoFormatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
+    console_handler.setFormatter(formatter)
+    
+    # Add sensitive data filter in production
+    if settings.is_production:
+        console_handler.addFilter(SensitiveDataFilter())
+    
+    return console_handler
+
+
+def start_log_listener() -> None:
+    """Start the background log writer (idempotent)."""
+    global _queue_listener
+    if _queue_listener is None:
+        _queue_listener = QueueListener(
+            _log_queue, _create_console_handler(), respect_handler_level=True
+        )
+        _queue_listener.start()
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the background log writer."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 @lru_cache()
 def get_logger(name: str = "seryvo") -> logging.Logger:
     """
@@ -80,28 +129,9 @@ def get_logger(name: str = "seryvo") -> logging.Logger:
     # Only configure if not already configured
     if not logger.handlers:
         logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG if settings.debug else logging.INFO)
-        
-        # Format based on environment
-        if settings.is_production:
-            # Structured format for production (easier to parse in log aggregators)
-            fmt = '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s"}'
-        else:
-            # Human-readable for development
-            fmt = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
-        
-        formatter = SeryvoFormatter(fmt, datefmt='%Y-%m-%d %H:%M:%S')
-        console_handler.setFormatter(formatter)
-        
-        # Add sensitive data filter in production
-        if settings.is_production:
-            console_handler.addFilter(SensitiveDataFilter())
-        
-        logger.addHandler(console_handler)
+        logger.addHandler(QueueHandler(_log_queue))
         logger.propagate = False
+        start_log_listener()
     
     return logger
 
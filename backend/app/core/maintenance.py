@@ -0,0 +1,122 @@
+"""
+Seryvo Platform - Database Maintenance
+Periodic housekeeping run from the API process. Every worker starts the
+loop; a transaction-scoped advisory lock makes sure only one of them does
+the work on each tick.
+"""
+import asyncio
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import async_session_maker, engine
+from app.core.logging_config import get_logger
+from app.core.otp import purge_expired_otps
+
+
+logger = get_logger(__name__)
+
+# Tables rebuilt as monthly RANGE (created_at) partitions by migration 021
+PARTITIONED_TABLES = ("booking_events", "audit_logs", "conversation_messages")
+
+# Arbitrary constant shared by all workers for pg_try_advisory_xact_lock
+_MAINTENANCE_LOCK_ID = 0x5E7F0001
+
+_PARTITIONED_QUERY = text("""
+    SELECT c.relname FROM pg_partitioned_table p
+    JOIN pg_class c ON c.oid = p.partrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema() AND c.relname = ANY(:tables)
+""")
+
+_task: Optional[asyncio.Task] = None
+
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month `months` after day's month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def ensure_monthly_partitions() -> None:
+    """
+    Create partitions for the current month and the next few (Postgres only).
+    Tables that aren't partitioned (schema from create_all) are skipped.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    this_month = date.today().replace(day=1)
+    async with engine.begin() as conn:
+        locked = await conn.scalar(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": _MAINTENANCE_LOCK_ID})
+        if not locked:
+            return
+
+        # Databases built by create_all instead of the migrations have
+        # plain tables; there's nothing to attach partitions to
+        result = await conn.execute(_PARTITIONED_QUERY, {"tables": list(PARTITIONED_TABLES)})
+        partitioned = {name for (name,) in result}
+
+        for table in PARTITIONED_TABLES:
+            if table not in partitioned:
+                continue
+            try:
+                # Own savepoint, so a failure doesn't abort the other tables
+                async with conn.begin_nested():
+                    for offset in range(settings.db_partition_months_ahead + 1):
+                        start = _add_months(this_month, offset)
+                        end = _add_months(this_month, offset + 1)
+                        await conn.execute(text(
+                            f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y_%m} "
+                            f"PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')"
+                        ))
+            except Exception:
+                logger.exception("Creating monthly partitions for %s failed", table)
+
+
+async def purge_expired_otp_codes() -> None:
+    """Delete long-expired OTP codes (idempotent, safe on every worker)."""
+    async with async_session_maker() as session:
+        deleted = await purge_expired_otps(session)
+    if deleted:
+        logger.info("Purged %d expired OTP codes", deleted)
+
+
+async def run_maintenance() -> None:
+    """Run one round of maintenance, logging instead of raising."""
+    try:
+        await ensure_monthly_partitions()
+    except Exception:
+        logger.exception("Monthly partition maintenance failed")
+    try:
+        await purge_expired_otp_codes()
+    except Exception:
+        logger.exception("Expired OTP purge failed")
+
+
+async def _maintenance_loop() -> None:
+    while True:
+        await run_maintenance()
+        await asyncio.sleep(settings.db_maintenance_interval_seconds)
+
+
+def start_maintenance() -> None:
+    """Start the background maintenance loop."""
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_maintenance_loop())
+
+
+async def stop_maintenance() -> None:
+    """Cancel the background maintenance loop."""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
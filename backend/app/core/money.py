@@ -0,0 +1,20 @@
+"""
+Seryvo Platform - Money Helpers
+Money is stored as integer minor units (cents) and exposed by the API in
+major units (dollars). Convert only at those two boundaries.
+"""
+from typing import Optional, Union
+
+
+def to_cents(amount: Union[int, float, str, None]) -> Optional[int]:
+    """Convert a major-unit amount (e.g. 12.34) to minor units (1234)."""
+    if amount is None:
+        return None
+    return round(float(amount) * 100)
+
+
+def from_cents(cents: Optional[int]) -> Optional[float]:
+    """Convert minor units (1234) to a major-unit amount (12.34)."""
+    if cents is None:
+        return None
+    return cents / 100
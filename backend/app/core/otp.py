@@ -20,6 +20,7 @@ OTP_LENGTH = 6
 OTP_EXPIRY_MINUTES = 5
 OTP_MAX_ATTEMPTS = 3
 OTP_COOLDOWN_SECONDS = 60  # Minimum time between OTP requests
+OTP_RETENTION = timedelta(days=1)  # Expired codes are deleted after this
 
 
 def generate_otp_code() -> str:
@@ -31,16 +32,12 @@ def mask_identifier(identifier: str, identifier_type: str) -> str:
     """Mask email or phone for display (privacy protection)."""
     if identifier_type == 'email':
         # j***@example.com
-        parts = identifier.split('@')
-        if len(parts) == 2:
-            local = parts[0]
-            domain = parts[1]
-            if len(local) > 2:
-                masked_local = local[0] + '***' + local[-1]
-            else:
-                masked_local = local[0] + '***'
-            return f"{masked_local}@{domain}"
-        return '***@***'
+        local, at, domain = identifier.rpartition('@')
+        if not at or not local:
+            return '***@***'
+        if len(local) > 2:
+            return f"{local[0]}***{local[-1]}@{domain}"
+        return f"{local[0]}***@{domain}"
     else:
         # ***-***-1234
         if len(identifier) >= 4:
@@ -48,6 +45,14 @@ def mask_identifier(identifier: str, identifier_type: str) -> str:
         return '***-***-****'
 
 
+async def purge_expired_otps(db: AsyncSession) -> int:
+    """Delete codes that expired more than OTP_RETENTION ago. Returns rows deleted."""
+    cutoff = datetime.now(timezone.utc) - OTP_RETENTION
+    result = await db.execute(delete(OTPCode).where(OTPCode.expires_at < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
 def hash_otp(code: str, identifier: str) -> str:
     """Hash OTP code with identifier for storage (optional security measure)."""
     # For simplicity, we store plain code, but this could be enhanced
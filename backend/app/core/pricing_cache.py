@@ -0,0 +1,220 @@
+"""
+Seryvo Platform - Pricing Configuration Cache
+Process-local TTL cache for pricing configuration that is read on every
+estimate/booking but only changes through the admin panel.
+
+Cached values are plain frozen dataclasses, never ORM instances, so they
+can be shared across sessions safely. Any insert/update/delete of the
+underlying models through the ORM clears the cache; other processes pick
+up the change within PRICING_CACHE_TTL seconds.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import get_logger
+from app.core.money import from_cents
+from app.models import PricingRule, Region, ServiceType, SurgeRule
+
+
+logger = get_logger(__name__)
+
+
+PRICING_CACHE_TTL = 60.0
+
+# {key: (expires_at, value)}
+_cache: Dict[Hashable, Tuple[float, Any]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class PricingRuleData:
+    """Detached copy of the PricingRule fields used for fare calculation (major units)."""
+    id: int
+    region_id: Optional[int]
+    base_fare: float
+    per_km: float
+    per_minute: float
+    minimum_fare: float
+    currency: str
+
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_hhmm(value: Optional[str]) -> Optional[int]:
+    """Minutes after midnight for "HH:MM" (seconds ignored); None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        hours, minutes = (int(part) for part in value.split(":")[:2])
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def surge_window_mask(time_start: Optional[str], time_end: Optional[str], days_of_week: Optional[List[str]]) -> int:
+    """
+    Bitmap of the minutes of the week (Monday 00:00 = bit 0) a surge rule covers.
+    
+    The window opens on each listed day (every day if none); a window
+    ending at or before its start runs past midnight into the next day.
+    """
+    start = parse_hhmm(time_start)
+    end = parse_hhmm(time_end)
+    if start is None:
+        start = 0
+    if end is None or end == start:
+        end = start + MINUTES_PER_DAY
+    elif end < start:
+        end += MINUTES_PER_DAY
+    length = end - start
+    
+    unknown = [d for d in (days_of_week or ()) if d not in WEEKDAYS]
+    if unknown:
+        logger.warning("Ignoring unknown surge rule days %r", unknown)
+    days = [WEEKDAYS.index(d) for d in (days_of_week or WEEKDAYS) if d in WEEKDAYS]
+    window = (1 << length) - 1
+    mask = 0
+    for day in days:
+        offset = day * MINUTES_PER_DAY + start
+        shifted = window << offset
+        # Sunday-night windows wrap around to Monday morning
+        mask |= (shifted | (shifted >> MINUTES_PER_WEEK)) & ((1 << MINUTES_PER_WEEK) - 1)
+    return mask
+
+
+def _zone(name: Optional[str]) -> tzinfo:
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown region timezone %r, using UTC for surge windows", name)
+        return timezone.utc
+
+
+@dataclass(frozen=True, slots=True)
+class SurgeRuleData:
+    """Detached copy of an active SurgeRule with its time window precomputed."""
+    id: int
+    region_id: Optional[int]
+    multiplier: float
+    active_mask: int  # see surge_window_mask()
+    zone: tzinfo  # region's timezone; windows are local time
+    
+    def is_active_at(self, moment: datetime) -> bool:
+        """Whether moment (timezone-aware) falls inside the rule's window."""
+        local = moment.astimezone(self.zone)
+        minute = local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+        return bool((self.active_mask >> minute) & 1)
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceTypeData:
+    """Detached copy of an active ServiceType."""
+    id: int
+    code: str
+    name: str
+    description: Optional[str]
+    base_capacity: int
+    is_active: bool
+
+
+def clear_pricing_cache(*_: Any) -> None:
+    """Drop all cached pricing configuration."""
+    _cache.clear()
+
+
+async def _cached(key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for key, loading it if missing or expired."""
+    entry = _cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    value = await loader()
+    _cache[key] = (time.monotonic() + PRICING_CACHE_TTL, value)
+    return value
+
+
+async def get_pricing_rule(db: AsyncSession, service_type_id: Optional[int] = None) -> Optional[PricingRuleData]:
+    """Active pricing rule for a service type (or a generic one), if any."""
+    async def load() -> Optional[PricingRuleData]:
+        query = select(PricingRule).where(PricingRule.is_active == True)
+        if service_type_id:
+            query = query.where(
+                or_(
+                    PricingRule.service_type_id == service_type_id,
+                    PricingRule.service_type_id.is_(None)
+                )
+            )
+        result = await db.execute(query.limit(1))
+        rule = result.scalar_one_or_none()
+        if not rule:
+            return None
+        return PricingRuleData(
+            id=rule.id,
+            region_id=rule.region_id,
+            base_fare=from_cents(rule.base_fare),
+            per_km=from_cents(rule.per_km),
+            per_minute=from_cents(rule.per_minute),
+            minimum_fare=from_cents(rule.minimum_fare),
+            currency=rule.currency,
+        )
+
+    return await _cached(("pricing_rule", service_type_id), load)
+
+
+async def get_active_surge_rules(db: AsyncSession) -> Tuple[SurgeRuleData, ...]:
+    """All active surge rules."""
+    async def load() -> Tuple[SurgeRuleData, ...]:
+        result = await db.execute(
+            select(SurgeRule, Region.timezone)
+            .outerjoin(Region, Region.id == SurgeRule.region_id)
+            .where(SurgeRule.is_active == True)
+        )
+        return tuple(
+            SurgeRuleData(
+                id=rule.id,
+                region_id=rule.region_id,
+                multiplier=float(rule.multiplier),
+                active_mask=surge_window_mask(rule.time_start, rule.time_end, rule.days_of_week),
+                zone=_zone(region_timezone),
+            )
+            for rule, region_timezone in result
+        )
+
+    return await _cached("surge_rules", load)
+
+
+async def get_active_service_types(db: AsyncSession) -> Tuple[ServiceTypeData, ...]:
+    """All active service types."""
+    async def load() -> Tuple[ServiceTypeData, ...]:
+        result = await db.execute(select(ServiceType).where(ServiceType.is_active == True))
+        return tuple(
+            ServiceTypeData(
+                id=st.id,
+                code=st.code,
+                name=st.name,
+                description=st.description,
+                base_capacity=st.base_capacity,
+                is_active=st.is_active,
+            )
+            for st in result.scalars()
+        )
+
+    return await _cached("service_types", load)
+
+
+# Invalidate on any ORM write to the cached models
+for _model in (PricingRule, SurgeRule, ServiceType, Region):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, clear_pricing_cache)
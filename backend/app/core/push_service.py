@@ -11,21 +11,235 @@ Generate keys:
   python -c "from py_vapid import Vapid; v = Vapid(); v.generate_keys(); print('Public:', v.public_key.urlsafe_b64encode()); print('Private:', v.private_key.urlsafe_b64encode())"
 """
 import json
-from typing import Optional, Dict, Any, List
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
+from urllib.parse import urlparse
 
 try:
-    from pywebpush import webpush, WebPushException
+    from pywebpush import WebPusher, WebPushException
+    from py_vapid import Vapid
     WEBPUSH_AVAILABLE = True
 except ImportError:
     WEBPUSH_AVAILABLE = False
-    webpush = None
+    WebPusher = None
+    Vapid = None
     WebPushException = Exception
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.redis_client import get_redis
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class PushResult:
+    """Outcome of delivering a push notification to a single subscription."""
+    success: bool
+    expired: bool = False  # 410 Gone - subscription expired
+    invalid: bool = False  # 404 Not Found - subscription invalid
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CachedSubscription:
+    """Active push subscription as mirrored in Redis."""
+    id: int
+    user_id: int
+    endpoint: str
+    keys_json: Dict[str, Any]
+
+
+# Active subscriptions are mirrored into one Redis hash per user
+# (field = subscription id, value = {"endpoint", "keys"}). Postgres stays the
+# source of truth; PUSH_CACHE_READY_KEY marks a completed rebuild so reads
+# fall back to the database if Redis was flushed or never populated.
+PUSH_CACHE_KEY = "push:user:{}"
+PUSH_CACHE_READY_KEY = "push:ready"
+PUSH_CACHE_LOCK_KEY = "push:rebuild_lock"
+PUSH_CACHE_LOCK_TTL = 60  # seconds; outlives any realistic rebuild
+
+
+def _subscription_value(endpoint: str, keys: Optional[Dict[str, Any]]) -> str:
+    return orjson.dumps({"endpoint": endpoint, "keys": keys or {}}).decode()
+
+
+async def cache_subscription(user_id: int, subscription_id: int, endpoint: str, keys: Optional[Dict[str, Any]]) -> None:
+    """Write-through an active subscription to Redis."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.hset(PUSH_CACHE_KEY.format(user_id), str(subscription_id), _subscription_value(endpoint, keys))
+    except Exception as e:
+        logger.warning("Push cache write failed: %s", e)
+
+
+async def uncache_subscriptions(subscriptions: List[Tuple[int, int]]) -> None:
+    """Remove (user_id, subscription_id) pairs from Redis."""
+    redis = get_redis()
+    if redis is None or not subscriptions:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id, subscription_id in subscriptions:
+                pipe.hdel(PUSH_CACHE_KEY.format(user_id), str(subscription_id))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Push cache delete failed: %s", e)
+
+
+async def invalidate_user_subscriptions(user_ids: List[int]) -> None:
+    """Drop the cached subscriptions of deleted users.
+
+    Call after the deleting transaction commits: SQLite reuses ids, so a
+    leftover hash would send a new account the old owner's pushes.
+    """
+    redis = get_redis()
+    if redis is None or not user_ids:
+        return
+    try:
+        await redis.delete(*(PUSH_CACHE_KEY.format(user_id) for user_id in user_ids))
+    except Exception as e:
+        logger.warning("Push cache invalidation failed: %s", e)
+
+
+async def reset_subscription_cache() -> None:
+    """Forget the whole cache after a bulk wipe; the next startup rebuilds it."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(PUSH_CACHE_READY_KEY)
+        stale = [key async for key in redis.scan_iter(match=PUSH_CACHE_KEY.format("*"))]
+        if stale:
+            await redis.delete(*stale)
+    except Exception as e:
+        logger.warning("Push cache reset failed: %s", e)
+
+
+async def rebuild_subscription_cache(db: AsyncSession) -> None:
+    """Reload every active subscription from Postgres into Redis.
+    
+    Runs at startup in every worker, but only one rebuilds: the cache is
+    left alone while PUSH_CACHE_READY_KEY is set, and PUSH_CACHE_LOCK_KEY
+    (SET NX) keeps concurrent startups out. Leftover keys are cleared before
+    the snapshot is read and the snapshot is merged in with HSET, so
+    write-through subscribes from other workers are never deleted.
+    """
+    from app.models import PushSubscription
+    
+    redis = get_redis()
+    if redis is None:
+        return
+    
+    try:
+        if await redis.exists(PUSH_CACHE_READY_KEY):
+            return
+        if not await redis.set(PUSH_CACHE_LOCK_KEY, "1", nx=True, ex=PUSH_CACHE_LOCK_TTL):
+            return
+    except Exception as e:
+        logger.warning("Push cache rebuild failed: %s", e)
+        return
+    
+    try:
+        stale = [key async for key in redis.scan_iter(match=PUSH_CACHE_KEY.format("*"))]
+        if stale:
+            await redis.delete(*stale)
+        
+        result = await db.execute(
+            select(
+                PushSubscription.user_id,
+                PushSubscription.id,
+                PushSubscription.endpoint,
+                PushSubscription.keys_json,
+            ).where(PushSubscription.is_active == True)
+        )
+        by_user: Dict[int, Dict[str, str]] = {}
+        for user_id, sub_id, endpoint, keys in result:
+            by_user.setdefault(user_id, {})[str(sub_id)] = _subscription_value(endpoint, keys)
+        
+        async with redis.pipeline(transaction=True) as pipe:
+            for user_id, mapping in by_user.items():
+                pipe.hset(PUSH_CACHE_KEY.format(user_id), mapping=mapping)
+            pipe.set(PUSH_CACHE_READY_KEY, "1")
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Push cache rebuild failed: %s", e)
+    finally:
+        try:
+            await redis.delete(PUSH_CACHE_LOCK_KEY)
+        except Exception:
+            pass
+
+
+async def _get_cached_subscriptions(user_ids: List[int]) -> Optional[List[CachedSubscription]]:
+    """Active subscriptions from Redis, or None if the cache can't be used."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.exists(PUSH_CACHE_READY_KEY)
+            for user_id in user_ids:
+                pipe.hgetall(PUSH_CACHE_KEY.format(user_id))
+            ready, *hashes = await pipe.execute()
+    except Exception as e:
+        logger.warning("Push cache read failed: %s", e)
+        return None
+    
+    if not ready:
+        return None
+    
+    subscriptions = []
+    for user_id, mapping in zip(user_ids, hashes):
+        for sub_id, value in mapping.items():
+            data = orjson.loads(value)
+            subscriptions.append(CachedSubscription(int(sub_id), user_id, data["endpoint"], data["keys"]))
+    return subscriptions
+
+
+# VAPID JWTs are scoped to the push service origin ("aud"), so one signature
+# can be reused for every subscription on that origin until it nears expiry.
+VAPID_TOKEN_LIFETIME = 12 * 60 * 60  # pywebpush default
+VAPID_REFRESH_MARGIN = 60 * 60
+
+_vapid_signer = None
+_vapid_cache: Dict[str, Tuple[Dict[str, str], float]] = {}
+
+
+def _get_vapid_headers(endpoint: str) -> Dict[str, str]:
+    """Get signed VAPID headers for the endpoint's origin, reusing a cached signature."""
+    global _vapid_signer
+    
+    parsed = urlparse(endpoint)
+    aud = f"{parsed.scheme}://{parsed.netloc}"
+    now = time.time()
+    
+    cached = _vapid_cache.get(aud)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    
+    if _vapid_signer is None:
+        _vapid_signer = Vapid.from_string(private_key=settings.vapid_private_key)
+    
+    exp = int(now) + VAPID_TOKEN_LIFETIME
+    headers = _vapid_signer.sign({
+        "sub": settings.vapid_mailto,
+        "aud": aud,
+        "exp": exp,
+    })
+    _vapid_cache[aud] = (headers, exp - VAPID_REFRESH_MARGIN)
+    return headers
 
 
 class PushService:
@@ -60,7 +274,7 @@ class PushService:
         url: Optional[str] = None,
         data: Optional[Dict[str, Any]] = None,
         ttl: int = 86400  # Time to live in seconds (24 hours default)
-    ) -> Dict[str, Any]:
+    ) -> PushResult:
         """
         Send a push notification to a single subscription.
         
@@ -75,18 +289,30 @@ class PushService:
             ttl: Time to live on push server
             
         Returns:
-            Dict with success status
+            PushResult with success status
         """
         if not PushService.is_configured():
             print(f"[DEV PUSH] Title: {title}")
             print(f"[DEV PUSH] Body: {body}")
-            return {
-                "success": True,
-                "message": "Push logged (WebPush not configured)"
-            }
+            return PushResult(success=True, message="Push logged (WebPush not configured)")
         
-        # Build notification payload
-        payload = {
+        return await PushService._deliver(
+            subscription_info,
+            PushService._build_payload(title, body, icon, badge, url, data),
+            ttl,
+        )
+    
+    @staticmethod
+    def _build_payload(
+        title: str,
+        body: str,
+        icon: Optional[str] = None,
+        badge: Optional[str] = None,
+        url: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build and encode the notification payload shared by every subscription."""
+        return json.dumps({
             "notification": {
                 "title": title,
                 "body": body,
@@ -99,50 +325,127 @@ class PushService:
                     **(data or {})
                 }
             }
-        }
+        })
+    
+    @staticmethod
+    async def _deliver(
+        subscription_info: Dict[str, Any],
+        payload: str,
+        ttl: int
+    ) -> PushResult:
+        """Deliver an already-encoded payload to a single subscription."""
+        if not PushService.is_configured():
+            print(f"[DEV PUSH] {payload}")
+            return PushResult(success=True, message="Push logged (WebPush not configured)")
         
         try:
-            webpush(
-                subscription_info=subscription_info,
-                data=json.dumps(payload),
-                vapid_private_key=settings.vapid_private_key,
-                vapid_claims={
-                    "sub": settings.vapid_mailto
-                },
+            # Same request webpush() would make, minus re-signing the JWT
+            response = WebPusher(subscription_info).send(
+                data=payload,
+                headers=dict(_get_vapid_headers(subscription_info["endpoint"])),
                 ttl=ttl
             )
+            if response.status_code > 202:
+                raise WebPushException(
+                    f"Push failed: {response.status_code} {response.reason}",
+                    response=response
+                )
             
-            return {"success": True}
+            return PushResult(success=True)
             
         except WebPushException as e:
-            error_info = {
-                "success": False,
-                "error": str(e),
-            }
+            result = PushResult(success=False, error=str(e))
             
             # Check for specific error codes
             if e.response is not None:
-                error_info["status_code"] = e.response.status_code
+                result.status_code = e.response.status_code
                 
                 # 410 Gone - subscription expired
                 if e.response.status_code == 410:
-                    error_info["expired"] = True
-                    error_info["message"] = "Subscription expired"
+                    result.expired = True
+                    result.message = "Subscription expired"
                     
                 # 404 Not Found - subscription invalid
                 elif e.response.status_code == 404:
-                    error_info["invalid"] = True
-                    error_info["message"] = "Subscription not found"
+                    result.invalid = True
+                    result.message = "Subscription not found"
             
-            print(f"[Push Error] {error_info}")
-            return error_info
+            print(f"[Push Error] {result}")
+            return result
         
         except Exception as e:
             print(f"[Push Error] Unexpected error: {e}")
-            return {
-                "success": False,
-                "error": str(e)
+            return PushResult(success=False, error=str(e))
+    
+    @staticmethod
+    async def _broadcast(
+        db: AsyncSession,
+        subscriptions: List[Any],
+        payload: str,
+        ttl: int
+    ) -> Dict[str, int]:
+        """
+        Fan an encoded payload out to subscriptions, once per unique endpoint.
+        
+        Expired/invalid subscriptions are deactivated in a single UPDATE.
+        """
+        from app.models import PushSubscription
+        
+        sent = 0
+        failed = 0
+        expired = []
+        seen_endpoints = set()
+        
+        for sub in subscriptions:
+            # The same browser can end up registered under several rows
+            if sub.endpoint in seen_endpoints:
+                continue
+            seen_endpoints.add(sub.endpoint)
+            
+            # Build subscription info from stored data
+            subscription_info = {
+                "endpoint": sub.endpoint,
+                "keys": sub.keys_json or {}
             }
+            
+            result = await PushService._deliver(subscription_info, payload, ttl)
+            
+            if result.success:
+                sent += 1
+            else:
+                failed += 1
+                # Mark expired/invalid subscriptions for cleanup
+                if result.expired or result.invalid:
+                    expired.append((sub.user_id, sub.id))
+        
+        # Clean up expired subscriptions
+        if expired:
+            await db.execute(
+                update(PushSubscription)
+                .where(PushSubscription.id.in_([sub_id for _, sub_id in expired]))
+                .values(is_active=False)
+            )
+            await db.commit()
+            await uncache_subscriptions(expired)
+        
+        return {"sent": sent, "failed": failed}
+    
+    @staticmethod
+    async def _get_active_subscriptions(db: AsyncSession, user_ids: List[int]) -> List[Any]:
+        """Get all active subscriptions for the given users (Redis first, then one query)."""
+        from app.models import PushSubscription
+        
+        cached = await _get_cached_subscriptions(user_ids)
+        if cached is not None:
+            return cached
+        
+        result = await db.execute(
+            select(PushSubscription).where(
+                PushSubscription.user_id.in_(user_ids),
+                PushSubscription.is_active == True
+            )
+        )
+        return result.scalars().all()
     
     @staticmethod
     async def send_to_user(
@@ -165,16 +468,7 @@ class PushService:
         Returns:
             Dict with sent/failed counts
         """
-        from app.models import PushSubscription
-        
-        # Get all active subscriptions for user
-        result = await db.execute(
-            select(PushSubscription).where(
-                PushSubscription.user_id == user_id,
-                PushSubscription.is_active == True
-            )
-        )
-        subscriptions = result.scalars().all()
+        subscriptions = await PushService._get_active_subscriptions(db, [user_id])
         
         if not subscriptions:
             return {
@@ -184,43 +478,13 @@ class PushService:
                 "message": "No active subscriptions"
             }
         
-        sent = 0
-        failed = 0
-        expired_subs = []
-        
-        for sub in subscriptions:
-            # Build subscription info from stored data
-            subscription_info = {
-                "endpoint": sub.endpoint,
-                "keys": json.loads(sub.keys_json) if sub.keys_json else {}
-            }
-            
-            result = await PushService.send_notification(
-                subscription_info=subscription_info,
-                title=title,
-                body=body,
-                **kwargs
-            )
-            
-            if result.get("success"):
-                sent += 1
-            else:
-                failed += 1
-                # Mark expired/invalid subscriptions for cleanup
-                if result.get("expired") or result.get("invalid"):
-                    expired_subs.append(sub)
-        
-        # Clean up expired subscriptions
-        for sub in expired_subs:
-            sub.is_active = False
-        
-        if expired_subs:
-            await db.commit()
+        ttl = kwargs.pop("ttl", 86400)
+        payload = PushService._build_payload(title, body, **kwargs)
+        counts = await PushService._broadcast(db, subscriptions, payload, ttl)
         
         return {
-            "success": sent > 0,
-            "sent": sent,
-            "failed": failed,
+            "success": counts["sent"] > 0,
+            **counts,
         }
     
     @staticmethod
@@ -233,25 +497,19 @@ class PushService:
     ) -> Dict[str, Any]:
         """
         Send push notification to multiple users.
+        
+        Subscriptions for all users are loaded in one query, duplicate
+        endpoints are collapsed, and the payload is encoded once.
         """
-        total_sent = 0
-        total_failed = 0
+        ttl = kwargs.pop("ttl", 86400)
+        payload = PushService._build_payload(title, body, **kwargs)
         
-        for user_id in user_ids:
-            result = await PushService.send_to_user(
-                db=db,
-                user_id=user_id,
-                title=title,
-                body=body,
-                **kwargs
-            )
-            total_sent += result.get("sent", 0)
-            total_failed += result.get("failed", 0)
+        subscriptions = await PushService._get_active_subscriptions(db, user_ids)
+        counts = await PushService._broadcast(db, subscriptions, payload, ttl)
         
         return {
-            "success": total_sent > 0,
-            "sent": total_sent,
-            "failed": total_failed,
+            "success": counts["sent"] > 0,
+            **counts,
         }
     
     # ===================================================
@@ -59,14 +59,17 @@ def create_limiter() -> Limiter:
     if settings.redis_url and settings.is_production:
         storage_uri = settings.redis_url
     
+    # Test runs don't rate limit (see main.py)
+    enabled = settings.rate_limit_enabled and not settings.is_test
+    
     return Limiter(
         key_func=get_rate_limit_key,
-        default_limits=[settings.rate_limit_default] if settings.rate_limit_enabled else [],
+        default_limits=[settings.rate_limit_default] if enabled else [],
         storage_uri=storage_uri,
         headers_enabled=True,  # Add X-RateLimit headers to responses
         strategy="fixed-window",  # Use fixed-window strategy
         swallow_errors=True,  # Don't crash if Redis is down
-        enabled=settings.rate_limit_enabled,
+        enabled=enabled,
     )
 
 
@@ -0,0 +1,37 @@
+"""
+Seryvo Platform - Redis Client
+Shared asyncio Redis connection, used the same way as the rate limiter:
+only in production and only when REDIS_URL is set. Callers must treat a
+None client (or any Redis error) as "fall back to the database".
+"""
+from typing import Optional
+
+try:
+    from redis import asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis_asyncio = None
+
+from app.core.config import settings
+
+
+_client = None
+
+
+def get_redis() -> Optional["redis_asyncio.Redis"]:
+    """Return the shared Redis client, or None when Redis isn't in use."""
+    global _client
+    if not (REDIS_AVAILABLE and settings.redis_url and settings.is_production):
+        return None
+    if _client is None:
+        _client = redis_asyncio.from_url(settings.redis_url, decode_responses=True)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -7,86 +7,102 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 
+# Header values never change between responses, so they are encoded once at
+# import time and appended straight onto ``response.raw_headers`` unless the
+# response already carries that header.
+_STATIC_HEADERS: list[tuple[bytes, bytes]] = [
+    # ===========================================
+    # Content Security Policy
+    # ===========================================
+    # Restricts resources the client can load
+    # Note: Adjust as needed for your frontend requirements
+    (
+        b"content-security-policy",
+        b"default-src 'self'; "
+        b"script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Needed for some frameworks
+        b"style-src 'self' 'unsafe-inline'; "
+        b"img-src 'self' data: https:; "
+        b"font-src 'self' data:; "
+        b"connect-src 'self' https: wss:; "
+        b"frame-ancestors 'self'; "
+        b"form-action 'self'; "
+        b"base-uri 'self'",
+    ),
+
+    # ===========================================
+    # XSS Protection (Legacy but still useful)
+    # ===========================================
+    (b"x-xss-protection", b"1; mode=block"),
+
+    # ===========================================
+    # Content Type Sniffing Protection
+    # ===========================================
+    # Prevents browsers from MIME-sniffing
+    (b"x-content-type-options", b"nosniff"),
+
+    # ===========================================
+    # Clickjacking Protection
+    # ===========================================
+    # Prevents the page from being embedded in iframes
+    (b"x-frame-options", b"DENY"),
+
+    # ===========================================
+    # Referrer Policy
+    # ===========================================
+    # Controls how much referrer info is sent
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+
+    # ===========================================
+    # Permissions Policy (formerly Feature-Policy)
+    # ===========================================
+    # Controls browser features
+    (
+        b"permissions-policy",
+        b"accelerometer=(), "
+        b"camera=(), "
+        b"geolocation=(self), "  # Allow for location services
+        b"gyroscope=(), "
+        b"magnetometer=(), "
+        b"microphone=(), "
+        b"payment=(self), "  # Allow for payment processing
+        b"usb=()",
+    ),
+
+    # ===========================================
+    # Strict Transport Security (HSTS)
+    # ===========================================
+    # Forces HTTPS for 1 year, includes subdomains
+    # Note: Only add in production with valid SSL
+    # This is typically handled by the reverse proxy (nginx)
+    # Uncomment if backend serves directly:
+    # (b"strict-transport-security", b"max-age=31536000; includeSubDomains; preload"),
+]
+
+# ===========================================
+# Cache Control for API responses
+# ===========================================
+# Prevent caching of sensitive API responses
+_API_CACHE_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"cache-control", b"no-store, no-cache, must-revalidate, private"),
+    (b"pragma", b"no-cache"),
+    (b"expires", b"0"),
+]
+
+_API_HEADERS: list[tuple[bytes, bytes]] = _STATIC_HEADERS + _API_CACHE_HEADERS
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """
     Middleware to add security headers to all responses.
     These headers help protect against common web vulnerabilities.
     """
-    
+
     async def dispatch(self, request: Request, call_next) -> Response:
         response = await call_next(request)
-        
-        # ===========================================
-        # Content Security Policy
-        # ===========================================
-        # Restricts resources the client can load
-        # Note: Adjust as needed for your frontend requirements
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Needed for some frameworks
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self' https: wss:; "
-            "frame-ancestors 'self'; "
-            "form-action 'self'; "
-            "base-uri 'self'"
-        )
-        
-        # ===========================================
-        # XSS Protection (Legacy but still useful)
-        # ===========================================
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # ===========================================
-        # Content Type Sniffing Protection
-        # ===========================================
-        # Prevents browsers from MIME-sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # ===========================================
-        # Clickjacking Protection
-        # ===========================================
-        # Prevents the page from being embedded in iframes
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # ===========================================
-        # Referrer Policy
-        # ===========================================
-        # Controls how much referrer info is sent
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # ===========================================
-        # Permissions Policy (formerly Feature-Policy)
-        # ===========================================
-        # Controls browser features
-        response.headers["Permissions-Policy"] = (
-            "accelerometer=(), "
-            "camera=(), "
-            "geolocation=(self), "  # Allow for location services
-            "gyroscope=(), "
-            "magnetometer=(), "
-            "microphone=(), "
-            "payment=(self), "  # Allow for payment processing
-            "usb=()"
-        )
-        
-        # ===========================================
-        # Strict Transport Security (HSTS)
-        # ===========================================
-        # Forces HTTPS for 1 year, includes subdomains
-        # Note: Only add in production with valid SSL
-        # This is typically handled by the reverse proxy (nginx)
-        # Uncomment if backend serves directly:
-        # response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-        
-        # ===========================================
-        # Cache Control for API responses
-        # ===========================================
-        # Prevent caching of sensitive API responses
-        if request.url.path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-        
+
+        headers = _API_HEADERS if request.scope["path"][:5] == "/api/" else _STATIC_HEADERS
+        # Routes may set their own cache-control/CSP/etc.; don't send a second copy
+        present = {name for name, _ in response.raw_headers}
+        response.raw_headers.extend(header for header in headers if header[0] not in present)
+
         return response
@@ -0,0 +1,105 @@
+"""
+Seryvo Platform - String Interning
+Addresses and user agents are stored once in string_pool and referenced by
+id. Writers intern the strings first, then point the row at them:
+
+    ids = await intern_strings(db, [pickup, dropoff])
+    assign_interned(booking, ids, pickup_address=pickup, dropoff_address=dropoff)
+
+Ids of committed strings never change, so each worker keeps an LRU of
+{sha256: id} and only goes to the database for strings it hasn't seen.
+Ids looked up or inserted by a session are only cached once it commits;
+until then the row may be this transaction's own uncommitted insert.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import StringPool
+
+
+STRING_CACHE_SIZE = 10_000
+
+_PENDING_KEY = "pending_string_ids"
+
+_ids: "OrderedDict[bytes, int]" = OrderedDict()
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode("utf-8")).digest()
+
+
+def _remember(digest: bytes, string_id: int) -> None:
+    _ids[digest] = string_id
+    _ids.move_to_end(digest)
+    if len(_ids) > STRING_CACHE_SIZE:
+        _ids.popitem(last=False)
+
+
+async def intern_strings(db: AsyncSession, values: Iterable[Optional[str]]) -> Dict[str, int]:
+    """Return {value: string_pool id}, inserting values not stored yet. None is skipped."""
+    ids: Dict[str, int] = {}
+    missing: Dict[bytes, str] = {}
+    for value in set(v for v in values if v is not None):
+        digest = _digest(value)
+        cached = _ids.get(digest)
+        if cached is not None:
+            _ids.move_to_end(digest)
+            ids[value] = cached
+        else:
+            missing[digest] = value
+
+    if missing:
+        # Rows found or inserted below may be this transaction's own and
+        # uncommitted, so their ids are staged and cached only on commit
+        staged: Dict[bytes, int] = db.sync_session.info.setdefault(_PENDING_KEY, {})
+        result = await db.execute(
+            select(StringPool.sha256, StringPool.id).where(StringPool.sha256.in_(list(missing)))
+        )
+        for digest, string_id in result:
+            ids[missing.pop(digest)] = string_id
+            staged[digest] = string_id
+
+    if missing:
+        insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(StringPool).values([
+            {"sha256": digest, "value": value} for digest, value in missing.items()
+        ])
+        # DO UPDATE (not NOTHING) so a concurrent insert still RETURNs its id
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StringPool.sha256],
+            set_={"value": stmt.excluded.value},
+        ).returning(StringPool.sha256, StringPool.id)
+        for digest, string_id in await db.execute(stmt):
+            ids[missing[digest]] = string_id
+            staged[digest] = string_id
+
+    return ids
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed(session: Session) -> None:
+    for digest, string_id in session.info.pop(_PENDING_KEY, {}).items():
+        _remember(digest, string_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def assign_interned(obj: Any, ids: Dict[str, int], **values: Optional[str]) -> None:
+    """
+    Point obj's <name>_id columns at interned strings and populate <name>
+    itself, so new rows can be serialized without reloading them.
+    """
+    for name, value in values.items():
+        setattr(obj, f"{name}_id", ids[value] if value is not None else None)
+        set_committed_value(obj, name, value)
@@ -8,22 +8,106 @@ Configuration:
 - Test CVC: Any 3 digits
 - Test Expiry: Any future date
 """
+import asyncio
 import os
-from typing import Optional, Dict, Any
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
 import stripe
 from stripe.error import StripeError
 
 from app.core.config import settings
+from app.core.logging_config import get_logger
+
+
+logger = get_logger(__name__)
 
 
 # Initialize Stripe with test key
 stripe.api_key = settings.stripe_secret_key
 
+# The key is fixed for the process lifetime, so the mode is too
+_IS_TEST_MODE = settings.stripe_secret_key.startswith("sk_test_")
+
+# One pooled async HTTP client for the whole process, so calls reuse
+# keep-alive connections to api.stripe.com instead of re-handshaking TLS.
+# Closed on app shutdown via StripeService.close().
+_http_client = stripe.HTTPXClient()
+stripe.default_http_client = _http_client
+
+# Retry network errors/409/5xx with stripe-python's exponential backoff.
+# Safe because every mutating call below carries an Idempotency-Key.
+stripe.max_network_retries = 2
+
+
+class _RateLimiter:
+    """Spaces acquisitions at least 1/rate seconds apart, in arrival order."""
+    
+    def __init__(self, rate: int):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+    
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Every outbound call goes through _call(): the semaphore bounds in-flight
+# requests and the limiter keeps us under Stripe's per-second ceiling, so
+# bursts queue here instead of turning into 429s and SDK retry storms.
+# Both are per process; with N workers set the limits to roughly 1/N.
+# A value of 0 or less (e.g. STRIPE_MAX_RPS=0) falls back to the default of
+# 20 instead of deadlocking the semaphore or failing at import.
+STRIPE_DEFAULT_LIMIT = 20
+_stripe_semaphore = asyncio.Semaphore(
+    settings.stripe_max_concurrency if settings.stripe_max_concurrency > 0 else STRIPE_DEFAULT_LIMIT
+)
+_stripe_rate_limiter = _RateLimiter(
+    settings.stripe_max_rps if settings.stripe_max_rps > 0 else STRIPE_DEFAULT_LIMIT
+)
+
+
+async def _call(method, *args, **kwargs):
+    """Run a stripe-python *_async method under the concurrency and rate limits."""
+    async with _stripe_semaphore:
+        await _stripe_rate_limiter.acquire()
+        return await method(*args, **kwargs)
+
+
+# Short-lived cache of settled PaymentIntent lookups: {id: (expires_at, result)}
+PAYMENT_INTENT_CACHE_TTL = 5.0
+PAYMENT_INTENT_CACHE_MAX = 10_000
+_CACHEABLE_INTENT_STATUSES = frozenset({"succeeded", "canceled"})
+_intent_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _invalidate_payment_intent(payment_intent_id: str) -> None:
+    """Drop a cached PaymentIntent after we change it (or a webhook reports a change)."""
+    _intent_cache.pop(payment_intent_id, None)
+
+
+# Sent as-is on every intent; stripe-python only reads request params.
+# metadata=None is dropped by the SDK's encoder, so no empty dict is needed.
+_AUTOMATIC_PAYMENT_METHODS = {"enabled": True, "allow_redirects": "never"}
+
+
+def _idempotency_key(key: Optional[str]) -> str:
+    """Use the caller's key (e.g. derived from a booking) or a random one."""
+    return key or str(uuid.uuid4())
+
 
 class StripeService:
-    """Stripe payment processing service for Seryvo."""
+    """
+    Stripe payment processing service for Seryvo.
+    
+    All calls use stripe-python's *_async methods so the event loop keeps
+    serving other requests during the Stripe round-trip.
+    """
     
     # Test card numbers for development
     TEST_CARDS = {
@@ -39,29 +123,37 @@ class StripeService:
     @staticmethod
     def is_test_mode() -> bool:
         """Check if Stripe is in test mode."""
-        return settings.stripe_secret_key.startswith("sk_test_")
+        return _IS_TEST_MODE
+    
+    @staticmethod
+    async def close() -> None:
+        """Close the pooled Stripe HTTP client (call on app shutdown)."""
+        await _http_client.close_async()
     
     @staticmethod
     async def create_customer(
         email: str,
         name: Optional[str] = None,
         phone: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Optional[str]:
         """
         Create a Stripe customer.
         Returns the Stripe customer ID.
         """
         try:
-            customer = stripe.Customer.create(
+            customer = await _call(
+                stripe.Customer.create_async,
                 email=email,
                 name=name,
                 phone=phone,
-                metadata=metadata or {}
+                metadata=metadata,
+                idempotency_key=_idempotency_key(idempotency_key)
             )
             return customer.id
         except StripeError as e:
-            print(f"[Stripe] Error creating customer: {e}")
+            logger.warning("Stripe create_customer failed: %s", e)
             return None
     
     @staticmethod
@@ -71,7 +163,8 @@ class StripeService:
         customer_id: Optional[str] = None,
         payment_method_id: Optional[str] = None,
         description: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a PaymentIntent for a ride payment.
@@ -83,30 +176,28 @@ class StripeService:
             payment_method_id: Optional saved payment method
             description: Description of the charge
             metadata: Additional metadata (booking_id, etc.)
+            idempotency_key: Key so retries don't create a second intent
             
         Returns:
             Dict with client_secret and payment_intent_id
         """
         try:
-            intent_params = {
-                "amount": amount,
-                "currency": currency,
-                "description": description or "Seryvo Ride Payment",
-                "metadata": metadata or {},
-                "automatic_payment_methods": {
-                    "enabled": True,
-                    "allow_redirects": "never"
-                }
+            # Optional params are only sent when set
+            optional_params = {
+                **({"customer": customer_id} if customer_id else {}),
+                **({"payment_method": payment_method_id, "confirm": True} if payment_method_id else {}),
             }
             
-            if customer_id:
-                intent_params["customer"] = customer_id
-            
-            if payment_method_id:
-                intent_params["payment_method"] = payment_method_id
-                intent_params["confirm"] = True
-            
-            payment_intent = stripe.PaymentIntent.create(**intent_params)
+            payment_intent = await _call(
+                stripe.PaymentIntent.create_async,
+                amount=amount,
+                currency=currency,
+                description=description or "Seryvo Ride Payment",
+                metadata=metadata,
+                automatic_payment_methods=_AUTOMATIC_PAYMENT_METHODS,
+                idempotency_key=_idempotency_key(idempotency_key),
+                **optional_params
+            )
             
             return {
                 "success": True,
@@ -118,6 +209,7 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe create_payment_intent failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -126,15 +218,18 @@ class StripeService:
     @staticmethod
     async def confirm_payment_intent(
         payment_intent_id: str,
-        payment_method_id: str
+        payment_method_id: str,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Confirm a PaymentIntent with a payment method.
         """
         try:
-            payment_intent = stripe.PaymentIntent.confirm(
+            payment_intent = await _call(
+                stripe.PaymentIntent.confirm_async,
                 payment_intent_id,
-                payment_method=payment_method_id
+                payment_method=payment_method_id,
+                idempotency_key=_idempotency_key(idempotency_key)
             )
             
             return {
@@ -145,18 +240,29 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe confirm_payment_intent failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
             }
+        
+        finally:
+            _invalidate_payment_intent(payment_intent_id)
     
     @staticmethod
-    async def capture_payment_intent(payment_intent_id: str) -> Dict[str, Any]:
+    async def capture_payment_intent(
+        payment_intent_id: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Capture a confirmed PaymentIntent (for delayed capture scenarios).
         """
         try:
-            payment_intent = stripe.PaymentIntent.capture(payment_intent_id)
+            payment_intent = await _call(
+                stripe.PaymentIntent.capture_async,
+                payment_intent_id,
+                idempotency_key=_idempotency_key(idempotency_key)
+            )
             
             return {
                 "success": True,
@@ -166,16 +272,21 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe capture_payment_intent failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
             }
+        
+        finally:
+            _invalidate_payment_intent(payment_intent_id)
     
     @staticmethod
     async def refund_payment(
         payment_intent_id: str,
         amount: Optional[int] = None,  # Partial refund amount in cents
-        reason: Optional[str] = None
+        reason: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Refund a payment (full or partial).
@@ -184,6 +295,7 @@ class StripeService:
             payment_intent_id: The PaymentIntent to refund
             amount: Optional partial refund amount in cents
             reason: Optional reason (duplicate, fraudulent, requested_by_customer)
+            idempotency_key: e.g. f"refund:{booking_id}:{attempt}" so retries collapse
         """
         try:
             refund_params = {
@@ -196,7 +308,11 @@ class StripeService:
             if reason:
                 refund_params["reason"] = reason
             
-            refund = stripe.Refund.create(**refund_params)
+            refund = await _call(
+                stripe.Refund.create_async,
+                **refund_params,
+                idempotency_key=_idempotency_key(idempotency_key)
+            )
             
             return {
                 "success": True,
@@ -206,17 +322,22 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe refund_payment failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
             }
+        
+        finally:
+            _invalidate_payment_intent(payment_intent_id)
     
     @staticmethod
     async def create_payout_to_driver(
         amount: int,  # Amount in cents
         destination_account: str,  # Connected account ID
         description: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a payout to a driver's connected account.
@@ -225,12 +346,14 @@ class StripeService:
         In test mode, this simulates the payout.
         """
         try:
-            transfer = stripe.Transfer.create(
+            transfer = await _call(
+                stripe.Transfer.create_async,
                 amount=amount,
                 currency="usd",
                 destination=destination_account,
                 description=description or "Seryvo Driver Payout",
-                metadata=metadata or {}
+                metadata=metadata,
+                idempotency_key=_idempotency_key(idempotency_key)
             )
             
             return {
@@ -241,6 +364,7 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe create_payout_to_driver failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -249,30 +373,35 @@ class StripeService:
     @staticmethod
     async def attach_payment_method(
         payment_method_id: str,
-        customer_id: str
+        customer_id: str,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Attach a payment method to a customer for future use.
         """
         try:
-            payment_method = stripe.PaymentMethod.attach(
+            payment_method = await _call(
+                stripe.PaymentMethod.attach_async,
                 payment_method_id,
-                customer=customer_id
+                customer=customer_id,
+                idempotency_key=_idempotency_key(idempotency_key)
             )
             
+            card = payment_method.card
             return {
                 "success": True,
                 "payment_method_id": payment_method.id,
                 "type": payment_method.type,
                 "card": {
-                    "brand": payment_method.card.brand if payment_method.card else None,
-                    "last4": payment_method.card.last4 if payment_method.card else None,
-                    "exp_month": payment_method.card.exp_month if payment_method.card else None,
-                    "exp_year": payment_method.card.exp_year if payment_method.card else None,
+                    "brand": getattr(card, "brand", None),
+                    "last4": getattr(card, "last4", None),
+                    "exp_month": getattr(card, "exp_month", None),
+                    "exp_year": getattr(card, "exp_year", None),
                 }
             }
             
         except StripeError as e:
+            logger.warning("Stripe attach_payment_method failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -280,39 +409,90 @@ class StripeService:
     
     @staticmethod
     async def get_payment_intent(payment_intent_id: str) -> Dict[str, Any]:
-        """Retrieve a PaymentIntent by ID."""
+        """
+        Retrieve a PaymentIntent by ID.
+        
+        Settled intents (succeeded/canceled) are cached for a few seconds;
+        in-progress ones are always fetched since the client may be
+        confirming them through Stripe.js.
+        """
+        cached = _intent_cache.get(payment_intent_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
-            payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
+            payment_intent = await _call(stripe.PaymentIntent.retrieve_async, payment_intent_id)
             
-            return {
+            result = {
                 "success": True,
                 "payment_intent_id": payment_intent.id,
                 "status": payment_intent.status,
                 "amount": payment_intent.amount,
                 "amount_received": payment_intent.amount_received,
                 "currency": payment_intent.currency,
-                "metadata": dict(payment_intent.metadata),
+                # StripeObject is a dict subclass; no need to copy it
+                "metadata": payment_intent.metadata,
             }
             
+            if payment_intent.status in _CACHEABLE_INTENT_STATUSES:
+                if len(_intent_cache) >= PAYMENT_INTENT_CACHE_MAX:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    _intent_cache.pop(next(iter(_intent_cache)))
+                _intent_cache[payment_intent_id] = (
+                    time.monotonic() + PAYMENT_INTENT_CACHE_TTL,
+                    result,
+                )
+            
+            return result
+            
         except StripeError as e:
+            logger.warning("Stripe get_payment_intent failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
             }
     
     @staticmethod
-    def create_setup_intent(customer_id: str) -> Dict[str, Any]:
+    async def get_payment_intents_bulk(payment_intent_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Retrieve several PaymentIntents concurrently (bounded by _call's limits).
+        Results are returned in the same order as the IDs.
+        """
+        return await asyncio.gather(*[
+            StripeService.get_payment_intent(pi_id) for pi_id in payment_intent_ids
+        ])
+    
+    @staticmethod
+    async def refund_payments_bulk(
+        items: List[Tuple[str, Optional[int]]],
+        reason: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Refund several payments concurrently (bounded by _call's limits).
+        
+        Args:
+            items: (payment_intent_id, amount_in_cents or None for full refund) pairs
+            reason: Optional reason applied to every refund
+        """
+        return await asyncio.gather(*[
+            StripeService.refund_payment(pi_id, amount, reason) for pi_id, amount in items
+        ])
+    
+    @staticmethod
+    async def create_setup_intent(
+        customer_id: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Create a SetupIntent for saving a payment method without charging.
         Used for adding cards to customer profiles.
         """
         try:
-            setup_intent = stripe.SetupIntent.create(
+            setup_intent = await _call(
+                stripe.SetupIntent.create_async,
                 customer=customer_id,
-                automatic_payment_methods={
-                    "enabled": True,
-                    "allow_redirects": "never"
-                }
+                automatic_payment_methods=_AUTOMATIC_PAYMENT_METHODS,
+                idempotency_key=_idempotency_key(idempotency_key)
             )
             
             return {
@@ -322,6 +502,7 @@ class StripeService:
             }
             
         except StripeError as e:
+            logger.warning("Stripe create_setup_intent failed: %s", e)
             return {
                 "success": False,
                 "error": str(e),
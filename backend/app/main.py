@@ -5,12 +5,20 @@ Entry point for the backend API server
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import async_session_maker, init_db, close_db
+from app.core.errors import SeryvoException, ErrorCode
+from app.core.logging_config import get_logger, stop_log_listener
+from app.core.event_writer import start_event_writer, stop_event_writer
+from app.core.maintenance import start_maintenance, stop_maintenance
+from app.core.push_service import rebuild_subscription_cache
+from app.core.redis_client import close_redis
 from app.core.rate_limiter import setup_rate_limiting
 from app.core.security_headers import SecurityHeadersMiddleware
+from app.core.stripe_service import stripe_service
 from app.api import (
     auth_router,
     users_router,
@@ -25,6 +33,9 @@ from app.api import (
 )
 
 
+logger = get_logger(__name__)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
@@ -32,13 +43,22 @@ async def lifespan(app: FastAPI):
     print(f"Starting {settings.app_name}...")
     await init_db()
     print("Database initialized")
+    async with async_session_maker() as session:
+        await rebuild_subscription_cache(session)
+    start_maintenance()
+    start_event_writer()
     
     yield
     
     # Shutdown
     print("Shutting down...")
+    await stop_maintenance()
+    await stop_event_writer()
     await close_db()
     print("Database connection closed")
+    await stripe_service.close()
+    await close_redis()
+    stop_log_listener()
 
 
 # Create FastAPI app
@@ -50,6 +70,7 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -61,22 +82,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add Security Headers (production-ready)
-app.add_middleware(SecurityHeadersMiddleware)
-
-# Configure Rate Limiting
-setup_rate_limiting(app)
-
-
-# Import custom exception for handler
-from app.core.errors import SeryvoException, ErrorCode
+# Test runs skip security headers and rate limiting (no limiter storage round-trips)
+if not settings.is_test:
+    # Add Security Headers (production-ready)
+    # In docker-compose deployments Traefik adds these, keeping them off the Python path
+    if not settings.security_headers_at_proxy:
+        app.add_middleware(SecurityHeadersMiddleware)
+    
+    # Configure Rate Limiting
+    setup_rate_limiting(app)
 
 
 # Custom SeryvoException handler
 @app.exception_handler(SeryvoException)
 async def seryvo_exception_handler(request: Request, exc: SeryvoException):
     """Handle Seryvo-specific exceptions with standardized format."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -86,31 +107,39 @@ async def seryvo_exception_handler(request: Request, exc: SeryvoException):
     )
 
 
+# Body for non-debug 500s is constant, so encode it once
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "success": False,
+    "error": {
+        "error_code": ErrorCode.INTERNAL_ERROR.value,
+        "message": "An internal error occurred",
+    },
+})
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions."""
+    # Traceback is only formatted if the handler actually emits
+    logger.exception("Unhandled exception on %s %s", request.method, request.url.path)
+    
     if settings.debug:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
                 "error": {
                     "error_code": ErrorCode.INTERNAL_ERROR.value,
                     "message": "An internal error occurred",
-                    "detail": str(exc),
+                    "detail": f"{type(exc).__name__}: {exc}",
                 },
             }
         )
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=500,
-        content={
-            "success": False,
-            "error": {
-                "error_code": ErrorCode.INTERNAL_ERROR.value,
-                "message": "An internal error occurred",
-            },
-        }
+        media_type="application/json",
     )
 
 
@@ -133,16 +162,21 @@ async def root():
 
 
 # Include routers
-app.include_router(auth_router, prefix="/api/v1")
-app.include_router(users_router, prefix="/api/v1")
-app.include_router(bookings_router, prefix="/api/v1")
-app.include_router(drivers_router, prefix="/api/v1")
-app.include_router(admin_router, prefix="/api/v1")
-app.include_router(support_router, prefix="/api/v1")
-app.include_router(websocket_router, prefix="/api/v1")
-app.include_router(payments_router, prefix="/api/v1")
-app.include_router(notifications_router, prefix="/api/v1")
-app.include_router(organizations_router, prefix="/api/v1")
+_ROUTERS = (
+    auth_router,
+    users_router,
+    bookings_router,
+    drivers_router,
+    admin_router,
+    support_router,
+    websocket_router,
+    payments_router,
+    notifications_router,
+    organizations_router,
+)
+
+for _router in _ROUTERS:
+    app.include_router(_router, prefix="/api/v1")
 
 
 # Run with uvicorn
@@ -37,6 +37,11 @@ from app.models.models import (
     # Multi-tenancy
     Organization,
     OrganizationMember,
+    # Payment idempotency
+    StripeWebhookEvent,
+    IdempotencyKey,
+    # Interned strings
+    StringPool,
 )
 
 __all__ = [
@@ -77,4 +82,9 @@ __all__ = [
     # Multi-tenancy
     "Organization",
     "OrganizationMember",
+    # Payment idempotency
+    "StripeWebhookEvent",
+    "IdempotencyKey",
+    # Interned strings
+    "StringPool",
 ]
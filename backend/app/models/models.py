@@ -6,13 +6,50 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
 from sqlalchemy import (
-    String, Integer, Boolean, Text, Numeric, 
-    ForeignKey, DateTime, JSON, Index
+    String, Integer, BigInteger, Boolean, Text, Numeric, Double, Computed,
+    ForeignKey, DateTime, JSON, Index, Enum, LargeBinary, select, text
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import ARRAY, CITEXT, JSONB
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship, validates
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.core.enums import BookingStatus, IdentifierType, PayoutStatus, StopType
+
+
+# JSON on SQLite, binary JSONB on Postgres (indexable, no re-parse on read)
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
+# Codes users type in any case; equality (and the unique index) ignore case
+CaseInsensitiveCode = String(50, collation="NOCASE").with_variant(CITEXT(), "postgresql")
+
+
+def native_enum(enum_cls, name: str) -> Enum:
+    """Postgres ENUM over an enum's values (VARCHAR elsewhere); values load as plain str."""
+    return Enum(*(member.value for member in enum_cls), name=name)
+
+
+class StringPool(Base):
+    """
+    Interned long strings (addresses, user agents) that repeat across many rows.
+    Rows reference them by id; see app.core.string_pool for writing.
+    """
+    __tablename__ = "string_pool"
+    
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    sha256: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False, unique=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+def interned(id_column) -> Mapped[str]:
+    """
+    Read-only string loaded with the row through its string_pool id.
+    Not expired on flush, so app.core.string_pool can populate it on new rows.
+    """
+    return column_property(
+        select(StringPool.value).where(StringPool.id == id_column).scalar_subquery(),
+        expire_on_flush=False,
+    )
 
 
 # ===========================================
@@ -37,7 +74,7 @@ class User(Base):
     __tablename__ = "users"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(320), unique=True, nullable=False, index=True)  # Stored lowercased
     phone: Mapped[Optional[str]] = mapped_column(String(50))
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -60,6 +97,15 @@ class User(Base):
     bookings_as_driver: Mapped[List["Booking"]] = relationship(
         back_populates="driver", foreign_keys="Booking.driver_id"
     )
+    
+    @validates("email")
+    def _normalize_email(self, key: str, value: str) -> str:
+        """Emails are case-insensitive; store them lowercased so lookups hit the index."""
+        return value.strip().lower() if value else value
+
+
+# Case-insensitive uniqueness guard for rows written outside the ORM
+Index("ux_users_email_lower", func.lower(User.email), unique=True)
 
 
 class UserRole(Base):
@@ -70,7 +116,12 @@ class UserRole(Base):
     role_id: Mapped[int] = mapped_column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True)
     
     user: Mapped["User"] = relationship(back_populates="roles")
-    role: Mapped["Role"] = relationship(back_populates="users")
+    # Every user_roles row has a role, so load it with an INNER JOIN alongside the row
+    role: Mapped["Role"] = relationship(back_populates="users", lazy="joined", innerjoin=True)
+    
+    __table_args__ = (
+        Index("ix_user_roles_role_id", "role_id"),
+    )
 
 
 class Permission(Base):
@@ -104,7 +155,9 @@ class ClientProfile(Base):
     __tablename__ = "client_profiles"
     
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
-    default_payment_method_id: Mapped[Optional[int]] = mapped_column(Integer)
+    default_payment_method_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("payment_methods.id", ondelete="SET NULL")
+    )
     default_currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
     default_language: Mapped[Optional[str]] = mapped_column(String(10))
     notes: Mapped[Optional[str]] = mapped_column(Text)
@@ -114,6 +167,11 @@ class ClientProfile(Base):
     
     user: Mapped["User"] = relationship(back_populates="client_profile")
     saved_locations: Mapped[List["SavedLocation"]] = relationship(back_populates="client")
+    default_payment_method: Mapped[Optional["PaymentMethod"]] = relationship(lazy="joined")
+    
+    __table_args__ = (
+        Index("ix_client_profiles_default_payment_method_id", "default_payment_method_id"),
+    )
 
 
 class DriverProfile(Base):
@@ -123,8 +181,8 @@ class DriverProfile(Base):
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     status: Mapped[str] = mapped_column(String(50), default="pending_verification", nullable=False)
     availability_status: Mapped[str] = mapped_column(String(50), default="offline", nullable=False)
-    current_lat: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
-    current_lng: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
+    current_lat: Mapped[Optional[float]] = mapped_column(Double)
+    current_lng: Mapped[Optional[float]] = mapped_column(Double)
     location_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     rating_average: Mapped[Optional[float]] = mapped_column(Numeric(3, 2))
     total_ratings: Mapped[int] = mapped_column(Integer, default=0)
@@ -137,6 +195,22 @@ class DriverProfile(Base):
     user: Mapped["User"] = relationship(back_populates="driver_profile")
     vehicles: Mapped[List["Vehicle"]] = relationship(back_populates="driver", foreign_keys="[Vehicle.driver_id]", primaryjoin="Vehicle.driver_id == DriverProfile.user_id")
     documents: Mapped[List["DriverDocument"]] = relationship(back_populates="driver", foreign_keys="[DriverDocument.driver_id]", primaryjoin="DriverDocument.driver_id == DriverProfile.user_id")
+    
+    __table_args__ = (
+        # Partial indexes: only available drivers are ever matched by location,
+        # and they are a small fraction of all driver profiles
+        Index(
+            "ix_driver_available_loc", "current_lat", "current_lng",
+            postgresql_where=text("availability_status = 'available'"),
+            sqlite_where=text("availability_status = 'available'"),
+        ),
+        Index(
+            "ix_driver_available_loc_updated", "location_updated_at",
+            postgresql_where=text("availability_status = 'available'"),
+            sqlite_where=text("availability_status = 'available'"),
+        ),
+        Index("ix_driver_profiles_status", "status"),
+    )
 
 
 class SavedLocation(Base):
@@ -152,8 +226,8 @@ class SavedLocation(Base):
     state: Mapped[Optional[str]] = mapped_column(String(100))
     postal_code: Mapped[Optional[str]] = mapped_column(String(50))
     country: Mapped[Optional[str]] = mapped_column(String(100))
-    latitude: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
-    longitude: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
+    latitude: Mapped[Optional[float]] = mapped_column(Double)
+    longitude: Mapped[Optional[float]] = mapped_column(Double)
     is_default: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
@@ -209,12 +283,12 @@ class Region(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     organization_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"), index=True)
-    code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    code: Mapped[str] = mapped_column(CaseInsensitiveCode, unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     timezone: Mapped[Optional[str]] = mapped_column(String(50))
     currency: Mapped[str] = mapped_column(String(3), nullable=False, default="USD")
     description: Mapped[Optional[str]] = mapped_column(Text)
-    geojson: Mapped[Optional[dict]] = mapped_column(JSON)
+    geojson: Mapped[Optional[dict]] = mapped_column(JSONVariant)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
@@ -227,7 +301,7 @@ class ServiceType(Base):
     __tablename__ = "service_types"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    code: Mapped[str] = mapped_column(CaseInsensitiveCode, unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     base_capacity: Mapped[int] = mapped_column(Integer, default=4)
@@ -242,10 +316,11 @@ class PricingRule(Base):
     organization_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"), index=True)
     region_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("regions.id", ondelete="SET NULL"))
     service_type_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("service_types.id", ondelete="SET NULL"))
-    base_fare: Mapped[float] = mapped_column(Numeric(10, 2), default=0, nullable=False)
-    per_km: Mapped[float] = mapped_column(Numeric(10, 2), default=0, nullable=False)
-    per_minute: Mapped[float] = mapped_column(Numeric(10, 2), default=0, nullable=False)
-    minimum_fare: Mapped[float] = mapped_column(Numeric(10, 2), default=0, nullable=False)
+    # Money columns are integer minor units (cents); see app.core.money
+    base_fare: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    per_km: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    per_minute: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    minimum_fare: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     currency: Mapped[str] = mapped_column(String(10), default="USD", nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -265,7 +340,7 @@ class SurgeRule(Base):
     multiplier: Mapped[float] = mapped_column(Numeric(5, 2), default=1.0, nullable=False)
     time_start: Mapped[Optional[str]] = mapped_column(String(10))  # HH:MM format
     time_end: Mapped[Optional[str]] = mapped_column(String(10))
-    days_of_week: Mapped[Optional[str]] = mapped_column(String(50))  # comma-separated
+    days_of_week: Mapped[Optional[List[str]]] = mapped_column(JSON().with_variant(ARRAY(String(10)), "postgresql"))  # ["mon", "tue", ...]
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -277,12 +352,18 @@ class Surcharge(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     surcharge_type: Mapped[str] = mapped_column(String(50), nullable=False)  # airport, toll, congestion, event, custom
-    amount: Mapped[float] = mapped_column(Numeric(10, 2), default=0, nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)  # cents, or basis points if is_percentage
     is_percentage: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    location_keywords: Mapped[Optional[str]] = mapped_column(Text)  # comma-separated keywords
-    applies_to_service_types: Mapped[Optional[str]] = mapped_column(String(255))  # comma-separated codes
+    location_keywords: Mapped[Optional[List[str]]] = mapped_column(JSON().with_variant(ARRAY(Text), "postgresql"))
+    applies_to_service_types: Mapped[Optional[List[str]]] = mapped_column(JSON().with_variant(ARRAY(String(50)), "postgresql"))  # service type codes
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Overlap/containment lookups (&&, @>) on Postgres arrays
+        Index("ix_surcharges_keywords_gin", "location_keywords", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("ix_surcharges_service_types_gin", "applies_to_service_types", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 # ===========================================
@@ -295,7 +376,7 @@ class Promotion(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     organization_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"), index=True)
-    code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    code: Mapped[str] = mapped_column(CaseInsensitiveCode, unique=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     discount_type: Mapped[str] = mapped_column(String(20), nullable=False)  # percentage or fixed
     discount_value: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
@@ -314,25 +395,39 @@ class Promotion(Base):
 # 5. Booking & Trip Model
 # ===========================================
 
+# What the client pays, in cents; kept by the database from the fare components
+FINAL_FARE_SQL = (
+    "COALESCE(base_fare, 0) + COALESCE(distance_fare, 0) + COALESCE(time_fare, 0)"
+    " + COALESCE(extras_total, 0) + COALESCE(tax_total, 0) - COALESCE(discount_total, 0)"
+)
+
+
 class Booking(Base):
     """Trip bookings."""
     __tablename__ = "bookings"
+    # Read final_fare back with the INSERT/UPDATE instead of lazy-loading it later
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     organization_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"), index=True)
-    client_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    driver_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    client_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    driver_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     service_type_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("service_types.id", ondelete="SET NULL"))
+    # Snapshot of what priced the booking, set at creation
+    region_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("regions.id", ondelete="SET NULL"))
+    pricing_rule_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("pricing_rules.id", ondelete="SET NULL"))
     
-    status: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(native_enum(BookingStatus, "booking_status"), nullable=False)
     is_asap: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     
-    pickup_address: Mapped[str] = mapped_column(String(500), nullable=False)
-    pickup_lat: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
-    pickup_lng: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
-    dropoff_address: Mapped[str] = mapped_column(String(500), nullable=False)
-    dropoff_lat: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
-    dropoff_lng: Mapped[Optional[float]] = mapped_column(Numeric(10, 7))
+    pickup_address_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("string_pool.id"), nullable=False)
+    pickup_address: Mapped[str] = interned(pickup_address_id)
+    pickup_lat: Mapped[Optional[float]] = mapped_column(Double)
+    pickup_lng: Mapped[Optional[float]] = mapped_column(Double)
+    dropoff_address_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("string_pool.id"), nullable=False)
+    dropoff_address: Mapped[str] = interned(dropoff_address_id)
+    dropoff_lat: Mapped[Optional[float]] = mapped_column(Double)
+    dropoff_lng: Mapped[Optional[float]] = mapped_column(Double)
     
     requested_pickup_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     confirmed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
@@ -347,16 +442,17 @@ class Booking(Base):
     estimated_distance_km: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
     estimated_duration_min: Mapped[Optional[int]] = mapped_column(Integer)
     
-    base_fare: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    distance_fare: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    time_fare: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
+    # Fare columns are integer minor units (cents); see app.core.money
+    base_fare: Mapped[Optional[int]] = mapped_column(BigInteger)
+    distance_fare: Mapped[Optional[int]] = mapped_column(BigInteger)
+    time_fare: Mapped[Optional[int]] = mapped_column(BigInteger)
     surge_multiplier: Mapped[Optional[float]] = mapped_column(Numeric(5, 2))
-    extras_total: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    tax_total: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    discount_total: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    final_fare: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    driver_earnings: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
-    platform_fee: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
+    extras_total: Mapped[Optional[int]] = mapped_column(BigInteger)
+    tax_total: Mapped[Optional[int]] = mapped_column(BigInteger)
+    discount_total: Mapped[Optional[int]] = mapped_column(BigInteger)
+    final_fare: Mapped[Optional[int]] = mapped_column(BigInteger, Computed(FINAL_FARE_SQL, persisted=True))
+    driver_earnings: Mapped[Optional[int]] = mapped_column(BigInteger)
+    platform_fee: Mapped[Optional[int]] = mapped_column(BigInteger)
     
     client_rating: Mapped[Optional[int]] = mapped_column(Integer)  # driver rates client
     driver_rating: Mapped[Optional[int]] = mapped_column(Integer)  # client rates driver
@@ -373,6 +469,29 @@ class Booking(Base):
     stops: Mapped[List["BookingStop"]] = relationship(back_populates="booking", order_by="BookingStop.sequence")
     events: Mapped[List["BookingEvent"]] = relationship(back_populates="booking", order_by="BookingEvent.created_at")
     service_type: Mapped[Optional["ServiceType"]] = relationship()
+    region: Mapped[Optional["Region"]] = relationship()
+    pricing_rule: Mapped[Optional["PricingRule"]] = relationship()
+
+
+# Composite indexes for the hot listing queries; their leading columns also
+# cover the single-column client_id/driver_id/status lookups
+Index("ix_bookings_status_created", Booking.status, Booking.created_at.desc())
+Index("ix_bookings_driver_status", Booking.driver_id, Booking.status)
+Index("ix_bookings_client_created", Booking.client_id, Booking.created_at.desc())
+# Regional dashboards
+Index("ix_bookings_region_status_created", Booking.region_id, Booking.status, Booking.created_at)
+# Driver job board: unassigned requested bookings, newest first
+Index(
+    "ix_bookings_open", Booking.created_at.desc(),
+    postgresql_where=text("status = 'requested' AND driver_id IS NULL"),
+    sqlite_where=text("status = 'requested' AND driver_id IS NULL"),
+)
+# Bounding-box prefilter for nearby open bookings
+Index(
+    "ix_bookings_open_pickup", Booking.pickup_lat, Booking.pickup_lng,
+    postgresql_where=text("status = 'requested' AND driver_id IS NULL"),
+    sqlite_where=text("status = 'requested' AND driver_id IS NULL"),
+)
 
 
 class BookingStop(Base):
@@ -382,10 +501,11 @@ class BookingStop(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     booking_id: Mapped[int] = mapped_column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True)
     sequence: Mapped[int] = mapped_column(Integer, nullable=False)
-    address: Mapped[str] = mapped_column(String(500), nullable=False)
+    address_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("string_pool.id"), nullable=False)
+    address: Mapped[str] = interned(address_id)
     lat: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 7))
     lng: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 7))
-    stop_type: Mapped[str] = mapped_column(String(50), nullable=False)  # 'pickup' or 'dropoff'
+    stop_type: Mapped[str] = mapped_column(native_enum(StopType, "booking_stop_type"), nullable=False)
     arrived_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     booking: Mapped["Booking"] = relationship(back_populates="stops")
@@ -400,10 +520,15 @@ class BookingEvent(Base):
     event_type: Mapped[str] = mapped_column(String(100), nullable=False)
     actor_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"))
     description: Mapped[Optional[str]] = mapped_column(Text)
-    event_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
+    event_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     booking: Mapped["Booking"] = relationship(back_populates="events")
+    
+    __table_args__ = (
+        # Containment queries on metadata (@>); GIN only exists on Postgres
+        Index("ix_booking_events_metadata_gin", "metadata", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
 
 # ===========================================
@@ -447,6 +572,11 @@ class SupportTicketMessage(Base):
     
     ticket: Mapped["SupportTicket"] = relationship(back_populates="messages")
     sender: Mapped["User"] = relationship()
+    
+    __table_args__ = (
+        # Ticket thread in order, and latest message per ticket
+        Index("ix_support_messages_ticket_created", "ticket_id", "created_at"),
+    )
 
 
 # ===========================================
@@ -491,6 +621,16 @@ class ConversationMessage(Base):
     
     conversation: Mapped["Conversation"] = relationship(back_populates="messages")
     sender: Mapped["User"] = relationship()
+    
+    __table_args__ = (
+        # Unread counts per conversation/sender; messages are read quickly,
+        # so only the small unread tail is indexed
+        Index(
+            "ix_conv_msg_unread", "conversation_id", "sender_id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0"),
+        ),
+    )
 
 
 # ===========================================
@@ -506,8 +646,8 @@ class AuditLog(Base):
     action: Mapped[str] = mapped_column(String(255), nullable=False)
     entity_type: Mapped[str] = mapped_column(String(100), nullable=False)
     entity_id: Mapped[Optional[int]] = mapped_column(Integer)
-    old_value: Mapped[Optional[dict]] = mapped_column(JSON)
-    new_value: Mapped[Optional[dict]] = mapped_column(JSON)
+    old_value: Mapped[Optional[dict]] = mapped_column(JSONVariant)
+    new_value: Mapped[Optional[dict]] = mapped_column(JSONVariant)
     ip_address: Mapped[Optional[str]] = mapped_column(String(50))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
@@ -542,7 +682,7 @@ class Payment(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     booking_id: Mapped[int] = mapped_column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False)  # cents
     currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
     payment_method: Mapped[str] = mapped_column(String(50), nullable=False)  # 'card', 'cash', 'wallet'
     payment_status: Mapped[str] = mapped_column(String(50), default="pending", nullable=False)  # 'pending', 'completed', 'failed', 'refunded'
@@ -561,9 +701,9 @@ class DriverPayout(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     driver_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False)  # cents
     currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
-    payout_status: Mapped[str] = mapped_column(String(50), default="pending", nullable=False)  # 'pending', 'processing', 'completed', 'failed'
+    payout_status: Mapped[str] = mapped_column(native_enum(PayoutStatus, "payout_status"), default="pending", nullable=False)
     stripe_transfer_id: Mapped[Optional[str]] = mapped_column(String(255))
     period_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     period_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -583,7 +723,7 @@ class PromotionRedemption(Base):
     promotion_id: Mapped[int] = mapped_column(Integer, ForeignKey("promotions.id", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     booking_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("bookings.id", ondelete="SET NULL"))
-    discount_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    discount_amount: Mapped[int] = mapped_column(BigInteger, nullable=False)  # cents
     redeemed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     promotion: Mapped["Promotion"] = relationship()
@@ -602,7 +742,7 @@ class OTPCode(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     identifier: Mapped[str] = mapped_column(String(255), nullable=False, index=True)  # email or phone
-    identifier_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'email' or 'phone'
+    identifier_type: Mapped[str] = mapped_column(native_enum(IdentifierType, "otp_identifier_type"), nullable=False)
     code: Mapped[str] = mapped_column(String(10), nullable=False)
     purpose: Mapped[str] = mapped_column(String(50), nullable=False)  # 'registration', 'login', 'password_reset', 'phone_verify'
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -613,6 +753,16 @@ class OTPCode(Base):
     used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     user: Mapped[Optional["User"]] = relationship()
+    
+    __table_args__ = (
+        # Verification only looks at unused codes; expired rows are reaped
+        # by app.core.maintenance so this stays small
+        Index(
+            "ix_otp_live", "identifier", "expires_at",
+            postgresql_where=text("is_used = false"),
+            sqlite_where=text("is_used = 0"),
+        ),
+    )
 
 
 class UserVerification(Base):
@@ -645,9 +795,10 @@ class PushSubscription(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     endpoint: Mapped[str] = mapped_column(Text, nullable=False)  # Push service URL
-    keys_json: Mapped[str] = mapped_column(Text, nullable=False)  # JSON: {p256dh, auth}
+    keys_json: Mapped[dict] = mapped_column(JSONVariant, nullable=False)  # {p256dh, auth}
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    user_agent: Mapped[Optional[str]] = mapped_column(String(500))  # Browser info
+    user_agent_id: Mapped[Optional[int]] = mapped_column(BigInteger, ForeignKey("string_pool.id"))
+    user_agent: Mapped[Optional[str]] = interned(user_agent_id)  # Browser info
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
@@ -718,7 +869,7 @@ class Organization(Base):
     max_bookings_per_month: Mapped[Optional[int]] = mapped_column(Integer)
     
     # Feature flags
-    features: Mapped[Optional[str]] = mapped_column(JSON)  # JSON object of enabled features
+    features: Mapped[Optional[dict]] = mapped_column(JSONVariant)  # JSON object of enabled features
     
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -762,3 +913,47 @@ class OrganizationMember(Base):
     __table_args__ = (
         Index("ix_org_members_unique", "organization_id", "user_id", unique=True),
     )
+
+
+# ===============================
+# 14. Payment Idempotency
+# ===============================
+
+class StripeWebhookEvent(Base):
+    """
+    Received Stripe webhook events, keyed by Stripe event ID (evt_...).
+    Stripe delivers at least once; inserting the event ID first (ON CONFLICT
+    DO NOTHING) tells the handler whether it is a duplicate.
+    """
+    __tablename__ = "stripe_webhook_events"
+    
+    event_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)  # e.g. payment_intent.succeeded
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)  # pending, completed, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        Index("ix_stripe_webhook_events_status_received", "status", "received_at"),
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency gate for mutating payment operations.
+    A retried request with the same key replays the stored response
+    instead of repeating the side effect.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # sha256 of the request params
+    response: Mapped[Optional[dict]] = mapped_column(JSONVariant)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)  # pending, completed, failed
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
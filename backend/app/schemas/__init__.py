@@ -3,6 +3,12 @@ from app.schemas.schemas import *
 
 __all__ = [
     # Auth
+    "NormalizedEmail",
+    "LookupEmail",
+    "OTPDigits",
+    "LastFourDigits",
+    "PhoneNumber",
+    "normalize_email",
     "LoginRequest",
     "RegisterRequest",
     "TokenResponse",
@@ -38,6 +44,8 @@ __all__ = [
     "BookingUpdate",
     "BookingResponse",
     "BookingListResponse",
+    "BookingListItem",
+    "BookingSummaryListResponse",
     "BookingCancelRequest",
     "BookingRatingRequest",
     # Driver jobs
@@ -86,6 +94,7 @@ __all__ = [
     "OrganizationMemberResponse",
     "OrganizationListResponse",
     # Generic
+    "Page",
     "SuccessResponse",
     "ErrorResponse",
 ]
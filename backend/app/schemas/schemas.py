@@ -3,18 +3,136 @@ Seryvo Platform - Pydantic Schemas
 Request/Response models for API endpoints
 """
 from datetime import datetime
-from typing import Optional, List, Any, Dict
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
+from typing import Optional, List, Any, Dict, Annotated, Generic, Literal, TypeVar
+from pydantic import AfterValidator, AliasChoices, BeforeValidator, BaseModel, EmailStr, Field, ConfigDict, StringConstraints, computed_field, field_validator, model_validator
 import re
 
 
+def normalize_email(value: str) -> str:
+    """Lowercase/strip an email so it matches the stored (lowercased) value."""
+    return value.strip().lower()
+
+
+# Email input normalized before it reaches any query or insert
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
+
+
+_EMAIL_SHAPE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def check_email_shape(value: str) -> str:
+    """Cheap syntactic check; no deliverability or IDN handling."""
+    if not _EMAIL_SHAPE.match(value):
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+# Emails only used to look up an existing user: a malformed address just won't
+# match, so the full email-validator pass (kept for anything we store) is skipped
+LookupEmail = Annotated[str, AfterValidator(normalize_email), AfterValidator(check_email_shape)]
+
+
+# Digit-only codes, checked by pydantic-core's regex ([0-9], not Unicode \d)
+OTPDigits = Annotated[str, StringConstraints(min_length=6, max_length=6, pattern=r"^[0-9]{6}$")]
+LastFourDigits = Annotated[str, StringConstraints(min_length=4, max_length=4, pattern=r"^[0-9]{4}$")]
+
+
+_PHONE_SEPARATORS = re.compile(r"[\s\-\(\)]")
+_PHONE_DIGITS = re.compile(r"^\+?[1-9][0-9]{7,14}$")
+
+
+def check_phone(value: str) -> str:
+    """
+    Accept E.164-like numbers, ignoring spaces, dashes and parentheses; stored
+    as given. Empty is allowed: profile forms send "" for no number.
+    """
+    if value and not _PHONE_DIGITS.match(_PHONE_SEPARATORS.sub("", value)):
+        raise ValueError("Invalid phone number format")
+    return value
+
+
+PhoneNumber = Annotated[str, StringConstraints(strip_whitespace=True, max_length=20), AfterValidator(check_phone)]
+
+
+# Closed value sets (mirroring app.core.enums); responses only use these for
+# columns the database constrains to the same set
+BookingStatusValue = Literal[
+    "draft", "requested", "driver_assigned", "driver_en_route_pickup",
+    "driver_arrived", "in_progress", "completed", "canceled_by_client",
+    "canceled_by_driver", "canceled_by_system", "no_show_client",
+    "no_show_driver", "disputed", "refunded",
+]
+StopTypeValue = Literal["pickup", "dropoff", "stop"]
+IdentifierTypeValue = Literal["email", "phone"]
+PayoutStatusValue = Literal["pending", "processing", "completed", "failed"]
+
+
+def split_csv(value: Any) -> Any:
+    """Accept legacy comma-separated strings for list fields."""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
+# List of strings stored as an array column; "a,b" is still accepted on input
+StringList = Annotated[List[str], BeforeValidator(split_csv)]
+
+
+def normalize_weekday(value: Any) -> Any:
+    """Reduce "Mon", " monday" etc. to the stored three-letter code."""
+    if isinstance(value, str):
+        return value.strip().lower()[:3]
+    return value
+
+
+# Surge rule days as app.core.pricing_cache.WEEKDAYS codes; anything else is
+# rejected instead of silently matching no day
+WeekdayCode = Annotated[Literal["mon", "tue", "wed", "thu", "fri", "sat", "sun"], BeforeValidator(normalize_weekday)]
+WeekdayList = Annotated[List[WeekdayCode], BeforeValidator(split_csv)]
+
+
 # ===========================================
 # Base Schemas
 # ===========================================
 
 class BaseSchema(BaseModel):
-    """Base schema with common config."""
-    model_config = ConfigDict(from_attributes=True)
+    """
+    Base schema with common config. Responses are built once and only serialized.
+    Validators are compiled on first use; routes' response models are compiled
+    when FastAPI registers them, so only schemas nothing serves stay unbuilt.
+    """
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
+    
+    @classmethod
+    def from_orm_trusted(cls, obj: Any, **overrides: Any):
+        """
+        Build from an ORM row without validation. Only for schemas whose
+        fields map 1:1 (name and type) onto the row's attributes; anything
+        that needs converting or comes from elsewhere goes in overrides.
+        """
+        values = {
+            name: getattr(obj, name)
+            for name in cls.model_fields
+            if name not in overrides and hasattr(obj, name)
+        }
+        values.update(overrides)
+        return cls.model_construct(**values)
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a paginated list; use as Page[ItemResponse]."""
+    items: List[T]
+    total: int
+    page: int
+    page_size: int
+    
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        return (self.total + self.page_size - 1) // self.page_size if self.page_size else 0
 
 
 # ===========================================
@@ -23,17 +141,17 @@ class BaseSchema(BaseModel):
 
 class LoginRequest(BaseModel):
     """Login request payload."""
-    email: EmailStr
+    email: LookupEmail
     password: str
 
 
 class RegisterRequest(BaseModel):
     """Registration request payload."""
-    email: EmailStr
+    email: NormalizedEmail
     password: str = Field(..., min_length=8, max_length=128, description="Password must be 8-128 characters")
     full_name: str = Field(..., min_length=2, max_length=100)
-    phone: Optional[str] = Field(None, max_length=20)
-    role: str = Field(default="client", pattern="^(client|driver)$")
+    phone: Optional[PhoneNumber] = None
+    role: Literal["client", "driver"] = "client"
     
     @field_validator('password')
     @classmethod
@@ -48,18 +166,6 @@ class RegisterRequest(BaseModel):
         if not re.search(r'\d', v):
             raise ValueError('Password must contain at least one number')
         return v
-    
-    @field_validator('phone')
-    @classmethod
-    def validate_phone(cls, v: Optional[str]) -> Optional[str]:
-        """Validate phone number format."""
-        if v is None:
-            return v
-        # Remove spaces, dashes, and parentheses for validation
-        cleaned = re.sub(r'[\s\-\(\)]', '', v)
-        if not re.match(r'^\+?[1-9]\d{7,14}$', cleaned):
-            raise ValueError('Invalid phone number format')
-        return v
 
 
 class TokenResponse(BaseModel):
@@ -76,13 +182,13 @@ class RefreshTokenRequest(BaseModel):
 
 class PasswordResetRequest(BaseModel):
     """Password reset request."""
-    email: EmailStr
+    email: LookupEmail
 
 
 class PasswordResetVerify(BaseModel):
     """Verify password reset OTP."""
-    email: EmailStr
-    code: str = Field(..., min_length=6, max_length=6)
+    email: LookupEmail
+    code: OTPDigits
 
 
 class PasswordResetConfirm(BaseModel):
@@ -104,9 +210,9 @@ class RoleResponse(BaseSchema):
 
 class UserBase(BaseModel):
     """Base user fields."""
-    email: EmailStr
+    email: NormalizedEmail
     full_name: str
-    phone: Optional[str] = None
+    phone: Optional[PhoneNumber] = None
 
 
 class UserCreate(UserBase):
@@ -118,7 +224,7 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     """Update user payload."""
     full_name: Optional[str] = None
-    phone: Optional[str] = None
+    phone: Optional[PhoneNumber] = None
     avatar_url: Optional[str] = None
     is_active: Optional[bool] = None
 
@@ -132,16 +238,10 @@ class UserResponse(BaseSchema):
     avatar_url: Optional[str] = None
     is_active: bool
     created_at: datetime
-    roles: List[str] = []
+    roles: List[str] = Field(default_factory=list)
 
 
-class UserListResponse(BaseModel):
-    """Paginated user list response."""
-    items: List[UserResponse]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
+UserListResponse = Page[UserResponse]
 
 
 # ===========================================
@@ -207,7 +307,7 @@ class DriverDocumentResponse(BaseSchema):
 
 class DriverDocumentReviewRequest(BaseModel):
     """Review driver document request."""
-    status: str = Field(..., pattern="^(approved|rejected)$")
+    status: Literal["approved", "rejected"]
     rejection_reason: Optional[str] = None
     expires_at: Optional[datetime] = None
 
@@ -268,7 +368,7 @@ class PriceEstimateResponse(BaseModel):
     estimated_duration_minutes: float
     surge_multiplier: float
     currency: str
-    breakdown: dict = {}
+    breakdown: dict = Field(default_factory=dict)
 
 
 # ===========================================
@@ -276,12 +376,24 @@ class PriceEstimateResponse(BaseModel):
 # ===========================================
 
 class BookingStopCreate(BaseModel):
-    """Create booking stop payload."""
-    sequence: int = Field(default=0, ge=0, le=10, description="Stop sequence (0-10)")
-    address: str = Field(..., min_length=5, max_length=500, description="Full address")
-    lat: Optional[float] = Field(None, ge=-90, le=90, description="Latitude (-90 to 90)")
-    lng: Optional[float] = Field(None, ge=-180, le=180, description="Longitude (-180 to 180)")
-    stop_type: str = Field(default="pickup", pattern="^(pickup|dropoff|stop)$")
+    """Create booking stop payload. Deprecated field names are still accepted on input."""
+    sequence: int = Field(
+        default=0, ge=0, le=10, description="Stop sequence (0-10)",
+        validation_alias=AliasChoices("sequence", "position"),
+    )
+    address: str = Field(
+        ..., min_length=5, max_length=500, description="Full address",
+        validation_alias=AliasChoices("address", "address_line1"),
+    )
+    lat: Optional[float] = Field(
+        None, ge=-90, le=90, description="Latitude (-90 to 90)",
+        validation_alias=AliasChoices("lat", "latitude"),
+    )
+    lng: Optional[float] = Field(
+        None, ge=-180, le=180, description="Longitude (-180 to 180)",
+        validation_alias=AliasChoices("lng", "longitude"),
+    )
+    stop_type: StopTypeValue = "pickup"
 
 
 class BookingStopResponse(BaseSchema):
@@ -291,40 +403,21 @@ class BookingStopResponse(BaseSchema):
     address: str
     lat: Optional[float] = None
     lng: Optional[float] = None
-    stop_type: str
+    stop_type: StopTypeValue
     arrived_at: Optional[datetime] = None
-    
-    # Deprecated field aliases for backward compatibility
-    # These will be removed in a future version
-    @property
-    def position(self) -> int:
-        """Deprecated: Use 'sequence' instead."""
-        return self.sequence
-    
-    @property
-    def address_line1(self) -> str:
-        """Deprecated: Use 'address' instead."""
-        return self.address
-    
-    @property
-    def latitude(self) -> Optional[float]:
-        """Deprecated: Use 'lat' instead."""
-        return self.lat
-    
-    @property
-    def longitude(self) -> Optional[float]:
-        """Deprecated: Use 'lng' instead."""
-        return self.lng
 
 
 class BookingCreate(BaseModel):
     """Create booking payload."""
     service_type_id: Optional[int] = Field(None, gt=0)
-    requested_pickup_at: Optional[datetime] = None  # Aligned with model field name
+    # Aligned with model field name; deprecated scheduled_start_at still accepted
+    requested_pickup_at: Optional[datetime] = Field(
+        None, validation_alias=AliasChoices("requested_pickup_at", "scheduled_start_at")
+    )
     passenger_count: int = Field(default=1, ge=1, le=10, description="Passengers (1-10)")
     luggage_count: int = Field(default=0, ge=0, le=10, description="Luggage pieces (0-10)")
     special_notes: Optional[str] = Field(None, max_length=500)
-    promotion_code: Optional[str] = Field(None, max_length=50, pattern="^[A-Z0-9]{3,20}$")
+    promotion_code: Optional[str] = Field(None, max_length=50, pattern="^[A-Za-z0-9]{3,20}$")
     stops: List[BookingStopCreate] = Field(..., min_length=2, max_length=5, description="At least 2 stops required")
     
     @field_validator('stops')
@@ -339,12 +432,6 @@ class BookingCreate(BaseModel):
         if 'dropoff' not in stop_types:
             raise ValueError('At least one dropoff stop is required')
         return v
-    
-    # Deprecated aliases for backward compatibility
-    @property
-    def scheduled_start_at(self) -> Optional[datetime]:
-        """Deprecated: Use 'requested_pickup_at' instead."""
-        return self.requested_pickup_at
 
 
 class BookingUpdate(BaseModel):
@@ -362,7 +449,7 @@ class BookingResponse(BaseSchema):
     client_id: int
     driver_id: Optional[int]
     service_type_id: Optional[int]
-    status: str
+    status: BookingStatusValue
     is_asap: bool = True
     
     # Address fields from model
@@ -410,19 +497,28 @@ class BookingResponse(BaseSchema):
     updated_at: datetime
     
     # Related objects
-    stops: List[BookingStopResponse] = []
+    stops: List[BookingStopResponse] = Field(default_factory=list)
     client: Optional[UserResponse] = None
     driver: Optional[UserResponse] = None
     service_type: Optional[ServiceTypeResponse] = None
 
 
-class BookingListResponse(BaseModel):
-    """Paginated booking list response."""
-    items: List[BookingResponse]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
+BookingListResponse = Page[BookingResponse]
+
+
+class BookingListItem(BaseSchema):
+    """Booking summary row for list views (GET /bookings?view=summary)."""
+    id: int
+    status: BookingStatusValue
+    driver_id: Optional[int] = None
+    pickup_address: str
+    dropoff_address: str
+    requested_pickup_at: Optional[datetime] = None
+    final_fare: Optional[float] = None
+    created_at: datetime
+
+
+BookingSummaryListResponse = Page[BookingListItem]
 
 
 class BookingCancelRequest(BaseModel):
@@ -443,7 +539,7 @@ class BookingRatingRequest(BaseModel):
 class DriverJobResponse(BaseSchema):
     """Driver job (booking) response - aligned with Booking model."""
     id: int
-    status: str
+    status: BookingStatusValue
     is_asap: bool = True
     requested_pickup_at: Optional[datetime] = None
     pickup_address: Optional[str] = None
@@ -460,7 +556,7 @@ class DriverJobResponse(BaseSchema):
     passenger_count: int = 1
     luggage_count: int = 0
     special_notes: Optional[str] = None
-    stops: List[BookingStopResponse] = []
+    stops: List[BookingStopResponse] = Field(default_factory=list)
     client_name: Optional[str] = None
     client_phone: Optional[str] = None
     client_rating_avg: Optional[float] = None
@@ -525,16 +621,10 @@ class TicketResponse(BaseSchema):
     updated_at: datetime
     creator: Optional[UserResponse] = None
     assignee: Optional[UserResponse] = None
-    messages: List[TicketMessageResponse] = []
+    messages: List[TicketMessageResponse] = Field(default_factory=list)
 
 
-class TicketListResponse(BaseModel):
-    """Paginated ticket list response."""
-    items: List[TicketResponse]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
+TicketListResponse = Page[TicketResponse]
 
 
 # ===========================================
@@ -562,8 +652,8 @@ class ConversationResponse(BaseSchema):
     booking_id: Optional[int]
     conversation_type: str
     created_at: datetime
-    messages: List[MessageResponse] = []
-    participants: List[UserResponse] = []
+    messages: List[MessageResponse] = Field(default_factory=list)
+    participants: List[UserResponse] = Field(default_factory=list)
 
 
 # ===========================================
@@ -601,8 +691,8 @@ class RevenueReport(BaseModel):
     average_fare: float
     platform_fees: float
     driver_payouts: float
-    by_service_type: dict = {}
-    by_region: dict = {}
+    by_service_type: dict = Field(default_factory=dict)
+    by_region: dict = Field(default_factory=dict)
 
 
 # ===========================================
@@ -615,8 +705,8 @@ class SurchargeCreate(BaseModel):
     surcharge_type: str
     amount: float
     is_percentage: bool = False
-    location_keywords: Optional[str] = None
-    applies_to_service_types: Optional[str] = None
+    location_keywords: Optional[StringList] = None
+    applies_to_service_types: Optional[StringList] = None
 
 
 class SurchargeResponse(BaseSchema):
@@ -626,8 +716,8 @@ class SurchargeResponse(BaseSchema):
     surcharge_type: str
     amount: float
     is_percentage: bool
-    location_keywords: Optional[str]
-    applies_to_service_types: Optional[str]
+    location_keywords: Optional[List[str]]
+    applies_to_service_types: Optional[List[str]]
     is_active: bool
 
 
@@ -638,7 +728,7 @@ class SurgeRuleCreate(BaseModel):
     multiplier: float
     time_start: Optional[str] = None
     time_end: Optional[str] = None
-    days_of_week: Optional[str] = None
+    days_of_week: Optional[WeekdayList] = None
 
 
 class SurgeRuleResponse(BaseSchema):
@@ -649,7 +739,7 @@ class SurgeRuleResponse(BaseSchema):
     multiplier: float
     time_start: Optional[str]
     time_end: Optional[str]
-    days_of_week: Optional[str]
+    days_of_week: Optional[List[str]]
     is_active: bool
 
 
@@ -667,13 +757,7 @@ class AuditLogResponse(BaseSchema):
     actor: Optional[UserResponse] = None
 
 
-class AuditLogListResponse(BaseModel):
-    """Paginated audit log list response."""
-    items: List[AuditLogResponse]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
+AuditLogListResponse = Page[AuditLogResponse]
 
 
 # ===========================================
@@ -743,8 +827,15 @@ class ErrorResponse(BaseModel):
 class OTPSendRequest(BaseModel):
     """Request to send OTP code."""
     identifier: str = Field(..., description="Email address or phone number")
-    identifier_type: str = Field(..., pattern="^(email|phone)$", description="Type: 'email' or 'phone'")
+    identifier_type: IdentifierTypeValue = Field(..., description="Type: 'email' or 'phone'")
     purpose: str = Field(default="registration", description="Purpose: 'registration', 'login', 'password_reset', 'phone_verify'")
+    
+    @model_validator(mode="after")
+    def normalize_email_identifier(self) -> "OTPSendRequest":
+        """Email identifiers are matched against lowercased user emails."""
+        if self.identifier_type == "email":
+            self.identifier = normalize_email(self.identifier)
+        return self
 
 
 class OTPSendResponse(BaseModel):
@@ -758,9 +849,16 @@ class OTPSendResponse(BaseModel):
 class OTPVerifyRequest(BaseModel):
     """Request to verify OTP code."""
     identifier: str = Field(..., description="Email address or phone number")
-    identifier_type: str = Field(..., pattern="^(email|phone)$")
-    code: str = Field(..., min_length=6, max_length=6, description="6-digit OTP code")
+    identifier_type: IdentifierTypeValue
+    code: OTPDigits = Field(..., description="6-digit OTP code")
     purpose: str = Field(default="registration")
+    
+    @model_validator(mode="after")
+    def normalize_email_identifier(self) -> "OTPVerifyRequest":
+        """Email identifiers are matched against lowercased user emails."""
+        if self.identifier_type == "email":
+            self.identifier = normalize_email(self.identifier)
+        return self
 
 
 class OTPVerifyResponse(BaseModel):
@@ -781,10 +879,10 @@ class UserVerificationResponse(BaseSchema):
 
 class RegisterWithOTPRequest(BaseModel):
     """Registration request with OTP verification token."""
-    email: EmailStr
+    email: NormalizedEmail
     password: str = Field(..., min_length=6)
     full_name: str = Field(..., min_length=2)
-    phone: Optional[str] = None
+    phone: Optional[PhoneNumber] = None
     role: str = Field(default="client")
     verification_token: str = Field(..., description="Token from OTP verification")
 
@@ -796,7 +894,7 @@ class RegisterWithOTPRequest(BaseModel):
 class PaymentMethodCreate(BaseModel):
     """Create payment method payload."""
     method_type: str = Field(..., description="card, bank_account, etc.")
-    last_four: Optional[str] = Field(None, max_length=4)
+    last_four: Optional[LastFourDigits] = None
     brand: Optional[str] = None  # visa, mastercard, etc.
     exp_month: Optional[int] = Field(None, ge=1, le=12)
     exp_year: Optional[int] = None
@@ -839,7 +937,7 @@ class DriverPayoutResponse(BaseSchema):
     driver_id: int
     amount: float
     currency: str = "USD"
-    payout_status: str  # Aligned with model: 'pending', 'processing', 'completed', 'failed'
+    payout_status: PayoutStatusValue  # Aligned with model
     stripe_transfer_id: Optional[str] = None
     period_start: datetime
     period_end: datetime
@@ -945,12 +1043,6 @@ class OrganizationMemberResponse(BaseSchema):
     user_full_name: Optional[str] = None
 
 
-class OrganizationListResponse(BaseModel):
-    """Paginated list of organizations."""
-    items: List[OrganizationResponse]
-    total: int
-    page: int
-    page_size: int
-    total_pages: int
+OrganizationListResponse = Page[OrganizationResponse]
 
 
@@ -6,15 +6,18 @@ Run with: python -m app.scripts.seed_demo_data
 Or from container: docker exec seryvo-backend python -m app.scripts.seed_demo_data
 """
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import random
 
-from passlib.context import CryptContext
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session_maker, engine
+from app.core.money import to_cents
+from app.core.push_service import reset_subscription_cache
+from app.core.redis_client import close_redis
+from app.core.string_pool import intern_strings
 from app.core.enums import (
     BookingStatus, DriverPlatformStatus, DriverAvailabilityStatus,
     VehicleStatus, DocumentStatus, PaymentStatus, TicketStatus
@@ -28,16 +31,20 @@ from app.models import (
     UserVerification,
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+# Demo password for all users. Its bcrypt hash (cost 12) is fixed so the
+# script doesn't spend a bcrypt round on every start; app.core.security
+# verifies it like any other. Regenerate with passlib if the password changes.
+DEMO_PASSWORD = "demo123"
+DEMO_PASSWORD_HASH = "$2b$12$2TbFhQoF5.wY5T9cy5EubeDvCHyrbxgsIBPaeKCsyKwVe/tliAfJS"
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+# Every seeded timestamp is relative to one instant
+SEED_NOW = datetime.now(timezone.utc)
 
 
-# Demo password for all users
-DEMO_PASSWORD = "demo123"
-DEMO_PASSWORD_HASH = hash_password(DEMO_PASSWORD)
+async def skip_commit_fsync(session: AsyncSession):
+    """Don't wait for the WAL flush when this transaction commits; demo data is disposable."""
+    if session.bind.dialect.name == "postgresql":
+        await session.execute(text("SET LOCAL synchronous_commit = OFF"))
 
 
 async def clear_existing_data(session: AsyncSession):
@@ -59,13 +66,22 @@ async def clear_existing_data(session: AsyncSession):
         ServiceType, Region, Role,
     ]
     
-    for table in tables:
-        try:
-            await session.execute(delete(table))
-        except Exception as e:
-            print(f"  Warning: Could not clear {table.__tablename__}: {e}")
+    if session.bind.dialect.name == "postgresql":
+        # One statement; CASCADE also empties anything else referencing these
+        await session.execute(text(
+            "TRUNCATE TABLE " + ", ".join(table.__tablename__ for table in tables)
+            + " RESTART IDENTITY CASCADE"
+        ))
+    else:
+        for table in tables:
+            try:
+                await session.execute(delete(table))
+            except Exception as e:
+                print(f"  Warning: Could not clear {table.__tablename__}: {e}")
     
     await session.commit()
+    # Identities restart, so cached push subscriptions would point at new users
+    await reset_subscription_cache()
     print("✓ Cleared existing data")
 
 
@@ -80,13 +96,11 @@ async def seed_roles(session: AsyncSession) -> dict:
         ("admin", "Platform administrator with full access"),
     ]
     
-    roles = {}
-    for name, description in roles_data:
-        role = Role(name=name, description=description)
-        session.add(role)
-        roles[name] = role
-    
-    await session.flush()
+    result = await session.scalars(
+        insert(Role).returning(Role, sort_by_parameter_order=True),
+        [{"name": name, "description": description} for name, description in roles_data],
+    )
+    roles = {role.name: role for role in result}
     
     # Create permissions
     permissions_data = [
@@ -112,24 +126,19 @@ async def seed_roles(session: AsyncSession) -> dict:
         ("admin.audit", "View audit logs"),
     ]
     
-    permissions = []
-    for name, desc in permissions_data:
-        perm = Permission(name=name, description=desc)
-        session.add(perm)
-        permissions.append(perm)
-    
-    await session.flush()
-    
-    # Assign all permissions to admin
-    for perm in permissions:
-        session.add(RolePermission(role_id=roles["admin"].id, permission_id=perm.id))
-    
-    # Assign support permissions
-    support_perms = [p for p in permissions if 'tickets' in p.name or 'users.read' in p.name or 'bookings.read' in p.name]
-    for perm in support_perms:
-        session.add(RolePermission(role_id=roles["support_agent"].id, permission_id=perm.id))
-    
-    await session.flush()
+    result = await session.execute(
+        insert(Permission).returning(Permission.id, Permission.name),
+        [{"name": name, "description": desc} for name, desc in permissions_data],
+    )
+    permissions = result.all()
+    
+    # Admin gets every permission; support gets tickets.*, users.read and bookings.read
+    support_names = {"users.read", "bookings.read", "tickets.read", "tickets.update", "tickets.assign"}
+    support_perms = [p for p in permissions if p.name in support_names]
+    await session.execute(insert(RolePermission), [
+        *({"role_id": roles["admin"].id, "permission_id": p.id} for p in permissions),
+        *({"role_id": roles["support_agent"].id, "permission_id": p.id} for p in support_perms),
+    ])
     print(f"✓ Created {len(roles)} roles and {len(permissions)} permissions")
     return roles
 
@@ -145,18 +154,21 @@ async def seed_regions_and_services(session: AsyncSession) -> tuple:
         ("suburban", "Suburban", "America/Los_Angeles", "Residential suburban areas"),
     ]
     
-    regions = {}
-    for code, name, tz, description in regions_data:
-        region = Region(
-            code=code, 
-            name=name, 
-            timezone=tz,
-            description=description, 
-            currency="USD",
-            is_active=True
-        )
-        session.add(region)
-        regions[name] = region
+    result = await session.scalars(
+        insert(Region).returning(Region, sort_by_parameter_order=True),
+        [
+            {
+                "code": code,
+                "name": name,
+                "timezone": tz,
+                "description": description,
+                "currency": "USD",
+                "is_active": True,
+            }
+            for code, name, tz, description in regions_data
+        ],
+    )
+    regions = {region.name: region for region in result}
     
     # Service Types
     services_data = [
@@ -167,16 +179,14 @@ async def seed_regions_and_services(session: AsyncSession) -> tuple:
         ("van", "Van", "Van for large groups or luggage", 8),
     ]
     
-    services = {}
-    for code, name, description, capacity in services_data:
-        service = ServiceType(
-            code=code, name=name, description=description,
-            base_capacity=capacity, is_active=True
-        )
-        session.add(service)
-        services[code] = service
-    
-    await session.flush()
+    result = await session.scalars(
+        insert(ServiceType).returning(ServiceType, sort_by_parameter_order=True),
+        [
+            {"code": code, "name": name, "description": description, "base_capacity": capacity, "is_active": True}
+            for code, name, description, capacity in services_data
+        ],
+    )
+    services = {service.code: service for service in result}
     print(f"✓ Created {len(regions)} regions, {len(services)} service types")
     return regions, services
 
@@ -194,23 +204,23 @@ async def seed_pricing(session: AsyncSession, regions: dict, services: dict):
         ("Airport Zone", "premium", 12.00, 4.00, 0.75, 40.00),
     ]
     
+    region_ids = {name: region.id for name, region in regions.items()}
+    service_ids = {code: service.id for code, service in services.items()}
+    
+    pricing_rows = []
     for region_name, service_code, base, per_km, per_min, min_fare in pricing_configs:
-        region = regions.get(region_name)
-        service = services.get(service_code)
-        
-        pricing = PricingRule(
-            region_id=region.id if region else None,
-            service_type_id=service.id if service else None,
-            base_fare=base,
-            per_km=per_km,
-            per_minute=per_min,
-            minimum_fare=min_fare,
-            currency="USD",
-            is_active=True,
-        )
-        session.add(pricing)
-    
-    await session.flush()
+        pricing_rows.append({
+            "region_id": region_ids.get(region_name),
+            "service_type_id": service_ids.get(service_code),
+            "base_fare": to_cents(base),
+            "per_km": to_cents(per_km),
+            "per_minute": to_cents(per_min),
+            "minimum_fare": to_cents(min_fare),
+            "currency": "USD",
+            "is_active": True,
+        })
+    
+    await session.execute(insert(PricingRule), pricing_rows)
     print(f"✓ Created {len(pricing_configs)} pricing rules")
 
 
@@ -219,26 +229,27 @@ async def seed_surge_rules(session: AsyncSession, regions: dict):
     print("Seeding surge rules...")
     
     surge_configs = [
-        ("Rush Hour Morning", "Metro Area", 1.5, "07:00", "09:00", "mon,tue,wed,thu,fri"),
-        ("Rush Hour Evening", "Metro Area", 1.5, "17:00", "19:00", "mon,tue,wed,thu,fri"),
-        ("Weekend Night", "Metro Area", 1.3, "22:00", "02:00", "fri,sat"),
-        ("Airport Peak", "Airport Zone", 1.4, "06:00", "10:00", "mon,tue,wed,thu,fri,sat,sun"),
+        ("Rush Hour Morning", "Metro Area", 1.5, "07:00", "09:00", ["mon", "tue", "wed", "thu", "fri"]),
+        ("Rush Hour Evening", "Metro Area", 1.5, "17:00", "19:00", ["mon", "tue", "wed", "thu", "fri"]),
+        ("Weekend Night", "Metro Area", 1.3, "22:00", "02:00", ["fri", "sat"]),
+        ("Airport Peak", "Airport Zone", 1.4, "06:00", "10:00", ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]),
     ]
     
+    region_ids = {name: region.id for name, region in regions.items()}
+    
+    surge_rows = []
     for name, region_name, multiplier, start, end, days in surge_configs:
-        region = regions.get(region_name)
-        surge = SurgeRule(
-            region_id=region.id if region else None,
-            name=name,
-            multiplier=multiplier,
-            time_start=start,
-            time_end=end,
-            days_of_week=days,
-            is_active=True,
-        )
-        session.add(surge)
-    
-    await session.flush()
+        surge_rows.append({
+            "region_id": region_ids.get(region_name),
+            "name": name,
+            "multiplier": multiplier,
+            "time_start": start,
+            "time_end": end,
+            "days_of_week": days,
+            "is_active": True,
+        })
+    
+    await session.execute(insert(SurgeRule), surge_rows)
     print(f"✓ Created {len(surge_configs)} surge rules")
 
 
@@ -246,7 +257,7 @@ async def seed_promotions(session: AsyncSession):
     """Create promotional codes."""
     print("Seeding promotions...")
     
-    now = datetime.utcnow()
+    now = SEED_NOW
     promos = [
         ("WELCOME20", "20% off first ride", "percentage", 20, 1000, 1, now - timedelta(days=30), now + timedelta(days=60)),
         ("FLAT5", "$5 off any ride", "fixed", 5, 500, 3, now - timedelta(days=7), now + timedelta(days=30)),
@@ -254,21 +265,20 @@ async def seed_promotions(session: AsyncSession):
         ("SUMMER10", "Summer special 10% off", "percentage", 10, 2000, None, now, now + timedelta(days=45)),
     ]
     
-    for code, desc, dtype, value, max_uses, per_user, starts, ends in promos:
-        promo = Promotion(
-            code=code,
-            description=desc,
-            discount_type=dtype,
-            discount_value=value,
-            max_uses=max_uses,
-            max_uses_per_user=per_user,
-            starts_at=starts,
-            ends_at=ends,
-            is_active=True,
-        )
-        session.add(promo)
-    
-    await session.flush()
+    await session.execute(insert(Promotion), [
+        {
+            "code": code,
+            "description": desc,
+            "discount_type": dtype,
+            "discount_value": value,
+            "max_uses": max_uses,
+            "max_uses_per_user": per_user,
+            "starts_at": starts,
+            "ends_at": ends,
+            "is_active": True,
+        }
+        for code, desc, dtype, value, max_uses, per_user, starts, ends in promos
+    ])
     print(f"✓ Created {len(promos)} promotions")
 
 
@@ -296,36 +306,37 @@ async def seed_users(session: AsyncSession, roles: dict) -> dict:
         ("admin@demo.com", "David Admin", "admin", "+1-555-0401"),
     ]
     
-    users = {}
-    for email, name, role_name, phone in users_data:
-        user = User(
-            email=email,
-            full_name=name,
-            password_hash=DEMO_PASSWORD_HASH,
-            phone=phone,
-            is_active=True,
-            avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed={name.split()[0].lower()}",
-        )
-        session.add(user)
-        await session.flush()
-        
-        # Assign role
-        role = roles[role_name]
-        user_role = UserRole(user_id=user.id, role_id=role.id)
-        session.add(user_role)
-        
-        # Create verification record
-        verification = UserVerification(
-            user_id=user.id,
-            email_verified=True,
-            email_verified_at=datetime.utcnow(),
-            phone_verified=False,
-        )
-        session.add(verification)
-        
-        users[email] = user
-    
-    await session.flush()
+    # One multi-row INSERT per table instead of an add + flush per user
+    result = await session.scalars(
+        insert(User).returning(User, sort_by_parameter_order=True),
+        [
+            {
+                "email": email,
+                "full_name": name,
+                "password_hash": DEMO_PASSWORD_HASH,
+                "phone": phone,
+                "is_active": True,
+                "avatar_url": f"https://api.dicebear.com/7.x/avataaars/svg?seed={name.split()[0].lower()}",
+            }
+            for email, name, _, phone in users_data
+        ],
+    )
+    users = {user.email: user for user in result}
+    
+    await session.execute(insert(UserRole), [
+        {"user_id": users[email].id, "role_id": roles[role_name].id}
+        for email, _, role_name, _ in users_data
+    ])
+    
+    await session.execute(insert(UserVerification), [
+        {
+            "user_id": user.id,
+            "email_verified": True,
+            "email_verified_at": SEED_NOW,
+            "phone_verified": False,
+        }
+        for user in users.values()
+    ])
     print(f"✓ Created {len(users)} users")
     return users
 
@@ -336,39 +347,37 @@ async def seed_profiles(session: AsyncSession, users: dict, services: dict):
     
     # Client profiles
     client_emails = ["alice@demo.com", "bob@demo.com", "carol@demo.com"]
-    for email in client_emails:
-        user = users[email]
-        profile = ClientProfile(
-            user_id=user.id,
-            default_currency="USD",
-        )
-        session.add(profile)
-        await session.flush()
-        
-        # Add saved locations for first client
-        if email == "alice@demo.com":
-            home = SavedLocation(
-                client_id=user.id,
-                label="Home",
-                address_line1="123 Main Street",
-                city="San Francisco",
-                state="CA",
-                postal_code="94102",
-                latitude=37.7749,
-                longitude=-122.4194,
-                is_default=True,
-            )
-            work = SavedLocation(
-                client_id=user.id,
-                label="Work",
-                address_line1="456 Market Street",
-                city="San Francisco",
-                state="CA",
-                postal_code="94105",
-                latitude=37.7897,
-                longitude=-122.3972,
-            )
-            session.add_all([home, work])
+    await session.execute(insert(ClientProfile), [
+        {"user_id": users[email].id, "default_currency": "USD"}
+        for email in client_emails
+    ])
+    
+    # Saved locations for the first client
+    alice = users["alice@demo.com"]
+    await session.execute(insert(SavedLocation), [
+        {
+            "client_id": alice.id,
+            "label": "Home",
+            "address_line1": "123 Main Street",
+            "city": "San Francisco",
+            "state": "CA",
+            "postal_code": "94102",
+            "latitude": 37.7749,
+            "longitude": -122.4194,
+            "is_default": True,
+        },
+        {
+            "client_id": alice.id,
+            "label": "Work",
+            "address_line1": "456 Market Street",
+            "city": "San Francisco",
+            "state": "CA",
+            "postal_code": "94105",
+            "latitude": 37.7897,
+            "longitude": -122.3972,
+            "is_default": False,
+        },
+    ])
     
     # Driver profiles with vehicles
     driver_configs = [
@@ -378,54 +387,53 @@ async def seed_profiles(session: AsyncSession, users: dict, services: dict):
         ("emma@demo.com", DriverPlatformStatus.ACTIVE.value, DriverAvailabilityStatus.OFFLINE.value, 4.6, 45, 90.0, 4.0, "xl", "Chevrolet", "Suburban", 2022, "Gray", "XL2024"),
     ]
     
+    docs = [
+        ("drivers_license", DocumentStatus.APPROVED.value),
+        ("vehicle_registration", DocumentStatus.APPROVED.value),
+        ("insurance", DocumentStatus.APPROVED.value),
+        ("background_check", DocumentStatus.APPROVED.value),
+    ]
+    
+    profile_rows, vehicle_rows, document_rows = [], [], []
     for email, status, avail, rating, total_ratings, accept_rate, cancel_rate, svc_code, make, model, year, color, plate in driver_configs:
         user = users[email]
-        profile = DriverProfile(
-            user_id=user.id,
-            status=status,
-            availability_status=avail,
-            rating_average=rating,
-            total_ratings=total_ratings,
-            total_trips=total_ratings,  # Assume each rating is from a trip
-            acceptance_rate=accept_rate,
-            cancellation_rate=cancel_rate,
-        )
-        session.add(profile)
-        await session.flush()
+        profile_rows.append({
+            "user_id": user.id,
+            "status": status,
+            "availability_status": avail,
+            "rating_average": rating,
+            "total_ratings": total_ratings,
+            "total_trips": total_ratings,  # Assume each rating is from a trip
+            "acceptance_rate": accept_rate,
+            "cancellation_rate": cancel_rate,
+        })
         
         service = services.get(svc_code)
-        vehicle = Vehicle(
-            driver_id=user.id,
-            make=make,
-            model=model,
-            year=year,
-            color=color,
-            license_plate=plate,
-            capacity=service.base_capacity if service else 4,
-            service_type_id=service.id if service else None,
-            status=VehicleStatus.APPROVED.value,
-            is_active=True,
-        )
-        session.add(vehicle)
+        vehicle_rows.append({
+            "driver_id": user.id,
+            "make": make,
+            "model": model,
+            "year": year,
+            "color": color,
+            "license_plate": plate,
+            "capacity": service.base_capacity if service else 4,
+            "service_type_id": service.id if service else None,
+            "status": VehicleStatus.APPROVED.value,
+            "is_active": True,
+        })
         
-        # Add driver documents
-        docs = [
-            ("drivers_license", DocumentStatus.APPROVED.value),
-            ("vehicle_registration", DocumentStatus.APPROVED.value),
-            ("insurance", DocumentStatus.APPROVED.value),
-            ("background_check", DocumentStatus.APPROVED.value),
-        ]
         for doc_type, doc_status in docs:
-            doc = DriverDocument(
-                driver_id=user.id,
-                doc_type=doc_type,
-                file_url=f"https://storage.example.com/docs/{user.id}/{doc_type}.pdf",
-                status=doc_status,
-                expires_at=datetime.utcnow() + timedelta(days=365),
-            )
-            session.add(doc)
-    
-    await session.flush()
+            document_rows.append({
+                "driver_id": user.id,
+                "doc_type": doc_type,
+                "file_url": f"https://storage.example.com/docs/{user.id}/{doc_type}.pdf",
+                "status": doc_status,
+                "expires_at": SEED_NOW + timedelta(days=365),
+            })
+    
+    await session.execute(insert(DriverProfile), profile_rows)
+    await session.execute(insert(Vehicle), vehicle_rows)
+    await session.execute(insert(DriverDocument), document_rows)
     print("✓ Created client and driver profiles")
 
 
@@ -441,22 +449,22 @@ async def seed_payment_methods(session: AsyncSession, users: dict):
         ("amex", "0005", 3, 2028, "pm_card_amex"),
     ]
     
+    payment_method_rows = []
     for i, email in enumerate(client_emails):
         user = users[email]
         card = cards[i % len(cards)]
-        pm = PaymentMethod(
-            user_id=user.id,
-            method_type="card",
-            brand=card[0],
-            last_four=card[1],
-            exp_month=card[2],
-            exp_year=card[3],
-            is_default=True,
-            stripe_payment_method_id=card[4],
-        )
-        session.add(pm)
-    
-    await session.flush()
+        payment_method_rows.append({
+            "user_id": user.id,
+            "method_type": "card",
+            "brand": card[0],
+            "last_four": card[1],
+            "exp_month": card[2],
+            "exp_year": card[3],
+            "is_default": True,
+            "stripe_payment_method_id": card[4],
+        })
+    
+    await session.execute(insert(PaymentMethod), payment_method_rows)
     print("✓ Created payment methods with Stripe test tokens")
 
 
@@ -464,7 +472,7 @@ async def seed_bookings(session: AsyncSession, users: dict, services: dict):
     """Create sample bookings with various statuses."""
     print("Seeding bookings...")
     
-    now = datetime.utcnow()
+    now = SEED_NOW
     
     clients = [users["alice@demo.com"], users["bob@demo.com"], users["carol@demo.com"]]
     drivers = [users["mike@demo.com"], users["sarah@demo.com"], users["james@demo.com"]]
@@ -493,108 +501,116 @@ async def seed_bookings(session: AsyncSession, users: dict, services: dict):
         (BookingStatus.CANCELED_BY_CLIENT.value, -3*60, None, 30.00, None, None),
     ]
     
-    service_list = list(services.values())
+    service_ids = [service.id for service in services.values()]
+    with_driver = set(BookingStatus.driver_active_statuses()) | {BookingStatus.COMPLETED.value}
+    started = {BookingStatus.COMPLETED.value, BookingStatus.IN_PROGRESS.value}
+    cancelled = set(BookingStatus.cancelled_statuses())
+    addresses = await intern_strings(session, [location[0] for location in locations])
+    # Stop coordinates are NUMERIC; convert each location once, not per stop
+    stop_coords = {address: (Decimal(str(lat)), Decimal(str(lng))) for address, lat, lng in locations}
     
+    booking_rows, trips = [], []
     for i, (status, created_offset, completed_offset, fare, client_rating, driver_rating) in enumerate(bookings_data):
         client = clients[i % len(clients)]
-        driver = drivers[i % len(drivers)] if status in BookingStatus.driver_active_statuses() + [BookingStatus.COMPLETED.value] else None
+        driver = drivers[i % len(drivers)] if status in with_driver else None
         
         pickup = locations[i % len(locations)]
         dropoff = locations[(i + 1) % len(locations)]
-        service = service_list[i % len(service_list)]
         
         created_at = now + timedelta(minutes=created_offset)
         completed_at = (now + timedelta(minutes=completed_offset)) if completed_offset else None
         
-        booking = Booking(
-            client_id=client.id,
-            driver_id=driver.id if driver else None,
-            service_type_id=service.id,
-            status=status,
-            is_asap=(status != BookingStatus.DRAFT.value),
-            pickup_address=pickup[0],
-            pickup_lat=pickup[1],
-            pickup_lng=pickup[2],
-            dropoff_address=dropoff[0],
-            dropoff_lat=dropoff[1],
-            dropoff_lng=dropoff[2],
-            requested_pickup_at=created_at if status == BookingStatus.DRAFT.value else None,
-            started_at=created_at if status in [BookingStatus.COMPLETED.value, BookingStatus.IN_PROGRESS.value] else None,
-            completed_at=completed_at,
-            cancelled_at=created_at if status in [BookingStatus.CANCELED_BY_CLIENT.value, BookingStatus.CANCELED_BY_DRIVER.value, BookingStatus.CANCELED_BY_SYSTEM.value] else None,
-            passenger_count=random.randint(1, 3),
-            luggage_count=random.randint(0, 2),
-            special_notes="Demo booking" if i == 0 else None,
-            estimated_distance_km=Decimal(str(random.uniform(5, 25))),
-            estimated_duration_min=random.randint(15, 45),
-            base_fare=Decimal("5.00"),
-            distance_fare=Decimal(str(round(fare * 0.4, 2))),
-            time_fare=Decimal(str(round(fare * 0.2, 2))),
-            surge_multiplier=Decimal("1.0"),
-            final_fare=Decimal(str(fare)) if status == BookingStatus.COMPLETED.value else None,
-            driver_earnings=Decimal(str(round(fare * 0.75, 2))) if status == BookingStatus.COMPLETED.value else None,
-            platform_fee=Decimal(str(round(fare * 0.25, 2))) if status == BookingStatus.COMPLETED.value else None,
-            client_rating=client_rating,
-            driver_rating=driver_rating,
-            created_at=created_at,
-        )
-        session.add(booking)
-        await session.flush()
+        booking_rows.append({
+            "client_id": client.id,
+            "driver_id": driver.id if driver else None,
+            "service_type_id": service_ids[i % len(service_ids)],
+            "status": status,
+            "is_asap": (status != BookingStatus.DRAFT.value),
+            "pickup_address_id": addresses[pickup[0]],
+            "pickup_lat": pickup[1],
+            "pickup_lng": pickup[2],
+            "dropoff_address_id": addresses[dropoff[0]],
+            "dropoff_lat": dropoff[1],
+            "dropoff_lng": dropoff[2],
+            "requested_pickup_at": created_at if status == BookingStatus.DRAFT.value else None,
+            "started_at": created_at if status in started else None,
+            "completed_at": completed_at,
+            "cancelled_at": created_at if status in cancelled else None,
+            "passenger_count": random.randint(1, 3),
+            "luggage_count": random.randint(0, 2),
+            "special_notes": "Demo booking" if i == 0 else None,
+            "estimated_distance_km": Decimal(random.randint(500, 2500)).scaleb(-2),  # 5.00-25.00
+            "estimated_duration_min": random.randint(15, 45),
+            "base_fare": to_cents(fare * 0.4),
+            "distance_fare": to_cents(fare * 0.4),
+            "time_fare": to_cents(fare * 0.2),
+            "surge_multiplier": Decimal("1.0"),
+            "driver_earnings": to_cents(fare * 0.75) if status == BookingStatus.COMPLETED.value else None,
+            "platform_fee": to_cents(fare * 0.25) if status == BookingStatus.COMPLETED.value else None,
+            "client_rating": client_rating,
+            "driver_rating": driver_rating,
+            "created_at": created_at,
+        })
+        trips.append((status, fare, driver, pickup, dropoff, created_at, completed_at))
+    
+    # Bookings in one INSERT; their ids come back in row order for the
+    # stops, events and payments, which are then one INSERT per table
+    booking_ids = (await session.scalars(
+        insert(Booking).returning(Booking.id, sort_by_parameter_order=True), booking_rows
+    )).all()
+    
+    stop_rows, event_rows, payment_rows = [], [], []
+    for booking_id, (status, fare, driver, pickup, dropoff, created_at, completed_at) in zip(booking_ids, trips):
+        stop_rows.append({
+            "booking_id": booking_id,
+            "sequence": 0,
+            "address_id": addresses[pickup[0]],
+            "lat": stop_coords[pickup[0]][0],
+            "lng": stop_coords[pickup[0]][1],
+            "stop_type": "pickup",
+        })
+        stop_rows.append({
+            "booking_id": booking_id,
+            "sequence": 1,
+            "address_id": addresses[dropoff[0]],
+            "lat": stop_coords[dropoff[0]][0],
+            "lng": stop_coords[dropoff[0]][1],
+            "stop_type": "dropoff",
+        })
         
-        # Add stops
-        pickup_stop = BookingStop(
-            booking_id=booking.id,
-            sequence=0,
-            address=pickup[0],
-            lat=Decimal(str(pickup[1])),
-            lng=Decimal(str(pickup[2])),
-            stop_type="pickup",
-        )
-        dropoff_stop = BookingStop(
-            booking_id=booking.id,
-            sequence=1,
-            address=dropoff[0],
-            lat=Decimal(str(dropoff[1])),
-            lng=Decimal(str(dropoff[2])),
-            stop_type="dropoff",
-        )
-        session.add_all([pickup_stop, dropoff_stop])
-        
-        # Add events
-        event = BookingEvent(
-            booking_id=booking.id,
-            event_type="booking_created",
-            description=f"Booking created with status {status}",
-            event_metadata={"initial_status": status},
-            created_at=created_at,
-        )
-        session.add(event)
+        event_rows.append({
+            "booking_id": booking_id,
+            "event_type": "booking_created",
+            "actor_id": None,
+            "description": f"Booking created with status {status}",
+            "event_metadata": {"initial_status": status},
+            "created_at": created_at,
+        })
         
         if status == BookingStatus.COMPLETED.value:
-            event2 = BookingEvent(
-                booking_id=booking.id,
-                event_type="trip_completed",
-                actor_id=driver.id if driver else None,
-                description="Trip completed successfully",
-                event_metadata={"final_fare": str(fare)},
-                created_at=completed_at,
-            )
-            session.add(event2)
-        
-        # Add payment for completed bookings
-        if status == BookingStatus.COMPLETED.value:
-            payment = Payment(
-                booking_id=booking.id,
-                amount=Decimal(str(fare)),
-                currency="USD",
-                payment_method="card",
-                payment_status=PaymentStatus.COMPLETED.value,
-                created_at=completed_at,
-                completed_at=completed_at,
-            )
-            session.add(payment)
-    
-    await session.flush()
+            event_rows.append({
+                "booking_id": booking_id,
+                "event_type": "trip_completed",
+                "actor_id": driver.id if driver else None,
+                "description": "Trip completed successfully",
+                "event_metadata": {"final_fare": str(fare)},
+                "created_at": completed_at,
+            })
+            
+            # Payment for completed bookings
+            payment_rows.append({
+                "booking_id": booking_id,
+                "amount": to_cents(fare),
+                "currency": "USD",
+                "payment_method": "card",
+                "payment_status": PaymentStatus.COMPLETED.value,
+                "created_at": completed_at,
+                "completed_at": completed_at,
+            })
+    
+    await session.execute(insert(BookingStop), stop_rows)
+    await session.execute(insert(BookingEvent), event_rows)
+    await session.execute(insert(Payment), payment_rows)
     print(f"✓ Created {len(bookings_data)} bookings with stops and events")
 
 
@@ -602,7 +618,7 @@ async def seed_support_tickets(session: AsyncSession, users: dict):
     """Create sample support tickets."""
     print("Seeding support tickets...")
     
-    now = datetime.utcnow()
+    now = SEED_NOW
     
     tickets_data = [
         ("alice@demo.com", "Payment issue", "billing", "medium", TicketStatus.OPEN.value, "I was charged twice for my last ride"),
@@ -613,44 +629,54 @@ async def seed_support_tickets(session: AsyncSession, users: dict):
     
     support_user = users.get("support1@demo.com")
     
-    for email, subject, category, priority, status, description in tickets_data:
-        user = users[email]
-        ticket = SupportTicket(
-            user_id=user.id,
-            assigned_to=support_user.id if status == TicketStatus.IN_PROGRESS.value else None,
-            subject=subject,
-            category=category,
-            priority=priority,
-            status=status,
-            description=description,
-            created_at=now - timedelta(days=random.randint(1, 7)),
-        )
-        session.add(ticket)
-        await session.flush()
-        
-        # Add initial message
-        msg = SupportTicketMessage(
-            ticket_id=ticket.id,
-            sender_id=user.id,
-            message=description,
-            is_internal=False,
-        )
-        session.add(msg)
+    ticket_ids = (await session.scalars(
+        insert(SupportTicket).returning(SupportTicket.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": users[email].id,
+                "assigned_to": support_user.id if status == TicketStatus.IN_PROGRESS.value else None,
+                "subject": subject,
+                "category": category,
+                "priority": priority,
+                "status": status,
+                "description": description,
+                "created_at": now - timedelta(days=random.randint(1, 7)),
+            }
+            for email, subject, category, priority, status, description in tickets_data
+        ],
+    )).all()
+    
+    message_rows = []
+    for ticket_id, (email, _, _, _, status, description) in zip(ticket_ids, tickets_data):
+        # Initial message
+        message_rows.append({
+            "ticket_id": ticket_id,
+            "sender_id": users[email].id,
+            "message": description,
+            "is_internal": False,
+        })
         
-        # Add support response for in_progress tickets
+        # Support response for in_progress tickets
         if status == TicketStatus.IN_PROGRESS.value and support_user:
-            response = SupportTicketMessage(
-                ticket_id=ticket.id,
-                sender_id=support_user.id,
-                message="Thank you for reaching out. We're looking into this issue.",
-                is_internal=False,
-            )
-            session.add(response)
-    
-    await session.flush()
+            message_rows.append({
+                "ticket_id": ticket_id,
+                "sender_id": support_user.id,
+                "message": "Thank you for reaching out. We're looking into this issue.",
+                "is_internal": False,
+            })
+    
+    await session.execute(insert(SupportTicketMessage), message_rows)
     print(f"✓ Created {len(tickets_data)} support tickets with messages")
 
 
+async def seed_in_own_session(seed, *args):
+    """Run one seed phase in a separate session and commit it."""
+    async with async_session_maker() as session:
+        await skip_commit_fsync(session)
+        await seed(session, *args)
+        await session.commit()
+
+
 async def main():
     """Run the complete seed process."""
     print("\n" + "=" * 50)
@@ -660,19 +686,43 @@ async def main():
     async with async_session_maker() as session:
         try:
             # Clear existing data
+            await skip_commit_fsync(session)
             await clear_existing_data(session)
             
-            # Seed in order of dependencies
+            await skip_commit_fsync(session)
+            # Seed in order of dependencies. On Postgres, phases that only
+            # read earlier ones run side by side on their own connections
+            # once what they read is committed; SQLite takes one writer at
+            # a time, so it runs them in turn on this session.
+            concurrent = session.bind.dialect.name == "postgresql"
             roles = await seed_roles(session)
             regions, services = await seed_regions_and_services(session)
-            await seed_pricing(session, regions, services)
-            await seed_surge_rules(session, regions)
-            await seed_promotions(session)
+            if concurrent:
+                await session.commit()
+                await skip_commit_fsync(session)
+                await asyncio.gather(
+                    seed_in_own_session(seed_pricing, regions, services),
+                    seed_in_own_session(seed_surge_rules, regions),
+                    seed_in_own_session(seed_promotions),
+                )
+            else:
+                await seed_pricing(session, regions, services)
+                await seed_surge_rules(session, regions)
+                await seed_promotions(session)
             users = await seed_users(session, roles)
             await seed_profiles(session, users, services)
-            await seed_payment_methods(session, users)
-            await seed_bookings(session, users, services)
-            await seed_support_tickets(session, users)
+            if concurrent:
+                await session.commit()
+                await skip_commit_fsync(session)
+                await asyncio.gather(
+                    seed_bookings(session, users, services),
+                    seed_in_own_session(seed_payment_methods, users),
+                    seed_in_own_session(seed_support_tickets, users),
+                )
+            else:
+                await seed_payment_methods(session, users)
+                await seed_bookings(session, users, services)
+                await seed_support_tickets(session, users)
             
             await session.commit()
             
@@ -697,6 +747,8 @@ async def main():
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            await close_redis()
 
 
 if __name__ == "__main__":
@@ -2,97 +2,145 @@
 Seryvo Platform - Database Initialization Script
 Creates required roles and permissions only. No demo data.
 Demo data can be loaded via the Admin Settings panel.
+
+Run with: python seed.py [--quiet]
 """
 import asyncio
-from sqlalchemy import select
+import sys
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Required roles and permissions, inserted as-is
+ROLES = (
+    {"name": "admin", "description": "System administrator with full access"},
+    {"name": "support_agent", "description": "Customer support agent with ticket management access"},
+    {"name": "driver", "description": "Driver/chauffeur"},
+    {"name": "client", "description": "Customer/passenger"},
+)
+
+PERMISSIONS = (
+    # User management
+    {"name": "users.read", "description": "View users"},
+    {"name": "users.create", "description": "Create users"},
+    {"name": "users.update", "description": "Update users"},
+    {"name": "users.delete", "description": "Delete users"},
+    # Booking management
+    {"name": "bookings.read", "description": "View bookings"},
+    {"name": "bookings.create", "description": "Create bookings"},
+    {"name": "bookings.update", "description": "Update bookings"},
+    {"name": "bookings.cancel", "description": "Cancel bookings"},
+    # Driver management
+    {"name": "drivers.read", "description": "View drivers"},
+    {"name": "drivers.approve", "description": "Approve drivers"},
+    {"name": "drivers.manage", "description": "Manage driver settings"},
+    # Support
+    {"name": "tickets.read", "description": "View support tickets"},
+    {"name": "tickets.update", "description": "Update tickets"},
+    {"name": "tickets.assign", "description": "Assign tickets"},
+    # Admin
+    {"name": "admin.dashboard", "description": "View admin dashboard"},
+    {"name": "admin.reports", "description": "View reports"},
+    {"name": "admin.settings", "description": "Manage settings"},
+    {"name": "admin.pricing", "description": "Manage pricing"},
+    {"name": "admin.promotions", "description": "Manage promotions"},
+    {"name": "admin.audit", "description": "View audit logs"},
+)
+
+# Granted to support_agent; admin gets every permission
+SUPPORT_PERMISSIONS = frozenset({"users.read", "bookings.read", "tickets.read", "tickets.update", "tickets.assign"})
 
-from app.core.database import async_session, init_db
-from app.models import Role, Permission, RolePermission
 
+def _silent(*args, **kwargs) -> None:
+    pass
 
-async def init_database():
-    """Initialize the database with required roles and permissions."""
-    print("Initializing database...")
+
+async def _ensure_named(db, insert, model, rows) -> dict:
+    """Insert catalog rows whose name isn't stored yet; return {name: id} for all of them."""
+    stmt = insert(model).values(list(rows))
+    # DO UPDATE (not NOTHING) so rows that already exist still RETURN their id
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[model.name],
+        set_={"name": stmt.excluded.name},
+    ).returning(model.name, model.id)
+    result = await db.execute(stmt)
+    return dict(result.all())
+
+
+async def _create_catalog(db, say) -> None:
+    """Add missing roles, permissions and default grants within db's transaction."""
+    from app.models import Role, Permission, RolePermission
+    
+    # Every insert skips rows that already exist, so re-runs (even
+    # concurrent ones) are safe and only add what's missing.
+    say("Setting up roles and permissions...")
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    
+    # ===== Roles =====
+    role_map = await _ensure_named(db, insert, Role, ROLES)
+    say(f"✅ {len(ROLES)} roles in place")
+    
+    # ===== Permissions =====
+    perm_map = await _ensure_named(db, insert, Permission, PERMISSIONS)
+    say(f"✅ {len(PERMISSIONS)} permissions in place")
+    
+    # ===== Role-Permission Mapping =====
+    admin_permissions = list(perm_map.values())  # Admin gets all
+    support_permissions = [perm_map[name] for name in SUPPORT_PERMISSIONS]
+    
+    await db.execute(insert(RolePermission).values([
+        *({"role_id": role_map["admin"], "permission_id": perm_id} for perm_id in admin_permissions),
+        *({"role_id": role_map["support_agent"], "permission_id": perm_id} for perm_id in support_permissions),
+    ]).on_conflict_do_nothing())
+    say("✅ Assigned permissions to roles")
+
+
+async def init_database(session: Optional[AsyncSession] = None, quiet: bool = False):
+    """
+    Initialize the database with required roles and permissions.
+    
+    Standalone, this creates the tables and seeds in its own session and
+    transaction. Callers that already hold a session (app startup, tests)
+    can pass it to reuse its connection; the tables must already exist and
+    committing is left to them.
+    """
+    say = _silent if quiet else print
+    
+    if session is not None:
+        await _create_catalog(session, say)
+        return
+    
+    # Imported here: app.core.database builds the engine, and importing this
+    # module for ROLES/PERMISSIONS shouldn't. app.models registers the tables
+    # on Base.metadata, so it has to be loaded before init_db() creates them.
+    import app.models  # noqa: F401
+    from app.core.database import async_session, init_db
+    
+    say("Initializing database...")
     await init_db()
     
-    async with async_session() as db:
-        # Check if roles already exist
-        existing_roles = await db.execute(select(Role))
-        if existing_roles.scalar_one_or_none():
-            print("Database already initialized. Skipping...")
-            return
-        
-        print("Setting up roles and permissions...")
-        
-        # ===== Roles =====
-        roles = [
-            Role(name="admin", description="System administrator with full access"),
-            Role(name="support_agent", description="Customer support agent with ticket management access"),
-            Role(name="driver", description="Driver/chauffeur"),
-            Role(name="client", description="Customer/passenger"),
-        ]
-        db.add_all(roles)
-        await db.flush()
-        
-        role_map = {r.name: r.id for r in roles}
-        print(f"✅ Created {len(roles)} roles")
-        
-        # ===== Permissions =====
-        permissions = [
-            # User management
-            Permission(name="users.read", description="View users"),
-            Permission(name="users.create", description="Create users"),
-            Permission(name="users.update", description="Update users"),
-            Permission(name="users.delete", description="Delete users"),
-            # Booking management
-            Permission(name="bookings.read", description="View bookings"),
-            Permission(name="bookings.create", description="Create bookings"),
-            Permission(name="bookings.update", description="Update bookings"),
-            Permission(name="bookings.cancel", description="Cancel bookings"),
-            # Driver management
-            Permission(name="drivers.read", description="View drivers"),
-            Permission(name="drivers.approve", description="Approve drivers"),
-            Permission(name="drivers.manage", description="Manage driver settings"),
-            # Support
-            Permission(name="tickets.read", description="View support tickets"),
-            Permission(name="tickets.update", description="Update tickets"),
-            Permission(name="tickets.assign", description="Assign tickets"),
-            # Admin
-            Permission(name="admin.dashboard", description="View admin dashboard"),
-            Permission(name="admin.reports", description="View reports"),
-            Permission(name="admin.settings", description="Manage settings"),
-            Permission(name="admin.pricing", description="Manage pricing"),
-            Permission(name="admin.promotions", description="Manage promotions"),
-            Permission(name="admin.audit", description="View audit logs"),
-        ]
-        db.add_all(permissions)
-        await db.flush()
-        print(f"✅ Created {len(permissions)} permissions")
-        
-        # ===== Role-Permission Mapping =====
-        admin_permissions = [p.id for p in permissions]  # Admin gets all
-        support_permissions = [p.id for p in permissions if 'tickets' in p.name or 'users.read' in p.name or 'bookings.read' in p.name]
-        
-        for perm_id in admin_permissions:
-            db.add(RolePermission(role_id=role_map["admin"], permission_id=perm_id))
-        
-        for perm_id in support_permissions:
-            db.add(RolePermission(role_id=role_map["support_agent"], permission_id=perm_id))
-        
-        await db.flush()
-        print("✅ Assigned permissions to roles")
-        
-        await db.commit()
-        
-        print("\n" + "="*50)
-        print("✅ Database initialization completed!")
-        print("="*50)
-        print("\n📋 Next Steps:")
-        print("  1. Visit the app to complete first-time setup")
-        print("  2. The first user to register becomes the admin")
-        print("  3. Use Admin Settings to load demo data if needed")
-        print()
+    # One transaction, committed when the block exits
+    async with async_session() as db, db.begin():
+        await _create_catalog(db, say)
+    
+    say("\n" + "="*50)
+    say("✅ Database initialization completed!")
+    say("="*50)
+    say("\n📋 Next Steps:")
+    say("  1. Visit the app to complete first-time setup")
+    say("  2. The first user to register becomes the admin")
+    say("  3. Use Admin Settings to load demo data if needed")
+    say()
 
 
 if __name__ == "__main__":
-    asyncio.run(init_database())
+    coro = init_database(quiet="--quiet" in sys.argv[1:])
+    try:
+        import uvloop  # Comes with uvicorn[standard]; not available on Windows
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)